@@ -0,0 +1,227 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
+
+from main import run, OUTPUT_FORMATS
+from utils.logging_utils import configure_logs
+
+"""Batch method to execute the Router over many input dirs"""
+
+
+def build_jobs(
+        jobs_file: Optional[str] = None,
+        input_glob: Optional[str] = None,
+        output_dir: str = './output'
+) -> List[Tuple[str, str]]:
+    """
+    Method to build the (input dir, output dir) pairs of the batch, either
+    from a JSON list of {"input_dir", "output_dir"} objects or from a glob
+    of input dirs, each written to a sub dir of the output dir named after
+    its input dir
+    """
+
+    jobs = []
+    if jobs_file is not None:
+        with open(jobs_file) as f:
+            jobs += [
+                (job_dict['input_dir'], job_dict['output_dir'])
+                for job_dict in json.load(f)
+            ]
+
+    if input_glob is not None:
+        jobs += [
+            (
+                input_dir,
+                os.path.join(
+                    output_dir,
+                    os.path.basename(os.path.normpath(input_dir))
+                )
+            )
+            for input_dir in sorted(glob.glob(input_glob))
+            if os.path.isdir(input_dir)
+        ]
+
+    output_dirs = [job_output_dir for _, job_output_dir in jobs]
+    if len(set(output_dirs)) != len(output_dirs):
+        raise ValueError('Some jobs of the batch share an output dir.')
+
+    return jobs
+
+
+def run_batch(
+        jobs: List[Tuple[str, str]],
+        max_workers: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        cache_file: Optional[str] = None,
+        output_format: str = 'json'
+) -> Dict[str, Any]:
+    """
+    Method to run the jobs in a pool of worker processes that import the
+    Router once and are reused between jobs. Returns the summary of the
+    batch with the timings and status of every job.
+    """
+
+    if not jobs:
+        raise ValueError('No jobs were found for the batch.')
+
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=configure_logs
+    ) as executor:
+        futures = {
+            executor.submit(
+                _run_job,
+                input_dir,
+                output_dir,
+                cache_file,
+                time_limit,
+                output_format
+            ): job_ix
+            for job_ix, (input_dir, output_dir) in enumerate(jobs)
+        }
+        results = [None] * len(jobs)
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            logging.info(
+                f'Finished the job {results[futures[future]]["input_dir"]} '
+                f'with status {results[futures[future]]["status"]}.'
+            )
+
+    summary = {
+        'jobs': results,
+        'num_jobs': len(jobs),
+        'num_failed': sum(result['status'] != 'success' for result in results),
+        'max_workers': max_workers,
+        'seconds': time.perf_counter() - start
+    }
+    logging.info(
+        f'Ran {len(jobs)} jobs with {max_workers} workers in '
+        f'{summary["seconds"]:.1f} s, {summary["num_failed"]} failed.'
+    )
+
+    return summary
+
+
+def _run_job(
+        input_dir: str,
+        output_dir: str,
+        cache_file: Optional[str],
+        time_limit: Optional[float],
+        output_format: str
+) -> Dict[str, Any]:
+    """Method to run a job in a worker, catching its errors"""
+
+    start = time.perf_counter()
+    result = {
+        'input_dir': input_dir,
+        'output_dir': output_dir,
+        'worker': os.getpid()
+    }
+    try:
+        num_routes = run(
+            input_dir,
+            output_dir,
+            cache_file=cache_file,
+            time_limit=time_limit,
+            output_format=output_format
+        )
+        result.update({'status': 'success', 'routes': num_routes})
+
+    except Exception as error:
+        logging.error(f'The job {input_dir} failed: {error}')
+        result.update({
+            'status': 'failed',
+            'error': ''.join(traceback.format_exception_only(
+                type(error), error
+            )).strip()
+        })
+
+    result['seconds'] = time.perf_counter() - start
+
+    return result
+
+
+if __name__ == '__main__':
+    """Batch method to execute the Router"""
+
+    # CLI parsing
+    parser = argparse.ArgumentParser(
+        description='Route the school buses of many input dirs.'
+    )
+    parser.add_argument(
+        '--jobs-file',
+        type=str,
+        help='JSON list of {"input_dir", "output_dir"} jobs. Default is None',
+        default=None
+    )
+    parser.add_argument(
+        '--input-glob',
+        type=str,
+        help='Glob of input dirs, e.g. "./schools/*". Default is None',
+        default=None
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        help='Directory for the Output of the globbed input dirs. Default is '
+             './output',
+        default='./output'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of worker processes. Default is the number of CPUs',
+        default=None
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        help='Maximum search time limit of every job in seconds. Default is '
+             'the one of its params',
+        default=None
+    )
+    parser.add_argument(
+        '--cache-file',
+        type=str,
+        help='SQLite file to cache estimations between runs. Default is None',
+        default=None
+    )
+    parser.add_argument(
+        '--output-format',
+        type=str,
+        choices=OUTPUT_FORMATS,
+        help='Format of the Routes file of every job. Default is json',
+        default='json'
+    )
+    parser.add_argument(
+        '--summary-file',
+        type=str,
+        help='File for writing the summary of the batch. Default is '
+             './batch_summary.json',
+        default='./batch_summary.json'
+    )
+    args = parser.parse_args()
+    if args.jobs_file is None and args.input_glob is None:
+        parser.error('One of --jobs-file or --input-glob is required.')
+
+    # Method execution
+    configure_logs()
+    batch_jobs = build_jobs(args.jobs_file, args.input_glob, args.output_dir)
+    batch_summary = run_batch(
+        batch_jobs,
+        max_workers=args.workers,
+        time_limit=args.time_limit,
+        cache_file=args.cache_file,
+        output_format=args.output_format
+    )
+    with open(args.summary_file, 'w') as f:
+        logging.info(f'Wrote the batch summary to {args.summary_file}.')
+        json.dump(batch_summary, f, indent=4)
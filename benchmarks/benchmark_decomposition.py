@@ -0,0 +1,99 @@
+import argparse
+import time
+from typing import Dict, Any, Optional
+
+from benchmarks.benchmark_objective import build_problem
+from constraints.capacity_constraint import CapacityConstraint
+from models.params import Params
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from problem.problem import Problem
+from problem.problem_decomposer import ProblemDecomposer
+from router import Router
+
+"""Benchmark of the decomposed solve against the monolithic solve"""
+
+
+def solve(
+        problem: Problem,
+        problem_decomposer: Optional[ProblemDecomposer]
+) -> Dict[str, Any]:
+    """Method to solve the Problem and measure the cost of the solution"""
+
+    optimization_model_builder = OptimizationModelBuilder(
+        constraints=[CapacityConstraint()]
+    )
+    start = time.perf_counter()
+    if problem_decomposer is None:
+        solution = optimization_model_builder.build(problem).solve()
+    else:
+        solution = Router(
+            problem_builder=None,
+            optimization_model_builder=optimization_model_builder,
+            problem_decomposer=problem_decomposer
+        )._solve_decomposed(problem)
+    elapsed = time.perf_counter() - start
+
+    times = problem.build_time_matrix()
+
+    return {
+        'cost': int(sum(
+            times[route[:-1], route[1:]].sum()
+            for route in solution
+            if len(route) > 1
+        )),
+        'routes': sum(len(route) > 2 for route in solution),
+        'riders': sum(
+            problem.stops[stop_ix].demand
+            for route in solution
+            for stop_ix in route
+        ),
+        'seconds': elapsed
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the decomposed and monolithic solves.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        help='Number of riders of the synthetic instance. Default is 3000',
+        default=3000
+    )
+    parser.add_argument(
+        '--sector-size',
+        type=int,
+        help='Rider stops per sector. Default is 500',
+        default=500
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=int,
+        help='Search time limit in seconds. Default is 30',
+        default=30
+    )
+    args = parser.parse_args()
+
+    params = Params(
+        SEARCH_TIME_LIMIT=args.time_limit,
+        SEARCH_SOLUTIONS_LIMIT=10 ** 9,
+        FIRST_SOLUTION_STRATEGY='PATH_CHEAPEST_ARC',
+        SEARCH_METAHEURISTIC='GUIDED_LOCAL_SEARCH',
+        OBJECTIVE_FUNCTION='MATRIX'
+    )
+    base_problem = build_problem(args.riders, params)
+    print(
+        f'{"mode":>12} {"cost":>10} {"routes":>7} {"riders":>7} '
+        f'{"seconds":>8}'
+    )
+    for mode, decomposer in (
+            ('monolithic', None),
+            ('decomposed', ProblemDecomposer(sector_size=args.sector_size))
+    ):
+        result = solve(base_problem, decomposer)
+        print(
+            f'{mode:>12} {result["cost"]:>10} {result["routes"]:>7} '
+            f'{result["riders"]:>7} {result["seconds"]:>8.1f}'
+        )
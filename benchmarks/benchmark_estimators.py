@@ -0,0 +1,85 @@
+import argparse
+import time
+from typing import List
+
+import numpy as np
+from haversine import haversine
+
+from estimators.linear_estimator import LinearEstimator
+from models.location import Location
+from models.stop import Stop
+from models.vehicle import DEFAULT_VELOCITY
+
+"""Benchmark of the LinearEstimator against the pairwise haversine loop"""
+
+# Maximum number of pairs timed with the pairwise loop, the rest is projected
+MAX_LOOP_PATHS = 1_000_000
+
+
+def build_stops(num_stops: int, seed: int = 0) -> List[Stop]:
+    """Method to build random Stops around a city center"""
+
+    random = np.random.default_rng(seed)
+    lats = random.uniform(4.55, 4.85, num_stops)
+    lngs = random.uniform(-74.20, -74.00, num_stops)
+
+    return [
+        Stop(depot_id=str(ix), location=Location(lat=lat, lng=lng))
+        for ix, (lat, lng) in enumerate(zip(lats, lngs))
+    ]
+
+
+def time_loop(stops: List[Stop]) -> float:
+    """Method to time the pairwise loop, projected to all the paths"""
+
+    num_paths = min(len(stops) ** 2, MAX_LOOP_PATHS)
+    start = time.perf_counter()
+    for path_ix in range(num_paths):
+        origin = stops[path_ix // len(stops)].location.coordinates
+        destination = stops[path_ix % len(stops)].location.coordinates
+        _ = (
+            haversine(origin, destination) / DEFAULT_VELOCITY
+            if origin != destination
+            else 0.
+        )
+    elapsed = time.perf_counter() - start
+
+    return elapsed * len(stops) ** 2 / num_paths
+
+
+def time_matrix(stops: List[Stop], approximate: bool) -> float:
+    """Method to time the vectorized matrix estimation"""
+
+    estimator = LinearEstimator(approximate=approximate)
+    start = time.perf_counter()
+    estimator.estimate_matrix(stops)
+
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the LinearEstimator.'
+    )
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        help='Number of stops to benchmark. Default is 1000 5000 10000',
+        default=[1000, 5000, 10000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f'{"stops":>8} {"loop (s)":>10} {"haversine (s)":>14} '
+        f'{"speedup":>8} {"approx (s)":>11} {"speedup":>8}'
+    )
+    for size in args.sizes:
+        bench_stops = build_stops(size)
+        loop = time_loop(bench_stops)
+        exact = time_matrix(bench_stops, approximate=False)
+        approx = time_matrix(bench_stops, approximate=True)
+        print(
+            f'{size:>8} {loop:>10.3f} {exact:>14.3f} '
+            f'{loop / exact:>7.0f}x {approx:>11.3f} {loop / approx:>7.0f}x'
+        )
@@ -0,0 +1,181 @@
+import argparse
+import time
+from dataclasses import replace
+from typing import Dict, Any
+
+import numpy as np
+
+from benchmarks.synthetic import generate_city
+from constraints.capacity_constraint import CapacityConstraint
+from estimators.linear_estimator import LinearEstimator
+from models.params import Params
+from optimization_model.optimization_model import NoSolutionError
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from problem.problem_builder import ProblemBuilder
+from utils.geo_utils import haversine_vector
+
+"""Benchmark of the clustered Stops against the geohash groups"""
+
+
+def run(
+        num_riders: int,
+        params: Params,
+        density: str,
+        seed: int
+) -> Dict[str, Any]:
+    """
+    Method to group the riders of a synthetic city into Stops and solve
+    it. Besides the solve time and the cost of the routes, it measures the
+    longest walk from a rider to its Stop and the Stops whose demand
+    exceeds the smallest vehicle capacity, which the geohash groups do not
+    bound.
+    """
+
+    riders, vehicles, depots = generate_city(
+        num_riders,
+        density=density,
+        seed=seed
+    )
+    problem_builder = ProblemBuilder(
+        params=params,
+        estimator=LinearEstimator()
+    )
+    max_demand = min(vehicle.capacity for vehicle in vehicles.values())
+
+    start = time.perf_counter()
+    starts, ends = problem_builder._build_vehicles_starts_ends(
+        vehicles,
+        depots
+    )
+    stops = problem_builder._build_stops(
+        riders,
+        depots,
+        starts,
+        ends,
+        max_demand=max_demand
+    )
+    stops_seconds = time.perf_counter() - start
+
+    rider_stops = [stop for stop in stops if not stop.depot_id]
+    walks = np.concatenate([
+        haversine_vector(
+            np.array([rider.location.lat for rider in stop.riders.values()]),
+            np.array([rider.location.lng for rider in stop.riders.values()]),
+            stop.location.lat,
+            stop.location.lng
+        )
+        for stop in rider_stops
+    ])
+
+    problem = problem_builder.build(riders, vehicles, depots)
+    model = OptimizationModelBuilder(
+        constraints=[CapacityConstraint()]
+    ).build(problem)
+    start = time.perf_counter()
+    try:
+        model.solve()
+
+    except NoSolutionError:
+        pass
+
+    solve_seconds = time.perf_counter() - start
+
+    return {
+        'stops': len(rider_stops),
+        'min_stops': int(np.ceil(num_riders / max_demand)),
+        'over_capacity': sum(
+            stop.demand > max_demand for stop in rider_stops
+        ),
+        'max_walk': walks.max(),
+        'stops_seconds': stops_seconds,
+        'solve_seconds': solve_seconds,
+        'cost': model.objective_value
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the clustered Stops and the geohash groups.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        nargs='+',
+        help='Numbers of riders of the synthetic cities. Default is '
+             '1000 3000',
+        default=[1000, 3000]
+    )
+    parser.add_argument(
+        '--density',
+        choices=['uniform', 'clustered'],
+        help='Distribution of the riders in the city. Default is clustered',
+        default='clustered'
+    )
+    parser.add_argument(
+        '--precisions',
+        type=int,
+        nargs='+',
+        help='Precisions of the geohash groups. Default is 7 8',
+        default=[7, 8]
+    )
+    parser.add_argument(
+        '--walking-distance',
+        type=float,
+        help='Maximum walking distance (km) of the clusters. Default is 0.3',
+        default=0.3
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        help='Search time limit in seconds. Default is 10',
+        default=10
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed of the synthetic cities. Default is 0',
+        default=0
+    )
+    args = parser.parse_args()
+
+    base_params = Params(
+        MAX_WALKING_DISTANCE=args.walking_distance,
+        SEARCH_TIME_LIMIT=args.time_limit,
+        SEARCH_SOLUTIONS_LIMIT=10 ** 9,
+        FIRST_SOLUTION_STRATEGY='PATH_CHEAPEST_ARC',
+        SEARCH_METAHEURISTIC='GUIDED_LOCAL_SEARCH',
+        OBJECTIVE_FUNCTION='MATRIX'
+    )
+    groupings = [
+        (
+            f'geohash{precision}',
+            replace(base_params, GEOHASH_PRECISION_GROUPING=precision)
+        )
+        for precision in args.precisions
+    ] + [('cluster', replace(base_params, STOP_GROUPING='CLUSTER'))]
+    print(
+        f'{"riders":>7} {"grouping":>9} {"stops":>6} {"min":>5} '
+        f'{"over":>5} {"walk km":>8} {"stops s":>8} {"solve s":>8} '
+        f'{"cost":>10}'
+    )
+    for num_riders in args.riders:
+        for grouping, grouping_params in groupings:
+            result = run(
+                num_riders,
+                grouping_params,
+                args.density,
+                args.seed
+            )
+            cost = (
+                f'{result["cost"]:>10.0f}'
+                if result['cost'] is not None
+                else f'{"-":>10}'
+            )
+            print(
+                f'{num_riders:>7} {grouping:>9} {result["stops"]:>6} '
+                f'{result["min_stops"]:>5} {result["over_capacity"]:>5} '
+                f'{result["max_walk"]:>8.3f} '
+                f'{result["stops_seconds"]:>8.3f} '
+                f'{result["solve_seconds"]:>8.1f} {cost}'
+            )
@@ -0,0 +1,123 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Any
+
+from benchmarks.synthetic import generate_instance
+from models.rider import Rider
+from utils.stream_utils import load_riders
+
+"""Benchmark of the streaming Rider loader against json.load"""
+
+
+def write_riders(riders_dir: str, num_riders: int) -> Dict[str, str]:
+    """Method to write the Riders of a synthetic instance in every format"""
+
+    riders, _, _ = generate_instance(num_riders)
+    rider_dicts = [
+        {
+            'rider_id': rider_id,
+            'lat': rider.location.lat,
+            'lng': rider.location.lng
+        }
+        for rider_id, rider in riders.items()
+    ]
+    files = {}
+    for name in ('riders.json', 'riders.json.gz', 'riders.ndjson',
+                 'riders.csv.gz'):
+        files[name] = os.path.join(riders_dir, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(files[name], 'wt', newline='') as f:
+            if name.startswith('riders.json'):
+                json.dump(rider_dicts, f, indent=4)
+            elif name.startswith('riders.ndjson'):
+                f.writelines(json.dumps(rider) + '\n' for rider in rider_dicts)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(['rider_id', 'lat', 'lng'])
+                writer.writerows(
+                    [rider['rider_id'], rider['lat'], rider['lng']]
+                    for rider in rider_dicts
+                )
+
+    return files
+
+
+def measure(load: Callable[[], Any]) -> Dict[str, float]:
+    """
+    Method to measure the time and, in a second run since tracing slows
+    the load down, the peak memory of a load
+    """
+
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'records/s': len(result) / elapsed,
+        'seconds': elapsed,
+        'peak_mb': peak / 2 ** 20
+    }
+
+
+def _load_json(riders_file: str) -> Dict[str, Rider]:
+    """Method to load the Riders as read_entities used to"""
+
+    with open(riders_file) as f:
+        riders_dicts = json.load(f)
+
+    return {
+        r_dict['rider_id']: Rider.from_dict(r_dict)
+        for r_dict in riders_dicts
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the streaming Rider loader.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        help='Number of riders of the synthetic instance. Default is 200000',
+        default=200_000
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as bench_dir:
+        riders_files = write_riders(bench_dir, args.riders)
+        cases = [
+            (
+                'json.load + from_dict',
+                lambda: _load_json(riders_files['riders.json'])
+            )
+        ] + [
+            (
+                f'stream {name}',
+                lambda file=file: load_riders(file)
+            )
+            for name, file in riders_files.items()
+        ] + [
+            (
+                'stream riders.json + to_riders',
+                lambda: load_riders(riders_files['riders.json']).to_riders()
+            )
+        ]
+        print(f'{"loader":>32} {"records/s":>11} {"seconds":>8} {"MB":>8}')
+        for case_name, case_load in cases:
+            result = measure(case_load)
+            print(
+                f'{case_name:>32} {result["records/s"]:>11.0f} '
+                f'{result["seconds"]:>8.2f} {result["peak_mb"]:>8.1f}'
+            )
@@ -0,0 +1,98 @@
+import argparse
+import time
+from dataclasses import replace
+from typing import Dict, Any
+
+from constraints.capacity_constraint import CapacityConstraint
+from estimators.linear_estimator import LinearEstimator
+from benchmarks.synthetic import generate_instance
+from models.params import Params
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from problem.problem import Problem
+from problem.problem_builder import ProblemBuilder
+
+"""Benchmark of the solver speed with the CALLBACK and MATRIX objectives"""
+
+
+def build_problem(num_riders: int, params: Params) -> Problem:
+    """Method to build the Problem of a synthetic instance"""
+
+    problem_builder = ProblemBuilder(
+        params=params,
+        estimator=LinearEstimator()
+    )
+
+    return problem_builder.build(*generate_instance(num_riders))
+
+
+def solve(problem: Problem) -> Dict[str, Any]:
+    """Method to solve the Problem and measure the search speed"""
+
+    model = OptimizationModelBuilder(
+        constraints=[CapacityConstraint()]
+    ).build(problem)
+    solutions = []
+
+    def _solution_callback():
+        """Callback to count the solutions found by the search"""
+
+        solutions.append(model.solver.CostVar().Max())
+
+    model.solver.AddAtSolutionCallback(_solution_callback)
+    start = time.perf_counter()
+    assignment = model.solver.SolveWithParameters(model.search_parameters)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'objective': assignment.ObjectiveValue() if assignment else None,
+        'solutions': len(solutions),
+        'branches': model.solver.solver().Branches(),
+        'seconds': elapsed
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the solver with each objective function.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        help='Number of riders of the synthetic instance. Default is 1000',
+        default=1000
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=int,
+        help='Search time limit in seconds. Default is 10',
+        default=10
+    )
+    args = parser.parse_args()
+
+    base_params = Params(
+        SEARCH_TIME_LIMIT=args.time_limit,
+        SEARCH_SOLUTIONS_LIMIT=10 ** 9,
+        FIRST_SOLUTION_STRATEGY='PATH_CHEAPEST_ARC',
+        SEARCH_METAHEURISTIC='GUIDED_LOCAL_SEARCH'
+    )
+    base_problem = build_problem(args.riders, base_params)
+    print(
+        f'{"objective":>10} {"cost":>10} {"solutions":>10} '
+        f'{"solutions/s":>12} {"branches/s":>11}'
+    )
+    for objective_function in ('CALLBACK', 'MATRIX'):
+        bench_problem = replace(
+            base_problem,
+            params=replace(
+                base_params,
+                OBJECTIVE_FUNCTION=objective_function
+            )
+        )
+        result = solve(bench_problem)
+        print(
+            f'{objective_function:>10} {result["objective"]:>10} '
+            f'{result["solutions"]:>10} '
+            f'{result["solutions"] / result["seconds"]:>12.1f} '
+            f'{result["branches"] / result["seconds"]:>11.0f}'
+        )
@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from dataclasses import replace
+from typing import Dict, Any
+
+from benchmarks.benchmark_solution import timed
+from benchmarks.synthetic import generate_city, write_city, DENSITIES
+from constraints.capacity_constraint import CapacityConstraint
+from estimators.linear_estimator import LinearEstimator
+from main import build_routes_writer, OUTPUT_FORMATS
+from models.params import Params
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from problem.problem import Problem
+from problem.problem_builder import ProblemBuilder
+from router import Router
+from utils.file_utils import read_entities
+
+"""End-to-end benchmark of every stage of the Router on synthetic cities"""
+
+# Stages of the Router that are timed, in order
+STAGES = [
+    'read_entities',
+    'build_stops',
+    'estimate',
+    'build_model',
+    'solve',
+    'parse_routes',
+    'write_routes'
+]
+
+
+def run_pipeline(
+        bench_dir: str,
+        params: Params,
+        output_format: str
+) -> Dict[str, Any]:
+    """
+    Method to run the Router on the input files of a bench dir, timing each
+    stage separately
+    """
+
+    seconds = {}
+    (riders, vehicles, depots, _), seconds['read_entities'] = timed(
+        read_entities,
+        bench_dir
+    )
+    estimator = LinearEstimator()
+    problem_builder = ProblemBuilder(params=params, estimator=estimator)
+
+    start = time.perf_counter()
+    starts, ends = problem_builder._build_vehicles_starts_ends(
+        vehicles,
+        depots
+    )
+    stops = problem_builder._build_stops(riders, depots, starts, ends)
+    seconds['build_stops'] = time.perf_counter() - start
+
+    estimations, seconds['estimate'] = timed(estimator.estimate, stops)
+    problem = Problem(
+        depots=depots,
+        ends=ends,
+        estimations=estimations,
+        params=params,
+        riders=riders,
+        starts=starts,
+        stops=stops,
+        vehicles=vehicles
+    )
+    model, seconds['build_model'] = timed(
+        OptimizationModelBuilder(constraints=[CapacityConstraint()]).build,
+        problem
+    )
+    solution, seconds['solve'] = timed(model.solve)
+    routes, seconds['parse_routes'] = timed(
+        Router._parse_routes,
+        problem,
+        solution
+    )
+    _, seconds['write_routes'] = timed(
+        build_routes_writer(output_format).write,
+        os.path.join(bench_dir, 'output'),
+        problem,
+        solution
+    )
+
+    return {
+        'stops': len(stops),
+        'vehicles': len(vehicles),
+        'routes': len(routes),
+        'objective_value': model.objective_value,
+        'seconds': seconds,
+        'total_seconds': sum(seconds.values())
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark every stage of the Router end to end.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        nargs='+',
+        help='Numbers of riders of the synthetic cities. Default is '
+             '100 1000 10000. Larger cities need a lower --precision, '
+             'since the estimations are quadratic in the stops',
+        default=[100, 1000, 10_000]
+    )
+    parser.add_argument(
+        '--densities',
+        type=str,
+        nargs='+',
+        choices=DENSITIES,
+        help='Densities of the riders. Default is uniform clustered',
+        default=DENSITIES
+    )
+    parser.add_argument(
+        '--schools',
+        type=int,
+        help='Number of schools of every city. Default is 2',
+        default=2
+    )
+    parser.add_argument(
+        '--parking-lots',
+        type=int,
+        help='Number of parking lots of every city. Default is 3',
+        default=3
+    )
+    parser.add_argument(
+        '--precision',
+        type=int,
+        help='Geohash precision that groups the riders into stops. Default '
+             'is 7',
+        default=7
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        help='Search time limit of every solve in seconds. Default is 5',
+        default=5
+    )
+    parser.add_argument(
+        '--output-format',
+        type=str,
+        choices=OUTPUT_FORMATS,
+        help='Format of the Routes file. Default is json',
+        default='json'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed of the synthetic cities. Default is 0',
+        default=0
+    )
+    parser.add_argument(
+        '--label',
+        type=str,
+        help='Label of the run, e.g. a commit. Default is None',
+        default=None
+    )
+    parser.add_argument(
+        '--results-file',
+        type=str,
+        help='JSON file for writing the results. Default is '
+             './benchmark_pipeline.json',
+        default='./benchmark_pipeline.json'
+    )
+    args = parser.parse_args()
+
+    bench_params = replace(
+        Params(),
+        GEOHASH_PRECISION_GROUPING=args.precision,
+        SEARCH_TIME_LIMIT=args.time_limit
+    )
+    runs = []
+    print(f'{"riders":>7} {"density":>9} {"stops":>6} ' + ' '.join(
+        f'{stage:>13}' for stage in STAGES
+    ))
+    for num_riders in args.riders:
+        for density in args.densities:
+            city = generate_city(
+                num_riders,
+                density=density,
+                num_schools=args.schools,
+                num_parking_lots=args.parking_lots,
+                seed=args.seed
+            )
+            with tempfile.TemporaryDirectory() as city_dir:
+                write_city(city_dir, *city, params=bench_params)
+                result = run_pipeline(
+                    city_dir,
+                    bench_params,
+                    args.output_format
+                )
+
+            runs.append({'riders': num_riders, 'density': density, **result})
+            print(
+                f'{num_riders:>7} {density:>9} {result["stops"]:>6} ' +
+                ' '.join(
+                    f'{result["seconds"][stage]:>13.3f}' for stage in STAGES
+                )
+            )
+
+    with open(args.results_file, 'w') as f:
+        json.dump(
+            {
+                'label': args.label,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'args': vars(args),
+                'runs': runs
+            },
+            f,
+            indent=4
+        )
+    print(f'Wrote the results to {args.results_file}.')
@@ -0,0 +1,131 @@
+import argparse
+import gc
+import time
+from dataclasses import replace
+from typing import Dict, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic import generate_instance
+from models.depot import Depot
+from models.location import Location
+from models.params import Params
+from models.rider_columns import RiderColumns
+from models.rider_store import RiderStore
+from models.vehicle import Vehicle
+from problem.problem_builder import ProblemBuilder
+
+"""Benchmark of the scaling of the ProblemBuilder with the Riders"""
+
+
+def spread_fleet(
+        vehicles: Dict[str, Vehicle],
+        depots: Dict[str, Depot],
+        num_depots: int
+) -> Tuple[Dict[str, Vehicle], Dict[str, Depot]]:
+    """
+    Method to spread the Vehicles over many depots near the school, so the
+    depot lookups are exercised
+    """
+
+    school = next(iter(depots.values()))
+    depots = {
+        f'depot_{ix}': Depot(
+            depot_id=f'depot_{ix}',
+            location=Location(
+                lat=school.location.lat + ix * 1e-4,
+                lng=school.location.lng
+            )
+        )
+        for ix in range(num_depots)
+    }
+    vehicles = {
+        vehicle_id: replace(
+            vehicle,
+            start=f'depot_{vehicle_ix % num_depots}',
+            end=f'depot_{vehicle_ix % num_depots}'
+        )
+        for vehicle_ix, (vehicle_id, vehicle) in enumerate(vehicles.items())
+    }
+
+    return vehicles, depots
+
+
+def time_build(builder: ProblemBuilder, riders, vehicles, depots) -> float:
+    """
+    Method to time the build of the Stops, starts and ends. The estimations
+    are quadratic in the Stops by nature, so they are left out.
+    """
+
+    gc.collect()
+    start = time.perf_counter()
+    starts, ends = builder._build_vehicles_starts_ends(vehicles, depots)
+    builder._build_stops(riders, depots, starts, ends)
+
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the scaling of the ProblemBuilder.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        nargs='+',
+        help='Numbers of riders of the synthetic instances. Default is '
+             '10000 100000 1000000',
+        default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        '--riders-per-depot',
+        type=int,
+        help='Number of riders per depot. Default is 1000',
+        default=1000
+    )
+    args = parser.parse_args()
+
+    problem_builder = ProblemBuilder(params=Params(), estimator=None)
+    sizes, timings = [], {'dict': [], 'store': []}
+    print(f'{"riders":>9} {"depots":>7} {"input":>6} {"seconds":>8} '
+          f'{"us/rider":>9}')
+    for num_riders in args.riders:
+        instance_riders, instance_vehicles, instance_depots = (
+            generate_instance(num_riders)
+        )
+        instance_vehicles, instance_depots = spread_fleet(
+            instance_vehicles,
+            instance_depots,
+            max(1, num_riders // args.riders_per_depot)
+        )
+        cases = {
+            'dict': instance_riders,
+            'store': RiderStore.from_columns(
+                RiderColumns.from_records(
+                    {
+                        'rider_id': rider_id,
+                        'lat': rider.location.lat,
+                        'lng': rider.location.lng
+                    }
+                    for rider_id, rider in instance_riders.items()
+                )
+            )
+        }
+        sizes.append(num_riders)
+        for case_name, case_riders in cases.items():
+            seconds = time_build(
+                problem_builder,
+                case_riders,
+                instance_vehicles,
+                instance_depots
+            )
+            timings[case_name].append(seconds)
+            print(
+                f'{num_riders:>9} {len(instance_depots):>7} {case_name:>6} '
+                f'{seconds:>8.2f} {seconds / num_riders * 1e6:>9.2f}'
+            )
+
+    if len(sizes) > 1:
+        for case_name, case_timings in timings.items():
+            exponent, _ = np.polyfit(np.log(sizes), np.log(case_timings), 1)
+            print(f'{case_name} build time grows as riders^{exponent:.2f}')
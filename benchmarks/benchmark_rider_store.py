@@ -0,0 +1,78 @@
+import argparse
+import gc
+import pickle
+import tracemalloc
+from typing import Callable, Any, Tuple
+
+from benchmarks.synthetic import generate_instance
+from models.params import Params
+from models.rider_columns import RiderColumns
+from models.rider_store import RiderStore
+from problem.problem_builder import ProblemBuilder
+
+"""Benchmark of the memory per Rider of the RiderStore and Rider objects"""
+
+
+def traced(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    Method to build an object and measure the memory it holds. The id
+    strings are shared with the columns, so they are not counted.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, size
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the memory per rider of the RiderStore.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        help='Number of riders of the synthetic instance. Default is 100000',
+        default=100_000
+    )
+    args = parser.parse_args()
+
+    instance_riders, _, _ = generate_instance(args.riders)
+    columns = RiderColumns.from_records(
+        {
+            'rider_id': rider_id,
+            'lat': rider.location.lat,
+            'lng': rider.location.lng
+        }
+        for rider_id, rider in instance_riders.items()
+    )
+    del instance_riders
+    problem_builder = ProblemBuilder(params=Params(), estimator=None)
+
+    print(
+        f'{"riders":>12} {"riders B/rider":>15} {"stops B/rider":>14} '
+        f'{"pickle B/rider":>15}'
+    )
+    for name, build_riders in (
+            ('Rider', columns.to_riders),
+            ('RiderStore', lambda: RiderStore(
+                rider_ids=columns.rider_ids.copy(),
+                lats=columns.lats.copy(),
+                lngs=columns.lngs.copy()
+            ))
+    ):
+        riders, riders_size = traced(build_riders)
+        stops, stops_size = traced(
+            lambda: problem_builder._build_stops(riders, {}, [], [])
+        )
+        pickle_size = len(pickle.dumps((riders, stops)))
+        print(
+            f'{name:>12} {riders_size / len(columns):>15.0f} '
+            f'{stops_size / len(columns):>14.0f} '
+            f'{pickle_size / len(columns):>15.0f}'
+        )
+        del riders, stops
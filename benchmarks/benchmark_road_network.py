@@ -0,0 +1,147 @@
+import argparse
+import heapq
+import os
+import tempfile
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+
+from benchmarks.benchmark_estimators import build_stops
+from benchmarks.synthetic import write_road_network
+from estimators.linear_estimator import LinearEstimator
+from estimators.road_network_estimator import RoadNetworkEstimator
+from utils.file_utils import read_road_network
+
+"""Benchmark of the RoadNetworkEstimator on a synthetic road network"""
+
+# Maximum number of stops timed with a Dijkstra search per stop, the rest
+# is projected
+MAX_DIJKSTRA_STOPS = 50
+
+
+def time_dijkstra(input_dir: str, num_nodes: int, num_stops: int) -> float:
+    """
+    Method to time a Dijkstra search over the whole road graph per stop,
+    which is the query without the hierarchy, projected to all the stops
+    """
+
+    edges = np.loadtxt(
+        os.path.join(input_dir, 'road_edges.csv'),
+        delimiter=',',
+        skiprows=1
+    )
+    adjacency = [[] for _ in range(num_nodes)]
+    for source, target, seconds in edges.tolist():
+        adjacency[int(source)].append((int(target), seconds))
+
+    num_searches = min(num_stops, MAX_DIJKSTRA_STOPS)
+    start = time.perf_counter()
+    for node in np.arange(num_searches).tolist():
+        times = {node: 0.}
+        queue = [(0., node)]
+        while queue:
+            current_time, current = heapq.heappop(queue)
+            if current_time > times[current]:
+                continue
+
+            for target, seconds in adjacency[current]:
+                if current_time + seconds < times.get(target, np.inf):
+                    times[target] = current_time + seconds
+                    heapq.heappush(queue, (current_time + seconds, target))
+
+    return (time.perf_counter() - start) * num_stops / num_searches
+
+
+def run(spacing: float, sizes: List[int], seed: int) -> Dict[str, Any]:
+    """
+    Method to contract a synthetic road network, load it back, and
+    estimate the matrices of some numbers of stops with it
+    """
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        num_nodes, num_edges = write_road_network(input_dir, spacing, seed)
+        start = time.perf_counter()
+        read_road_network(input_dir)
+        contract_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        hierarchy = read_road_network(input_dir)
+        load_seconds = time.perf_counter() - start
+
+        estimator = RoadNetworkEstimator(hierarchy)
+        estimations = []
+        for size in sizes:
+            stops = build_stops(size, seed)
+            start = time.perf_counter()
+            matrix = estimator.estimate_matrix(stops)
+            estimate_seconds = time.perf_counter() - start
+            linear = LinearEstimator().estimate_matrix(stops)
+            off_diagonal = ~np.eye(size, dtype=bool)
+            estimations.append({
+                'stops': size,
+                'estimate_seconds': estimate_seconds,
+                'dijkstra_seconds': time_dijkstra(input_dir, num_nodes, size),
+                'road_to_linear': np.median(
+                    matrix[off_diagonal] / linear[off_diagonal]
+                )
+            })
+
+    return {
+        'nodes': num_nodes,
+        'edges': num_edges,
+        'upward_edges': hierarchy.num_edges,
+        'contract_seconds': contract_seconds,
+        'load_seconds': load_seconds,
+        'estimations': estimations
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the RoadNetworkEstimator.'
+    )
+    parser.add_argument(
+        '--spacing',
+        type=float,
+        help='Spacing (km) of the streets of the road network. Default is '
+             '0.5',
+        default=0.5
+    )
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        help='Number of stops to estimate. Default is 500 2000',
+        default=[500, 2000]
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed of the road network and the stops. Default is 0',
+        default=0
+    )
+    args = parser.parse_args()
+
+    result = run(args.spacing, args.sizes, args.seed)
+    print(
+        f'{result["nodes"]} nodes, {result["edges"]} edges, '
+        f'{result["upward_edges"]} upward edges. Contracted in '
+        f'{result["contract_seconds"]:.1f} s, loaded in '
+        f'{result["load_seconds"]:.2f} s.'
+    )
+    print(
+        f'{"stops":>8} {"hierarchy (s)":>14} {"dijkstra (s)":>13} '
+        f'{"speedup":>8} {"road / linear":>14}'
+    )
+    for estimation in result['estimations']:
+        speedup = (
+            estimation['dijkstra_seconds'] / estimation['estimate_seconds']
+        )
+        print(
+            f'{estimation["stops"]:>8} '
+            f'{estimation["estimate_seconds"]:>14.2f} '
+            f'{estimation["dijkstra_seconds"]:>13.2f} '
+            f'{speedup:>8.1f} '
+            f'{estimation["road_to_linear"]:>14.2f}'
+        )
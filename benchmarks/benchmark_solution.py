@@ -0,0 +1,173 @@
+import argparse
+import time
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+from ortools.constraint_solver.pywrapcp import RoutingIndexManager, \
+    RoutingModel, DefaultRoutingSearchParameters
+
+from benchmarks.synthetic import generate_instance
+from models.depot import Depot
+from models.estimation_matrix import EstimationMatrix
+from models.params import Params
+from models.route import Route
+from models.stop import Stop
+from optimization_model.optimization_model import OptimizationModel
+from problem.problem import Problem
+from router import Router
+
+"""Benchmark of the extraction and parsing of a solution"""
+
+
+def build_solved_model(
+        num_stops: int,
+        num_vehicles: int,
+        seed: int = 0
+) -> Tuple[Problem, OptimizationModel, Any]:
+    """
+    Method to build a Problem of one depot and single-rider Stops, and a
+    model whose assignment routes the Stops in random routes. The routes
+    are read into the assignment instead of searched, and the estimations
+    are never read, so they are left empty.
+    """
+
+    riders, vehicles, depots = generate_instance(num_stops - 1, seed=seed)
+    vehicles = dict(list(vehicles.items())[:num_vehicles])
+    depot: Depot = next(iter(depots.values()))
+    stops = [Stop(depot_id=depot.depot_id, location=depot.location)] + [
+        Stop(riders={rider_id: rider}) for rider_id, rider in riders.items()
+    ]
+    problem = Problem(
+        depots=depots,
+        ends=[0] * num_vehicles,
+        estimations=EstimationMatrix(data=np.zeros((0, 0))),
+        params=Params(),
+        riders=riders,
+        starts=[0] * num_vehicles,
+        stops=stops,
+        vehicles=vehicles
+    )
+
+    manager = RoutingIndexManager(num_stops, num_vehicles, 0)
+    solver = RoutingModel(manager)
+    search_parameters = DefaultRoutingSearchParameters()
+    solver.CloseModelWithParameters(search_parameters)
+    vehicle_ixs = np.random.default_rng(seed).integers(
+        num_vehicles,
+        size=num_stops - 1
+    )
+    routes = [
+        (np.flatnonzero(vehicle_ixs == vehicle_ix) + 1).tolist()
+        for vehicle_ix in range(num_vehicles)
+    ]
+    assignment = solver.ReadAssignmentFromRoutes(routes, True)
+    model = OptimizationModel(
+        manager=manager,
+        solver=solver,
+        search_parameters=search_parameters
+    )
+
+    return problem, model, assignment
+
+
+def legacy_process_solution(
+        model: OptimizationModel,
+        solution
+) -> List[List[int]]:
+    """Method to process the solution as the OptimizationModel used to"""
+
+    num_vehicles = model.manager.GetNumberOfVehicles()
+    routes = [[]] * num_vehicles
+    for vehicle_ix in range(num_vehicles):
+        route = []
+        model_index = model.solver.Start(vehicle_ix)
+        route.append(model.manager.IndexToNode(model_index))
+        while not model.solver.IsEnd(model_index):
+            model_index = solution.Value(model.solver.NextVar(model_index))
+            route.append(model.manager.IndexToNode(model_index))
+
+        routes[vehicle_ix] = route
+
+    return routes
+
+
+def legacy_parse_routes(
+        problem: Problem,
+        solution: List[List[int]]
+) -> List[Dict[str, Any]]:
+    """Method to parse the Routes as the Router used to"""
+
+    routes = []
+    for vehicle_ix, solution_stops in enumerate(solution):
+        if len(solution_stops) > 1:
+            route = Route(
+                stops=[problem.stops[stop_ix] for stop_ix in solution_stops],
+                vehicle_id=list(problem.vehicles.keys())[vehicle_ix]
+            )
+            routes.append(route.to_dict())
+
+    return routes
+
+
+def timed(function, *args) -> Tuple[Any, float]:
+    """Method to call a function and measure its time"""
+
+    start = time.perf_counter()
+    result = function(*args)
+
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the extraction and parsing of a solution.'
+    )
+    parser.add_argument(
+        '--stops',
+        type=int,
+        help='Number of stops, the depot included. Default is 20000',
+        default=20_000
+    )
+    parser.add_argument(
+        '--vehicles',
+        type=int,
+        help='Number of vehicles. Default is 1000',
+        default=1000
+    )
+    args = parser.parse_args()
+
+    bench_problem, bench_model, bench_assignment = build_solved_model(
+        args.stops,
+        args.vehicles
+    )
+    legacy_routes, legacy_extract = timed(
+        legacy_process_solution,
+        bench_model,
+        bench_assignment
+    )
+    legacy_dicts, legacy_parse = timed(
+        legacy_parse_routes,
+        bench_problem,
+        legacy_routes
+    )
+    flat_solution, flat_extract = timed(
+        bench_model._process_solution,
+        bench_assignment
+    )
+    flat_dicts, flat_parse = timed(
+        Router._parse_routes,
+        bench_problem,
+        flat_solution
+    )
+    assert list(flat_solution) == legacy_routes
+    assert flat_dicts == legacy_dicts
+
+    print(f'{"path":>8} {"extract s":>10} {"parse s":>8} {"total s":>8}')
+    for name, extract, parse in (
+            ('legacy', legacy_extract, legacy_parse),
+            ('flat', flat_extract, flat_parse)
+    ):
+        print(
+            f'{name:>8} {extract:>10.3f} {parse:>8.3f} '
+            f'{extract + parse:>8.3f}'
+        )
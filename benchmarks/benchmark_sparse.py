@@ -0,0 +1,155 @@
+import argparse
+import time
+from dataclasses import replace
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import generate_city
+from constraints.capacity_constraint import CapacityConstraint
+from estimators.linear_estimator import LinearEstimator
+from models.params import Params
+from optimization_model.optimization_model import NoSolutionError
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from problem.problem_builder import ProblemBuilder
+
+"""Benchmark of the sparse k-nearest graph against the dense graph"""
+
+
+def run(
+        num_riders: int,
+        params: Params,
+        neighbours: Optional[int],
+        seed: int
+) -> Dict[str, Any]:
+    """
+    Method to build and solve a synthetic city with the dense graph, or the
+    sparse graph of some neighbours. The cost of the routes is measured with
+    the linear times of their arcs, so both graphs are compared equally.
+    """
+
+    params = replace(params, SPARSE_NEIGHBOURS=neighbours)
+    estimator = LinearEstimator()
+    problem_builder = ProblemBuilder(params=params, estimator=estimator)
+    riders, vehicles, depots = generate_city(
+        num_riders,
+        num_schools=2,
+        num_parking_lots=2,
+        seed=seed
+    )
+    starts, ends = problem_builder._build_vehicles_starts_ends(
+        vehicles,
+        depots
+    )
+    stops = problem_builder._build_stops(riders, depots, starts, ends)
+
+    start = time.perf_counter()
+    problem = problem_builder.build(riders, vehicles, depots)
+    problem_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = OptimizationModelBuilder(
+        constraints=[CapacityConstraint()]
+    ).build(problem)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        solution = model.solve()
+
+    except NoSolutionError:
+        solution = None
+
+    solve_seconds = time.perf_counter() - start
+
+    cost = None
+    if solution is not None:
+        origins = np.concatenate([route[:-1] for route in solution])
+        destinations = np.concatenate([route[1:] for route in solution])
+        service_times = np.array([stop.service_time for stop in stops])
+        cost = (
+            estimator.estimate_paths(stops, origins, destinations).sum() +
+            service_times[destinations].sum()
+        )
+
+    return {
+        'stops': len(stops),
+        'paths': len(problem.estimations),
+        'megabytes': problem.estimations.nbytes / 2 ** 20,
+        'problem_seconds': problem_seconds,
+        'build_seconds': build_seconds,
+        'solve_seconds': solve_seconds,
+        'cost': cost
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the sparse and dense graphs of the Problem.'
+    )
+    parser.add_argument(
+        '--riders',
+        type=int,
+        nargs='+',
+        help='Numbers of riders of the synthetic cities. Default is '
+             '1000 3000',
+        default=[1000, 3000]
+    )
+    parser.add_argument(
+        '--neighbours',
+        type=int,
+        nargs='+',
+        help='Neighbours of every stop in the sparse graphs. Default is '
+             '30 60',
+        default=[30, 60]
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        help='Search time limit in seconds. Default is 10',
+        default=10
+    )
+    parser.add_argument(
+        '--no-dense',
+        action='store_true',
+        help='Skip the dense graph, e.g. when it does not fit in memory'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed of the synthetic cities. Default is 0',
+        default=0
+    )
+    args = parser.parse_args()
+
+    base_params = Params(
+        GEOHASH_PRECISION_GROUPING=9,
+        SEARCH_TIME_LIMIT=args.time_limit,
+        SEARCH_SOLUTIONS_LIMIT=10 ** 9,
+        FIRST_SOLUTION_STRATEGY='PATH_CHEAPEST_ARC',
+        SEARCH_METAHEURISTIC='GUIDED_LOCAL_SEARCH',
+        OBJECTIVE_FUNCTION='MATRIX'
+    )
+    print(
+        f'{"riders":>7} {"graph":>7} {"stops":>6} {"paths":>10} '
+        f'{"MB":>8} {"problem":>9} {"build":>7} {"solve":>7} {"cost":>10}'
+    )
+    for num_riders in args.riders:
+        graphs = ([] if args.no_dense else [None]) + args.neighbours
+        for graph_neighbours in graphs:
+            result = run(num_riders, base_params, graph_neighbours, args.seed)
+            cost = (
+                f'{result["cost"]:>10.0f}'
+                if result['cost'] is not None
+                else f'{"-":>10}'
+            )
+            graph = 'dense' if graph_neighbours is None else graph_neighbours
+            print(
+                f'{num_riders:>7} {graph:>7} '
+                f'{result["stops"]:>6} {result["paths"]:>10} '
+                f'{result["megabytes"]:>8.1f} '
+                f'{result["problem_seconds"]:>9.3f} '
+                f'{result["build_seconds"]:>7.3f} '
+                f'{result["solve_seconds"]:>7.1f} {cost}'
+            )
@@ -0,0 +1,107 @@
+import argparse
+from typing import List, Dict, Any
+
+from benchmarks.benchmark_estimators import build_stops
+from estimators.table_service_estimator import TableServiceEstimator
+from service.table_server import TableServer, serve_in_thread
+
+"""Benchmark of the TableServiceEstimator against the stand-in server"""
+
+
+def run(
+        size: int,
+        max_locations: int,
+        concurrencies: List[int],
+        latency: float,
+        seed: int
+) -> List[Dict[str, Any]]:
+    """
+    Method to request the matrix of some stops from a stand-in table
+    service that answers with some latency, at some concurrencies
+    """
+
+    stops = build_stops(size, seed)
+    results = []
+    for concurrency in concurrencies:
+        with serve_in_thread(
+                TableServer(
+                    port=0,
+                    max_locations=max_locations,
+                    latency=latency
+                )
+        ) as server:
+            estimator = TableServiceEstimator(
+                f'http://127.0.0.1:{server.port}',
+                max_locations=max_locations,
+                max_concurrency=concurrency
+            )
+            estimator.estimate_matrix(stops)
+            results.append({
+                'concurrency': concurrency,
+                **estimator.statistics.to_dict()
+            })
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the TableServiceEstimator.'
+    )
+    parser.add_argument(
+        '--stops',
+        type=int,
+        help='Number of stops to estimate. Default is 1000',
+        default=1000
+    )
+    parser.add_argument(
+        '--max-locations',
+        type=int,
+        help='Maximum coordinates of a request. Default is 100',
+        default=100
+    )
+    parser.add_argument(
+        '--concurrencies',
+        type=int,
+        nargs='+',
+        help='Concurrent connections to the service. Default is 1 4 16',
+        default=[1, 4, 16]
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        help='Seconds every response of the service waits. Default is 0.01',
+        default=0.01
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed of the stops. Default is 0',
+        default=0
+    )
+    args = parser.parse_args()
+
+    results = run(
+        args.stops,
+        args.max_locations,
+        args.concurrencies,
+        args.latency,
+        args.seed
+    )
+    print(
+        f'{"concurrency":>12} {"requests":>9} {"connections":>12} '
+        f'{"sent (KB)":>10} {"received (KB)":>14} {"p50 (ms)":>9} '
+        f'{"p95 (ms)":>9} {"p99 (ms)":>9} {"seconds":>8}'
+    )
+    for result in results:
+        print(
+            f'{result["concurrency"]:>12} '
+            f'{result["requests"]:>9} '
+            f'{result["connections"]:>12} '
+            f'{result["bytes_sent"] / 1e3:>10.0f} '
+            f'{result["bytes_received"] / 1e3:>14.0f} '
+            f'{result["latency_p50"] * 1e3:>9.1f} '
+            f'{result["latency_p95"] * 1e3:>9.1f} '
+            f'{result["latency_p99"] * 1e3:>9.1f} '
+            f'{result["seconds"]:>8.2f}'
+        )
@@ -0,0 +1,58 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.benchmark_solution import build_solved_model
+from writers.json_routes_writer import JsonRoutesWriter
+from writers.ndjson_routes_writer import NdjsonRoutesWriter
+from writers.npz_routes_writer import NpzRoutesWriter
+
+"""Benchmark of the write throughput and output size of every writer"""
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the writers of the Routes.'
+    )
+    parser.add_argument(
+        '--stops',
+        type=int,
+        help='Number of stops, the depot included. Default is 20000',
+        default=20_000
+    )
+    parser.add_argument(
+        '--vehicles',
+        type=int,
+        help='Number of vehicles. Default is 1000',
+        default=1000
+    )
+    args = parser.parse_args()
+
+    bench_problem, bench_model, bench_assignment = build_solved_model(
+        args.stops,
+        args.vehicles
+    )
+    bench_solution = bench_model._process_solution(bench_assignment)
+    writers = {
+        'json': JsonRoutesWriter(),
+        'ndjson': NdjsonRoutesWriter(),
+        'ndjson.gz': NdjsonRoutesWriter(compress=True),
+        'npz': NpzRoutesWriter(compress=False),
+        'npz (zip)': NpzRoutesWriter()
+    }
+    print(f'{"writer":>10} {"seconds":>8} {"routes/s":>9} {"MB":>7}')
+    with tempfile.TemporaryDirectory() as bench_dir:
+        for name, writer in writers.items():
+            writer_dir = os.path.join(bench_dir, name)
+            start = time.perf_counter()
+            num_routes = writer.write(
+                writer_dir,
+                bench_problem,
+                bench_solution
+            )
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(writer.routes_file(writer_dir))
+            print(
+                f'{name:>10} {elapsed:>8.3f} {num_routes / elapsed:>9.0f} '
+                f'{size / 2 ** 20:>7.2f}'
+            )
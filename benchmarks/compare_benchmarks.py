@@ -0,0 +1,87 @@
+import argparse
+import json
+import sys
+from typing import Dict, Any, List, Tuple
+
+from benchmarks.benchmark_pipeline import STAGES
+
+"""Comparison of the stage timings of two runs of the pipeline benchmark"""
+
+
+def compare_runs(
+        baseline: Dict[str, Any],
+        candidate: Dict[str, Any],
+        threshold: float
+) -> List[Tuple[int, str, str, float, float, bool]]:
+    """
+    Method to pair the runs of both results by riders and density, and
+    compare the seconds of every stage. A stage regresses when the candidate
+    is slower than the baseline by more than the threshold ratio.
+    """
+
+    baseline_runs = {
+        (run['riders'], run['density']): run
+        for run in baseline['runs']
+    }
+    comparisons = []
+    for run in candidate['runs']:
+        baseline_run = baseline_runs.get((run['riders'], run['density']))
+        if baseline_run is None:
+            continue
+
+        for stage in STAGES + ['total']:
+            baseline_seconds = (
+                baseline_run['total_seconds']
+                if stage == 'total'
+                else baseline_run['seconds'][stage]
+            )
+            candidate_seconds = (
+                run['total_seconds']
+                if stage == 'total'
+                else run['seconds'][stage]
+            )
+            comparisons.append((
+                run['riders'],
+                run['density'],
+                stage,
+                baseline_seconds,
+                candidate_seconds,
+                candidate_seconds > baseline_seconds * threshold
+            ))
+
+    return comparisons
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare two results of the pipeline benchmark.'
+    )
+    parser.add_argument('baseline', type=str, help='Baseline results file')
+    parser.add_argument('candidate', type=str, help='Candidate results file')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        help='Ratio of candidate to baseline seconds over which a stage '
+             'regresses. Default is 1.2',
+        default=1.2
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline_results = json.load(f)
+    with open(args.candidate) as f:
+        candidate_results = json.load(f)
+
+    results = compare_runs(baseline_results, candidate_results, args.threshold)
+    print(
+        f'{"riders":>7} {"density":>9} {"stage":>13} {"baseline":>9} '
+        f'{"candidate":>9} {"ratio":>6}'
+    )
+    for riders, density, stage, before, after, regressed in results:
+        print(
+            f'{riders:>7} {density:>9} {stage:>13} {before:>9.3f} '
+            f'{after:>9.3f} {after / max(before, 1e-9):>6.2f}'
+            f'{"  REGRESSED" if regressed else ""}'
+        )
+
+    sys.exit(1 if any(result[-1] for result in results) else 0)
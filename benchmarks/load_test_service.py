@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, Any, Tuple, Optional
+
+import numpy as np
+
+from settings import RIDERS_FILE, VEHICLES_FILE, DEPOTS_FILE, PARAMS_FILE
+
+"""Load test of a local instance of the routing service"""
+
+
+async def request(
+        host: str,
+        port: int,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None
+) -> Tuple[int, Dict[str, Any]]:
+    """Method to send a request to the service and read its JSON response"""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    writer.write(
+        f'{method} {path} HTTP/1.1\r\n'
+        f'Host: {host}\r\n'
+        f'Content-Type: application/json\r\n'
+        f'Content-Length: {len(payload)}\r\n\r\n'.encode() + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, response_body = response.partition(b'\r\n\r\n')
+    status = int(head.split(b' ')[1])
+
+    return status, json.loads(response_body)
+
+
+async def run_job(
+        host: str,
+        port: int,
+        job: Dict[str, Any],
+        poll_interval: float
+) -> Dict[str, Any]:
+    """Method to submit a job, backing off while the queue is full"""
+
+    start = time.perf_counter()
+    rejections = 0
+    status, response = await request(host, port, 'POST', '/jobs', job)
+    while status == 429:
+        rejections += 1
+        await asyncio.sleep(poll_interval * 2 ** min(rejections, 5))
+        status, response = await request(host, port, 'POST', '/jobs', job)
+
+    job_id = response['job_id']
+    while True:
+        await asyncio.sleep(poll_interval)
+        _, response = await request(host, port, 'GET', f'/jobs/{job_id}')
+        if response['status'] in ('success', 'failed'):
+            break
+
+    return {
+        'status': response['status'],
+        'rejections': rejections,
+        'seconds': time.perf_counter() - start
+    }
+
+
+async def load_test(
+        host: str,
+        port: int,
+        job: Dict[str, Any],
+        num_jobs: int,
+        concurrency: int,
+        poll_interval: float
+) -> Dict[str, Any]:
+    """Method to run the jobs with a maximum number of clients at once"""
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _client(priority: int) -> Dict[str, Any]:
+        """Client that runs a job when there is room for it"""
+
+        async with semaphore:
+            return await run_job(
+                host,
+                port,
+                {**job, 'priority': priority},
+                poll_interval
+            )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[_client(job_ix % 3) for job_ix in range(num_jobs)]
+    )
+    elapsed = time.perf_counter() - start
+    _, metrics = await request(host, port, 'GET', '/metrics')
+    latencies = np.array([result['seconds'] for result in results])
+
+    return {
+        'jobs': num_jobs,
+        'succeeded': sum(result['status'] == 'success' for result in results),
+        'rejections': sum(result['rejections'] for result in results),
+        'jobs/s': num_jobs / elapsed,
+        'latency_p50': float(np.percentile(latencies, 50)),
+        'latency_p95': float(np.percentile(latencies, 95)),
+        'service_metrics': metrics
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Load test a local instance of the routing service.'
+    )
+    parser.add_argument(
+        '--host',
+        type=str,
+        help='Host of the service. Default is 127.0.0.1',
+        default='127.0.0.1'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Port of the service. Default is 8080',
+        default=8080
+    )
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        help='Directory with the Input of every job. Default is ./input',
+        default='./input'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Number of jobs. Default is 50',
+        default=50
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Number of clients at once. Default is 10',
+        default=10
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        help='Seconds between polls of a job. Default is 0.1',
+        default=0.1
+    )
+    args = parser.parse_args()
+
+    input_job = {}
+    for key, file in (
+            ('riders', RIDERS_FILE),
+            ('vehicles', VEHICLES_FILE),
+            ('depots', DEPOTS_FILE),
+            ('params', PARAMS_FILE)
+    ):
+        with open(file.format(input_dir=args.input_dir)) as f:
+            input_job[key] = json.load(f)
+
+    report = asyncio.run(load_test(
+        args.host,
+        args.port,
+        input_job,
+        args.jobs,
+        args.concurrency,
+        args.poll_interval
+    ))
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,287 @@
+import csv
+import json
+import os
+from typing import Dict, Tuple, Optional
+
+import numpy as np
+
+from models.depot import Depot
+from models.location import Location
+from models.params import Params
+from models.rider import Rider
+from models.vehicle import Vehicle
+from settings import RIDERS_FILE, VEHICLES_FILE, DEPOTS_FILE, PARAMS_FILE, \
+    ROAD_NODES_FILE, ROAD_EDGES_FILE
+from utils.geo_utils import haversine_vector
+
+"""Deterministic synthetic instances for the benchmarks"""
+
+# Bounding box of the city (lat, lng) where the instances are generated
+CITY_SOUTH_WEST = (4.55, -74.20)
+CITY_NORTH_EAST = (4.85, -74.00)
+
+# Default capacity of the vehicles and slack of the fleet over the demand
+VEHICLE_CAPACITY = 20
+FLEET_SLACK = 1.2
+
+# Densities of the riders of a synthetic city
+DENSITIES = ['uniform', 'clustered']
+
+# Speeds (km / h) of the streets of the road network and the share of them
+# that are one-way or closed
+STREET_SPEEDS = (10, 30)
+ONE_WAY_SHARE = 0.2
+CLOSED_SHARE = 0.1
+
+# Riders per neighbourhood of a clustered city, and the spread (degrees)
+# of the riders around the center of their neighbourhood
+RIDERS_PER_NEIGHBOURHOOD = 500
+NEIGHBOURHOOD_SPREAD = (0.002, 0.01)
+
+
+def generate_instance(
+        num_riders: int,
+        seed: int = 0
+) -> Tuple[Dict[str, Rider], Dict[str, Vehicle], Dict[str, Depot]]:
+    """
+    Method to generate riders uniformly distributed over the city, a school
+    at its center and enough vehicles to transport every rider
+    """
+
+    random = np.random.default_rng(seed)
+    lats = random.uniform(CITY_SOUTH_WEST[0], CITY_NORTH_EAST[0], num_riders)
+    lngs = random.uniform(CITY_SOUTH_WEST[1], CITY_NORTH_EAST[1], num_riders)
+    riders = {
+        f'rider_{ix}': Rider(
+            location=Location(lat=lat, lng=lng),
+            rider_id=f'rider_{ix}'
+        )
+        for ix, (lat, lng) in enumerate(zip(lats.tolist(), lngs.tolist()))
+    }
+    school = Depot(
+        depot_id='school',
+        location=Location(
+            lat=(CITY_SOUTH_WEST[0] + CITY_NORTH_EAST[0]) / 2,
+            lng=(CITY_SOUTH_WEST[1] + CITY_NORTH_EAST[1]) / 2
+        )
+    )
+    num_vehicles = int(np.ceil(num_riders * FLEET_SLACK / VEHICLE_CAPACITY))
+    vehicles = {
+        f'vehicle_{ix}': Vehicle(
+            capacity=VEHICLE_CAPACITY,
+            start=school.depot_id,
+            end=school.depot_id,
+            vehicle_id=f'vehicle_{ix}'
+        )
+        for ix in range(num_vehicles)
+    }
+
+    return riders, vehicles, {school.depot_id: school}
+
+
+def generate_city(
+        num_riders: int,
+        density: str = 'uniform',
+        num_schools: int = 1,
+        num_parking_lots: int = 0,
+        seed: int = 0
+) -> Tuple[Dict[str, Rider], Dict[str, Vehicle], Dict[str, Depot]]:
+    """
+    Method to generate a city with several schools and parking lots. The
+    riders are either uniformly distributed or clustered in neighbourhoods
+    of random size and spread. The vehicles are split evenly between the
+    schools, where they end, and start at the parking lots if there are
+    any, or else at their school.
+    """
+
+    if density not in DENSITIES:
+        raise ValueError(f'The density {density} is not one of {DENSITIES}.')
+
+    random = np.random.default_rng(seed)
+    south_west = np.array(CITY_SOUTH_WEST)
+    north_east = np.array(CITY_NORTH_EAST)
+    if density == 'uniform':
+        coordinates = random.uniform(south_west, north_east, (num_riders, 2))
+    else:
+        num_neighbourhoods = max(1, num_riders // RIDERS_PER_NEIGHBOURHOOD)
+        centers = random.uniform(
+            south_west,
+            north_east,
+            (num_neighbourhoods, 2)
+        )
+        spreads = random.uniform(*NEIGHBOURHOOD_SPREAD, num_neighbourhoods)
+        weights = random.dirichlet(np.ones(num_neighbourhoods))
+        neighbourhoods = random.choice(
+            num_neighbourhoods,
+            size=num_riders,
+            p=weights
+        )
+        coordinates = np.clip(
+            centers[neighbourhoods] + random.normal(size=(num_riders, 2)) *
+            spreads[neighbourhoods, np.newaxis],
+            south_west,
+            north_east
+        )
+
+    riders = {
+        f'rider_{ix}': Rider(
+            location=Location(lat=lat, lng=lng),
+            rider_id=f'rider_{ix}'
+        )
+        for ix, (lat, lng) in enumerate(coordinates.tolist())
+    }
+
+    # The schools are kept away from the edges of the city
+    margin = (north_east - south_west) / 5
+    school_coordinates = random.uniform(
+        south_west + margin,
+        north_east - margin,
+        (num_schools, 2)
+    )
+    parking_coordinates = random.uniform(
+        south_west,
+        north_east,
+        (num_parking_lots, 2)
+    )
+    depots = {
+        depot_id: Depot(
+            depot_id=depot_id,
+            location=Location(lat=lat, lng=lng)
+        )
+        for depot_id, (lat, lng) in [
+            (f'school_{ix}', depot_coordinates)
+            for ix, depot_coordinates in enumerate(
+                school_coordinates.tolist()
+            )
+        ] + [
+            (f'parking_{ix}', depot_coordinates)
+            for ix, depot_coordinates in enumerate(
+                parking_coordinates.tolist()
+            )
+        ]
+    }
+
+    num_vehicles = int(np.ceil(num_riders * FLEET_SLACK / VEHICLE_CAPACITY))
+    vehicles = {
+        f'vehicle_{ix}': Vehicle(
+            capacity=VEHICLE_CAPACITY,
+            start=(
+                f'parking_{ix % num_parking_lots}'
+                if num_parking_lots > 0
+                else f'school_{ix % num_schools}'
+            ),
+            end=f'school_{ix % num_schools}',
+            vehicle_id=f'vehicle_{ix}'
+        )
+        for ix in range(num_vehicles)
+    }
+
+    return riders, vehicles, depots
+
+
+def write_city(
+        input_dir: str,
+        riders: Dict[str, Rider],
+        vehicles: Dict[str, Vehicle],
+        depots: Dict[str, Depot],
+        params: Optional[Params] = None
+):
+    """Method to write a synthetic city as the input files of the Router"""
+
+    os.makedirs(input_dir, exist_ok=True)
+    entity_dicts = {
+        RIDERS_FILE: [
+            {
+                'rider_id': rider_id,
+                'lat': rider.location.lat,
+                'lng': rider.location.lng
+            }
+            for rider_id, rider in riders.items()
+        ],
+        VEHICLES_FILE: [
+            {
+                'vehicle_id': vehicle.vehicle_id,
+                'capacity': vehicle.capacity,
+                'start': vehicle.start,
+                'end': vehicle.end
+            }
+            for vehicle in vehicles.values()
+        ],
+        DEPOTS_FILE: [
+            {
+                'depot_id': depot.depot_id,
+                'lat': depot.location.lat,
+                'lng': depot.location.lng
+            }
+            for depot in depots.values()
+        ],
+        PARAMS_FILE: vars(params or Params())
+    }
+    for file, entities in entity_dicts.items():
+        with open(file.format(input_dir=input_dir), 'w') as f:
+            json.dump(entities, f)
+
+
+def write_road_network(
+        input_dir: str,
+        spacing: float = 0.3,
+        seed: int = 0
+) -> Tuple[int, int]:
+    """
+    Method to write a road network covering the city as the road graph
+    files of the Router: a grid of streets every `spacing` (km) at random
+    speeds, some of them one-way or closed. Returns the number of nodes and
+    edges.
+    """
+
+    random = np.random.default_rng(seed)
+    south_west = np.array(CITY_SOUTH_WEST)
+    north_east = np.array(CITY_NORTH_EAST)
+    degrees = spacing / 111.2
+    num_rows = int((north_east[0] - south_west[0]) / degrees) + 1
+    num_columns = int(
+        (north_east[1] - south_west[1]) /
+        (degrees / np.cos(np.radians(south_west[0])))
+    ) + 1
+    lats = np.repeat(
+        np.linspace(south_west[0], north_east[0], num_rows),
+        num_columns
+    )
+    lngs = np.tile(
+        np.linspace(south_west[1], north_east[1], num_columns),
+        num_rows
+    )
+
+    grid = np.arange(num_rows * num_columns).reshape(num_rows, num_columns)
+    sources = np.concatenate((grid[:, :-1].ravel(), grid[:-1, :].ravel()))
+    targets = np.concatenate((grid[:, 1:].ravel(), grid[1:, :].ravel()))
+    share = random.random(len(sources))
+    open_streets = share >= CLOSED_SHARE
+    sources, targets = sources[open_streets], targets[open_streets]
+    two_way = share[open_streets] >= CLOSED_SHARE + ONE_WAY_SHARE
+    sources, targets = (
+        np.concatenate((sources, targets[two_way])),
+        np.concatenate((targets, sources[two_way]))
+    )
+    seconds = haversine_vector(
+        lats[sources],
+        lngs[sources],
+        lats[targets],
+        lngs[targets]
+    ) / random.uniform(*STREET_SPEEDS, len(sources)) * 3600
+
+    os.makedirs(input_dir, exist_ok=True)
+    with open(ROAD_NODES_FILE.format(input_dir=input_dir), 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(['node_id', 'lat', 'lng'])
+        writer.writerows(zip(range(len(lats)), lats.tolist(), lngs.tolist()))
+    with open(ROAD_EDGES_FILE.format(input_dir=input_dir), 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(['source', 'target', 'seconds'])
+        writer.writerows(zip(
+            sources.tolist(),
+            targets.tolist(),
+            seconds.tolist()
+        ))
+
+    return len(lats), len(sources)
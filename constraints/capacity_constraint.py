@@ -1,29 +1,27 @@
-from ortools.constraint_solver.pywrapcp import RoutingModel
+from dataclasses import dataclass
+from typing import List
 
-from constraints.constraint import Constraint
+import numpy as np
 
+from constraints.dimension_constraint import DimensionConstraint
+from problem.problem import Problem
 
-class CapacityConstraint(Constraint):
+
+@dataclass
+class CapacityConstraint(DimensionConstraint):
     """Class that restricts the number of Riders assigned to each Vehicle"""
 
-    def _callback(self, from_index: int):
-        """Callback to obtain the demand at a Stop"""
+    name: str = 'capacity_constraint'
 
-        from_node = self.manager.IndexToNode(from_index)
+    def demands(self, problem: Problem) -> np.ndarray:
+        """The demand at a Stop is its number of Riders"""
 
-        return self.problem.stops[from_node].demand
+        return np.array(
+            [stop.demand for stop in problem.stops],
+            dtype=np.int64
+        )
 
-    def apply(self, solver: RoutingModel):
-        """Vehicle's occupation is restricted based on demand"""
+    def capacities(self, problem: Problem) -> List[int]:
+        """Vehicle's occupation is restricted to its capacity"""
 
-        callback_index = solver.RegisterUnaryTransitCallback(self._callback)
-        solver.AddDimensionWithVehicleCapacity(
-            evaluator_index=callback_index,
-            slack_max=0,
-            vehicle_capacities=[
-                vehicle.capacity
-                for vehicle in self.problem.vehicles.values()
-            ],
-            fix_start_cumul_to_zero=True,
-            name='capacity_constraint'
-        )
+        return [vehicle.capacity for vehicle in problem.vehicles.values()]
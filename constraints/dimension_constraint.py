@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Optional, List, Dict
+
+import numpy as np
+from ortools.constraint_solver.pywrapcp import RoutingIndexManager, \
+    RoutingDimension
+
+from problem.problem import Problem
+
+
+@dataclass
+class DimensionConstraint:
+    """
+    Class that represents an Opt. Constraint declared up front as a solver
+    Dimension: the quantity is given as a per-Stop demand vector or a
+    per-path transit matrix, and is registered natively by the builder.
+    With sparse estimations, transits are given by origin instead.
+    """
+
+    name: str = ''
+    slack_max: int = 0
+    fix_start_cumul_to_zero: bool = True
+
+    def demands(self, problem: Problem) -> Optional[np.ndarray]:
+        """Method to return the integer quantity demanded at each Stop"""
+
+        return None
+
+    def transits(self, problem: Problem) -> Optional[np.ndarray]:
+        """Method to return the integer quantity of each path between Stops"""
+
+        return None
+
+    def sparse_transits(
+            self,
+            problem: Problem
+    ) -> Optional[List[Dict[int, int]]]:
+        """
+        Method to return the integer quantity of each estimated path, as
+        the quantities to the destinations of every origin, when the
+        estimations are sparse
+        """
+
+        return None
+
+    def capacities(self, problem: Problem) -> List[int]:
+        """Method to return the maximum cumulative quantity of each Vehicle"""
+
+        pass
+
+    def restrict(
+            self,
+            problem: Problem,
+            manager: RoutingIndexManager,
+            dimension: RoutingDimension
+    ):
+        """Method to further restrict the cumulative quantity at Stops"""
+
+        pass
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import List, Dict
+
+import numpy as np
+from ortools.constraint_solver.pywrapcp import RoutingIndexManager, \
+    RoutingDimension
+
+from constraints.dimension_constraint import DimensionConstraint
+from problem.problem import Problem
+
+
+@dataclass
+class MaxRideDurationConstraint(DimensionConstraint):
+    """
+    Class that restricts the time (seconds) a Rider spends in the Vehicle,
+    from its start until the Rider's Stop is served
+    """
+
+    max_ride_duration: float = 0
+    name: str = 'max_ride_duration_constraint'
+
+    def transits(self, problem: Problem) -> np.ndarray:
+        """The transit of a path is the complete time between Stops"""
+
+        return problem.build_time_matrix(
+            resolution=problem.params.COST_RESOLUTION
+        )
+
+    def sparse_transits(self, problem: Problem) -> List[Dict[int, int]]:
+        """The transit of an estimated path is the complete time"""
+
+        return problem.build_time_rows(
+            resolution=problem.params.COST_RESOLUTION
+        )
+
+    def capacities(self, problem: Problem) -> List[int]:
+        """
+        Rider Stops are bounded in `restrict`, so Vehicles may exceed the
+        maximum ride duration only to return to their end depot. The return
+        time is the longest estimated time to an end, which every path to
+        the depots is, also with sparse estimations.
+        """
+
+        return_time = max(
+            problem.estimations.column(end).max() +
+            problem.stops[end].service_time
+            for end in set(problem.ends)
+        )
+        capacity = int(np.ceil(
+            (self.max_ride_duration + return_time) /
+            problem.params.COST_RESOLUTION
+        ))
+
+        return [capacity] * len(problem.vehicles)
+
+    def restrict(
+            self,
+            problem: Problem,
+            manager: RoutingIndexManager,
+            dimension: RoutingDimension
+    ):
+        """Every rider Stop is served within the maximum ride duration"""
+
+        max_ride_duration = int(
+            self.max_ride_duration / problem.params.COST_RESOLUTION
+        )
+        for stop_ix, stop in enumerate(problem.stops):
+            if not stop.depot_id:
+                dimension.CumulVar(manager.NodeToIndex(stop_ix)).SetMax(
+                    max_ride_duration
+                )
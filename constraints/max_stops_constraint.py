@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from constraints.dimension_constraint import DimensionConstraint
+from problem.problem import Problem
+
+
+@dataclass
+class MaxStopsConstraint(DimensionConstraint):
+    """Class that restricts the number of Stops visited by each Vehicle"""
+
+    max_stops: int = 0
+    name: str = 'max_stops_constraint'
+
+    def demands(self, problem: Problem) -> np.ndarray:
+        """Every rider Stop counts as one, depot Stops are not counted"""
+
+        return np.array(
+            [int(not stop.depot_id) for stop in problem.stops],
+            dtype=np.int64
+        )
+
+    def capacities(self, problem: Problem) -> List[int]:
+        """Every Vehicle visits at most the maximum number of Stops"""
+
+        return [self.max_stops] * len(problem.vehicles)
@@ -0,0 +1,317 @@
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Tuple, Dict
+
+import numpy as np
+
+from estimators.estimator import Estimator
+from models.estimation_matrix import EstimationMatrix, cast_estimations
+from models.stop import Stop
+from utils.geohash_utils import encode_geohash, geohash_strings
+
+# Number of origins queried at once from the disk cache
+DISK_QUERY_SIZE = 500
+
+
+@dataclass
+class CacheStatistics:
+    """Class that counts the paths served by each tier of the cache"""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+
+class CachedEstimator(Estimator):
+    """
+    Class that caches the estimations of another Estimator between runs.
+    Stops are keyed by their geohash at `precision`, so Stops in the same
+    cell share estimations. Estimations are stored by origin: every entry
+    holds the sorted destination geohashes and their times. The first tier
+    is an in-memory LRU bounded to `memory_size` paths, the second an
+    optional SQLite file bounded to `disk_size` origins. Only the paths
+    missing from both tiers are estimated, in a single batch.
+    """
+
+    def __init__(
+            self,
+            estimator: Estimator,
+            cache_file: Optional[str] = None,
+            memory_size: int = 10_000_000,
+            disk_size: Optional[int] = None,
+            precision: int = 9,
+            dtype: np.dtype = np.float64
+    ):
+        super().__init__(dtype=dtype)
+        self._estimator = estimator
+        self._memory_size = memory_size
+        self._disk_size = disk_size
+        self._precision = precision
+        self._memory = OrderedDict()
+        self._memory_paths = 0
+        self._connection = (
+            self._connect(cache_file)
+            if cache_file is not None
+            else None
+        )
+        self.statistics = CacheStatistics()
+
+    @property
+    def identity(self) -> str:
+        """Cached estimations are those of the Estimator at a precision"""
+
+        return f'{self._estimator.identity}@{self._precision}'
+
+    def estimate(self, stops: List[Stop]) -> EstimationMatrix:
+        """
+        Method that:
+        1) groups the stops by geohash,
+        2) looks up the paths between geohashes in memory and on disk,
+        3) estimates the missing paths in a single batch and caches them.
+        """
+
+        codes = encode_geohash(
+            np.array([stop.location.lat for stop in stops]),
+            np.array([stop.location.lng for stop in stops]),
+            precision=self._precision
+        )
+        cell_codes, representatives, inverse = np.unique(
+            codes,
+            return_index=True,
+            return_inverse=True
+        )
+        cells = geohash_strings(cell_codes, self._precision)
+        matrix = self._look_up(cells)
+        origins, destinations = np.nonzero(np.isnan(matrix))
+        if len(origins) > 0:
+            times = self._estimator.estimate_paths(
+                stops,
+                representatives[origins],
+                representatives[destinations]
+            )
+            matrix[origins, destinations] = times
+            self._save(cells, origins, destinations, times)
+
+        self.statistics.misses += len(origins)
+        logging.info(
+            f'Estimated {len(origins)} missing paths between '
+            f'{len(cells)} geohashes with the CachedEstimator, '
+            f'statistics: {asdict(self.statistics)}.'
+        )
+
+        return EstimationMatrix(
+            data=cast_estimations(
+                matrix[np.ix_(inverse, inverse)],
+                self._dtype
+            )
+        )
+
+    def estimate_paths(
+            self,
+            stops: List[Stop],
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Method that estimates a batch of paths with the Estimator. The paths
+        are not cached, since the cache holds full rows between geohashes.
+        """
+
+        return self._estimator.estimate_paths(stops, origins, destinations)
+
+    def _look_up(self, cells: np.ndarray) -> np.ndarray:
+        """Method to fill the matrix between geohashes from both tiers"""
+
+        matrix = np.full((len(cells), len(cells)), np.nan)
+        on_disk = []
+        for origin_ix, cell in enumerate(cells):
+            entry = self._memory.get(cell)
+            if entry is None:
+                on_disk.append(origin_ix)
+                continue
+
+            self._memory.move_to_end(cell)
+            self.statistics.memory_hits += self._fill(
+                matrix[origin_ix], cells, *entry
+            )
+
+        if self._connection is not None and on_disk:
+            entries = self._read(cells[on_disk])
+            for origin_ix in on_disk:
+                entry = entries.get(cells[origin_ix])
+                if entry is not None:
+                    self._remember(cells[origin_ix], *entry)
+                    self.statistics.disk_hits += self._fill(
+                        matrix[origin_ix], cells, *entry
+                    )
+
+        return matrix
+
+    @staticmethod
+    def _fill(
+            row: np.ndarray,
+            cells: np.ndarray,
+            destinations: np.ndarray,
+            times: np.ndarray
+    ) -> int:
+        """Method to fill a row with the cached times, returning the hits"""
+
+        positions = np.searchsorted(destinations, cells)
+        positions[positions == len(destinations)] = 0
+        hits = destinations[positions] == cells
+        row[hits] = times[positions[hits]]
+
+        return int(hits.sum())
+
+    def _save(
+            self,
+            cells: np.ndarray,
+            origins: np.ndarray,
+            destinations: np.ndarray,
+            times: np.ndarray
+    ):
+        """Method to merge the estimated paths into both tiers"""
+
+        bounds = np.flatnonzero(np.diff(origins)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(origins)]))
+
+        # Entries evicted from memory are merged with their copy on disk
+        entries = {
+            cell: self._memory[cell]
+            for cell in cells[origins[starts]]
+            if cell in self._memory
+        }
+        if self._connection is not None:
+            evicted = np.array(
+                [cell for cell in cells[origins[starts]]
+                 if cell not in entries],
+                dtype=cells.dtype
+            )
+            entries.update(self._read(evicted))
+
+        updates = []
+        for start, end in zip(starts, ends):
+            cell = cells[origins[start]]
+            new_destinations = cells[destinations[start:end]]
+            new_times = times[start:end]
+            entry = entries.get(cell)
+            if entry is not None:
+                new_destinations = np.concatenate((entry[0], new_destinations))
+                new_times = np.concatenate((entry[1], new_times))
+                order = np.argsort(new_destinations, kind='stable')
+                new_destinations = new_destinations[order]
+                new_times = new_times[order]
+
+            self._remember(cell, new_destinations, new_times)
+            updates.append((cell, new_destinations, new_times))
+
+        if self._connection is not None:
+            self._write(updates)
+
+    def _remember(
+            self,
+            cell: bytes,
+            destinations: np.ndarray,
+            times: np.ndarray
+    ):
+        """Method to keep an entry in memory, evicting the least recent"""
+
+        previous = self._memory.pop(cell, None)
+        if previous is not None:
+            self._memory_paths -= len(previous[0])
+
+        self._memory[cell] = (destinations, times)
+        self._memory_paths += len(destinations)
+        while self._memory_paths > self._memory_size and self._memory:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_paths -= len(evicted)
+            self.statistics.memory_evictions += 1
+
+    @staticmethod
+    def _connect(cache_file: str) -> sqlite3.Connection:
+        """Method to open the disk cache, creating it if needed"""
+
+        connection = sqlite3.connect(cache_file, timeout=30)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS estimations ('
+            'estimator TEXT NOT NULL, '
+            'origin TEXT NOT NULL, '
+            'destinations BLOB NOT NULL, '
+            'times BLOB NOT NULL, '
+            'accessed REAL NOT NULL, '
+            'PRIMARY KEY (estimator, origin)'
+            ') WITHOUT ROWID'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS estimations_accessed '
+            'ON estimations (estimator, accessed)'
+        )
+        connection.commit()
+
+        return connection
+
+    def _read(
+            self,
+            cells: np.ndarray
+    ) -> Dict[bytes, Tuple[np.ndarray, np.ndarray]]:
+        """Method to read the entries of some origins from the disk cache"""
+
+        entries = {}
+        origins = [cell.decode() for cell in cells.tolist()]
+        for start in range(0, len(origins), DISK_QUERY_SIZE):
+            batch = origins[start:start + DISK_QUERY_SIZE]
+            rows = self._connection.execute(
+                f'SELECT origin, destinations, times FROM estimations '
+                f'WHERE estimator = ? '
+                f'AND origin IN ({", ".join("?" * len(batch))})',
+                [self.identity] + batch
+            )
+            for origin, destinations, times in rows:
+                entries[origin.encode()] = (
+                    np.frombuffer(destinations, dtype=cells.dtype),
+                    np.frombuffer(times, dtype=np.float64)
+                )
+
+        self._connection.executemany(
+            'UPDATE estimations SET accessed = ? '
+            'WHERE estimator = ? AND origin = ?',
+            [(time.time(), self.identity, cell.decode()) for cell in entries]
+        )
+        self._connection.commit()
+
+        return entries
+
+    def _write(self, updates: List[Tuple[bytes, np.ndarray, np.ndarray]]):
+        """Method to write entries to the disk cache, evicting the oldest"""
+
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO estimations '
+            '(estimator, origin, destinations, times, accessed) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [
+                (
+                    self.identity,
+                    cell.decode(),
+                    destinations.tobytes(),
+                    times.astype(np.float64).tobytes(),
+                    time.time()
+                )
+                for cell, destinations, times in updates
+            ]
+        )
+        if self._disk_size is not None:
+            evicted = self._connection.execute(
+                'DELETE FROM estimations WHERE estimator = ? AND origin IN ('
+                'SELECT origin FROM estimations WHERE estimator = ? '
+                'ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.identity, self.identity, self._disk_size)
+            )
+            self.statistics.disk_evictions += evicted.rowcount
+
+        self._connection.commit()
@@ -1,29 +1,138 @@
 import logging
-from typing import List, Tuple, Dict
+from itertools import product
+from typing import List, Tuple
 
 import numpy as np
 
+from models.estimation_matrix import EstimationMatrix, cast_estimations
+from models.sparse_estimation_matrix import SparseEstimationMatrix
 from models.stop import Stop
+from utils.geo_utils import nearest_neighbours
 
 
 class Estimator:
     """Class that estimates time between Stops"""
 
-    def estimate(self, stops: List[Stop]) -> Dict[Tuple, float]:
+    def __init__(self, dtype: np.dtype = np.float64):
+        self._dtype = dtype
+
+    def estimate(self, stops: List[Stop]) -> EstimationMatrix:
         """Method to estimate time between stops"""
 
         pass
 
+    def estimate_sparse(
+            self,
+            stops: List[Stop],
+            neighbours: int
+    ) -> SparseEstimationMatrix:
+        """
+        Method to estimate only the paths of the sparse graph of the stops,
+        in a single batch of `estimate_paths`
+        """
+
+        origins, destinations = self._build_sparse_paths(stops, neighbours)
+        times = self.estimate_paths(stops, origins, destinations)
+        estimations = SparseEstimationMatrix.from_paths(
+            origins,
+            destinations,
+            cast_estimations(times, self._dtype),
+            len(stops)
+        )
+        logging.info(
+            f'Estimated {len(estimations)} sparse paths with the '
+            f'{type(self).__name__}.'
+        )
+
+        return estimations
+
+    def estimate_matrix(self, stops: List[Stop]) -> np.ndarray:
+        """Method to estimate the full time matrix between stops at once"""
+
+        pass
+
+    def estimate_paths(
+            self,
+            stops: List[Stop],
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """Method to estimate the time of a batch of paths between stops"""
+
+        pass
+
+    @property
+    def identity(self) -> str:
+        """Method that returns a key identifying the estimations produced"""
+
+        return type(self).__name__
+
     @staticmethod
     def _build_paths(num_stops: int) -> List[Tuple[int, int]]:
         """Method to build the paths that will be estimated"""
 
-        stops_indices = np.arange(num_stops)
-        stops_indices_rep = np.arange(num_stops)
-        mesh = np.array(np.meshgrid(stops_indices, stops_indices_rep))
-        combinations = mesh.T.reshape(-1, 2)
+        combinations = list(product(range(num_stops), repeat=2))
         logging.info(
             f'Built {len(combinations)} paths from {num_stops} stops.'
         )
 
-        return list(map(tuple, combinations))
+        return combinations
+
+    @staticmethod
+    def _build_sparse_paths(
+            stops: List[Stop],
+            neighbours: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Method to build the paths of the sparse graph: from every stop to its
+        nearest neighbours, and from and to every depot stop
+        """
+
+        num_stops = len(stops)
+        nearest = nearest_neighbours(
+            *Estimator._build_coordinates(stops),
+            neighbours
+        )
+        depots = np.array(
+            [stop_ix for stop_ix, stop in enumerate(stops) if stop.depot_id],
+            dtype=np.int64
+        )
+        all_stops = np.arange(num_stops)
+        origins = np.concatenate((
+            np.repeat(all_stops, nearest.shape[1]),
+            nearest.ravel(),
+            np.repeat(depots, num_stops),
+            np.tile(all_stops, len(depots))
+        ))
+        destinations = np.concatenate((
+            nearest.ravel(),
+            np.repeat(all_stops, nearest.shape[1]),
+            np.tile(all_stops, len(depots)),
+            np.repeat(depots, num_stops)
+        ))
+        paths = np.unique(origins * num_stops + destinations)
+        logging.info(
+            f'Built {len(paths)} sparse paths from {num_stops} stops with '
+            f'{nearest.shape[1]} neighbours.'
+        )
+
+        return paths // num_stops, paths % num_stops
+
+    @staticmethod
+    def _build_coordinates(
+            stops: List[Stop]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Method to build the latitude and longitude arrays of the stops"""
+
+        lats = np.fromiter(
+            (stop.location.lat for stop in stops),
+            dtype=np.float64,
+            count=len(stops)
+        )
+        lngs = np.fromiter(
+            (stop.location.lng for stop in stops),
+            dtype=np.float64,
+            count=len(stops)
+        )
+
+        return lats, lngs
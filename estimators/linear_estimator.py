@@ -1,36 +1,158 @@
 import logging
-from typing import List, Dict, Tuple
+from typing import List
 
-from haversine import haversine
+import numpy as np
 
 from estimators.estimator import Estimator
+from models.estimation_matrix import EstimationMatrix, cast_estimations, \
+    condensed_index
 from models.stop import Stop
 from models.vehicle import DEFAULT_VELOCITY
+from utils.geo_utils import haversine_vector, equirectangular_vector
+
+ROWS_PER_BLOCK = 1024
 
 
 class LinearEstimator(Estimator):
     """Class that estimates the linear-distance-based time between Stops"""
 
-    def estimate(self, stops: List[Stop]) -> Dict[Tuple, float]:
+    def __init__(
+            self,
+            approximate: bool = False,
+            dtype: np.dtype = np.float64,
+            condensed: bool = False
+    ):
+        super().__init__(dtype=dtype)
+        self._approximate = approximate
+        self._condensed = condensed
+
+    def estimate(self, stops: List[Stop]) -> EstimationMatrix:
         """"
-        Method that:
-        1) obtains the paths to estimate, and
-        2) calculates the linear time by dividing the linear distance by the
-        default velocity.
+        Method that calculates the linear time between all the stops by
+        dividing the linear distance by the default velocity. Since linear
+        times are symmetric, they may be stored in the condensed upper
+        triangle.
         """
 
-        paths = self._build_paths(num_stops=len(stops))
-        estimations = {}
+        estimations = EstimationMatrix(
+            data=(
+                self._estimate_condensed(stops)
+                if self._condensed
+                else self.estimate_matrix(stops)
+            )
+        )
+        logging.info(
+            f'Estimated {len(estimations)} paths with the LinearEstimator.'
+        )
 
-        for origin_ix, destination_ix in paths:
-            origin = stops[origin_ix].location.coordinates
-            destination = stops[destination_ix].location.coordinates
-            estimations[(origin_ix, destination_ix)] = (
-                haversine(origin, destination) / DEFAULT_VELOCITY
-                if origin != destination
-                else 0.
+        return estimations
+
+    def estimate_matrix(self, stops: List[Stop]) -> np.ndarray:
+        """
+        Method that calculates the linear time between all the stops in a
+        single vectorized pass. If the estimator is approximate, the
+        equirectangular distance is used instead of the haversine distance.
+        """
+
+        lats, lngs = self._build_coordinates(stops)
+        matrix = np.empty((len(stops), len(stops)), dtype=self._dtype)
+
+        # Rows are processed in blocks to bound the temporary arrays
+        for start in range(0, len(stops), ROWS_PER_BLOCK):
+            end = start + ROWS_PER_BLOCK
+            matrix[start:end] = self._estimate_block(
+                lats[start:end, np.newaxis],
+                lngs[start:end, np.newaxis],
+                lats[np.newaxis, :],
+                lngs[np.newaxis, :]
             )
 
-        logging.info(f'Estimated {len(paths)} paths with the LinearEstimator.')
+        return matrix
 
-        return estimations
+    def estimate_paths(
+            self,
+            stops: List[Stop],
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """Method that calculates the linear time of a batch of paths"""
+
+        lats, lngs = self._build_coordinates(stops)
+
+        return self._estimate_times(
+            lats[origins],
+            lngs[origins],
+            lats[destinations],
+            lngs[destinations]
+        )
+
+    @property
+    def identity(self) -> str:
+        """The linear time depends on the distance and the velocity"""
+
+        distance = 'equirectangular' if self._approximate else 'haversine'
+
+        return f'LinearEstimator({distance}, {DEFAULT_VELOCITY})'
+
+    def _estimate_condensed(self, stops: List[Stop]) -> np.ndarray:
+        """Method that calculates the upper triangle of the linear times"""
+
+        lats, lngs = self._build_coordinates(stops)
+        num_stops = len(stops)
+        data = np.empty(num_stops * (num_stops + 1) // 2, dtype=self._dtype)
+
+        for start in range(0, num_stops, ROWS_PER_BLOCK):
+            end = min(start + ROWS_PER_BLOCK, num_stops)
+            block = self._estimate_block(
+                lats[start:end, np.newaxis],
+                lngs[start:end, np.newaxis],
+                lats[np.newaxis, start:],
+                lngs[np.newaxis, start:]
+            )
+            for stop_ix in range(start, end):
+                offset = condensed_index(stop_ix, stop_ix, num_stops)
+                data[offset:offset + num_stops - stop_ix] = (
+                    block[stop_ix - start, stop_ix - start:]
+                )
+
+        return data
+
+    def _estimate_block(
+            self,
+            origins_lat: np.ndarray,
+            origins_lng: np.ndarray,
+            destinations_lat: np.ndarray,
+            destinations_lng: np.ndarray
+    ) -> np.ndarray:
+        """Method that calculates the linear time in the storage type"""
+
+        times = self._estimate_times(
+            origins_lat,
+            origins_lng,
+            destinations_lat,
+            destinations_lng
+        )
+
+        return cast_estimations(times, self._dtype)
+
+    def _estimate_times(
+            self,
+            origins_lat: np.ndarray,
+            origins_lng: np.ndarray,
+            destinations_lat: np.ndarray,
+            destinations_lng: np.ndarray
+    ) -> np.ndarray:
+        """Method that calculates the linear time between coordinates"""
+
+        distance = (
+            equirectangular_vector
+            if self._approximate
+            else haversine_vector
+        )
+
+        return distance(
+            origins_lat,
+            origins_lng,
+            destinations_lat,
+            destinations_lng
+        ) / DEFAULT_VELOCITY
@@ -0,0 +1,101 @@
+import logging
+from typing import List, Dict, Any, Tuple, Union
+
+import numpy as np
+
+from estimators.estimator import Estimator
+from models.estimation_matrix import EstimationMatrix, condensed_index
+from models.stop import Stop
+
+
+class PrecomputedEstimator(Estimator):
+    """
+    Class that serves estimations computed offline, usually memory-mapped
+    from the input dir. The manifest lists the Stop (as in `Stop.to_dict`)
+    of every row of the matrix, which may be dense or condensed.
+    """
+
+    def __init__(self, matrix: np.ndarray, stops_dicts: List[Dict[str, Any]]):
+        super().__init__(dtype=matrix.dtype)
+        self._matrix = matrix
+        self._positions = {
+            self._build_key(stop_dict): position
+            for position, stop_dict in enumerate(stops_dicts)
+        }
+        if len(self._positions) != len(stops_dicts):
+            raise ValueError('The stops manifest has repeated stops.')
+
+        if EstimationMatrix(data=matrix).num_stops != len(stops_dicts):
+            raise ValueError(
+                f'The estimations {matrix.shape} do not match the '
+                f'{len(stops_dicts)} stops in the manifest.'
+            )
+
+    def estimate(self, stops: List[Stop]) -> EstimationMatrix:
+        """
+        Method that validates the stops against the manifest. If the stops
+        are those of the manifest in the same order, the matrix is served
+        without copying; otherwise the rows of the stops are gathered.
+        """
+
+        positions = self._find_positions(stops)
+        if positions == list(range(len(self._positions))):
+            estimations = EstimationMatrix(data=self._matrix)
+
+        else:
+            logging.warning(
+                f'The {len(stops)} stops differ in order or number from the '
+                f'{len(self._positions)} precomputed stops, their '
+                f'estimations are copied to memory.'
+            )
+            estimations = EstimationMatrix(data=self._matrix).take(
+                np.array(positions)
+            )
+
+        logging.info(
+            f'Served {len(estimations)} paths with the PrecomputedEstimator.'
+        )
+
+        return estimations
+
+    def estimate_paths(
+            self,
+            stops: List[Stop],
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """Method that gathers the precomputed times of a batch of paths"""
+
+        positions = np.array(self._find_positions(stops), dtype=np.int64)
+        origins, destinations = positions[origins], positions[destinations]
+        if self._matrix.ndim == 2:
+            return self._matrix[origins, destinations]
+
+        return self._matrix[condensed_index(
+            np.minimum(origins, destinations),
+            np.maximum(origins, destinations),
+            len(self._positions)
+        )]
+
+    def _find_positions(self, stops: List[Stop]) -> List[int]:
+        """Method to find the position of every stop in the manifest"""
+
+        positions = []
+        for stop in stops:
+            key = self._build_key(stop.to_dict())
+            if key not in self._positions:
+                raise ValueError(
+                    f'The stop {key} is not in the precomputed estimations.'
+                )
+            positions.append(self._positions[key])
+
+        return positions
+
+    @staticmethod
+    def _build_key(stop_dict: Dict[str, Any]) -> Union[str, Tuple[str, ...]]:
+        """Method to identify a Stop by its depot or its sorted Riders"""
+
+        if stop_dict.get('depot_id'):
+            return stop_dict['depot_id']
+
+        return tuple(sorted(stop_dict['riders']))
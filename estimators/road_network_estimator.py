@@ -0,0 +1,153 @@
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+from estimators.estimator import Estimator
+from models.contraction_hierarchy import ContractionHierarchy
+from models.estimation_matrix import EstimationMatrix, cast_estimations
+from models.stop import Stop
+from models.vehicle import DEFAULT_VELOCITY
+from utils.geo_utils import haversine_vector, nearest_points
+
+
+class RoadNetworkEstimator(Estimator):
+    """
+    Class that estimates the time between Stops along a road graph, with
+    the many-to-many queries of its ContractionHierarchy. Every Stop is
+    snapped to its nearest node, and the linear time between them is added
+    to both ends of its paths. Paths without a road between their nodes
+    fall back to the linear time.
+    """
+
+    def __init__(
+            self,
+            hierarchy: ContractionHierarchy,
+            dtype: np.dtype = np.float64
+    ):
+        super().__init__(dtype=dtype)
+        self._hierarchy = hierarchy
+
+    def estimate(self, stops: List[Stop]) -> EstimationMatrix:
+        """Method that estimates the road times between all the stops"""
+
+        estimations = EstimationMatrix(
+            data=cast_estimations(self.estimate_matrix(stops), self._dtype)
+        )
+        logging.info(
+            f'Estimated {len(estimations)} paths with the '
+            f'RoadNetworkEstimator.'
+        )
+
+        return estimations
+
+    def estimate_matrix(self, stops: List[Stop]) -> np.ndarray:
+        """
+        Method that estimates the road times between all the stops, with a
+        single many-to-many query between their distinct nodes
+        """
+
+        lats, lngs, nodes, access_times = self._snap(stops)
+        unique_nodes, positions = np.unique(nodes, return_inverse=True)
+        road_times = self._hierarchy.many_to_many(unique_nodes, unique_nodes)
+        matrix = (
+            access_times[:, np.newaxis] +
+            road_times[np.ix_(positions, positions)] +
+            access_times[np.newaxis, :]
+        )
+        unreachable = np.isinf(matrix)
+        if unreachable.any():
+            origins, destinations = np.nonzero(unreachable)
+            matrix[unreachable] = self._estimate_linear(
+                lats,
+                lngs,
+                origins,
+                destinations
+            )
+
+        np.fill_diagonal(matrix, 0)
+
+        return matrix
+
+    def estimate_paths(
+            self,
+            stops: List[Stop],
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Method that estimates the road times of a batch of paths, searching
+        once from every distinct origin node
+        """
+
+        lats, lngs, nodes, access_times = self._snap(stops)
+        times = self._hierarchy.paths(nodes[origins], nodes[destinations])
+        times += access_times[origins] + access_times[destinations]
+        unreachable = np.isinf(times)
+        if unreachable.any():
+            times[unreachable] = self._estimate_linear(
+                lats,
+                lngs,
+                origins[unreachable],
+                destinations[unreachable]
+            )
+
+        times[origins == destinations] = 0
+
+        return times
+
+    @property
+    def identity(self) -> str:
+        """The road times depend on the road graph and the velocity"""
+
+        return (
+            f'RoadNetworkEstimator({self._hierarchy.checksum}, '
+            f'{DEFAULT_VELOCITY})'
+        )
+
+    def _snap(
+            self,
+            stops: List[Stop]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Method to obtain the coordinates of the stops, their nearest nodes
+        and the linear time to them
+        """
+
+        lats = np.array([stop.location.lat for stop in stops])
+        lngs = np.array([stop.location.lng for stop in stops])
+        nodes = nearest_points(
+            lats,
+            lngs,
+            self._hierarchy.lats,
+            self._hierarchy.lngs
+        )
+        access_times = haversine_vector(
+            lats,
+            lngs,
+            self._hierarchy.lats[nodes],
+            self._hierarchy.lngs[nodes]
+        ) / DEFAULT_VELOCITY
+
+        return lats, lngs, nodes, access_times
+
+    @staticmethod
+    def _estimate_linear(
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """Method that falls back to the linear time of some paths"""
+
+        logging.warning(
+            f'{len(origins)} paths have no road between their stops, their '
+            f'linear time is used.'
+        )
+
+        return haversine_vector(
+            lats[origins],
+            lngs[origins],
+            lats[destinations],
+            lngs[destinations]
+        ) / DEFAULT_VELOCITY
@@ -0,0 +1,365 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from typing import List, Tuple, Dict, Any
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from estimators.estimator import Estimator
+from models.estimation_matrix import EstimationMatrix, cast_estimations
+from models.stop import Stop
+from models.vehicle import DEFAULT_VELOCITY
+from utils.geo_utils import haversine_vector
+from utils.http_utils import HttpConnectionPool
+
+# Statuses of the responses whose requests are retried
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Percentiles of the latency of the requests that are reported
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+class TableServiceError(Exception):
+    """Error raised when the table service fails to answer a tile"""
+
+
+@dataclass
+class TableStatistics:
+    """Class that measures the requests of an estimation to the service"""
+
+    tiles: int = 0
+    requests: int = 0
+    retries: int = 0
+    connections: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    seconds: float = 0
+    latencies: List[float] = field(default_factory=lambda: list())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Method to summarize the statistics, with latency percentiles"""
+
+        summary = asdict(self)
+        latencies = summary.pop('latencies')
+        for percentile in LATENCY_PERCENTILES:
+            summary[f'latency_p{percentile}'] = (
+                float(np.percentile(latencies, percentile))
+                if latencies
+                else None
+            )
+
+        return summary
+
+
+class TableServiceEstimator(Estimator):
+    """
+    Class that estimates the time between Stops with an OSRM-style table
+    service, e.g. `http://127.0.0.1:5000` for
+    `GET /table/v1/{profile}/{lng,lat;...}?sources=...&destinations=...`.
+    The matrix is split into tiles of at most `max_locations` coordinates,
+    the limit of the service, which are requested concurrently over a pool
+    of keep-alive connections and stitched together. Failed requests are
+    retried with an exponential backoff, and paths the service cannot
+    route fall back to the linear time. The statistics of the requests of
+    the last estimation are kept in `statistics`.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            profile: str = 'driving',
+            max_locations: int = 100,
+            max_concurrency: int = 8,
+            max_retries: int = 3,
+            backoff: float = 0.1,
+            timeout: float = 30,
+            dtype: np.dtype = np.float64
+    ):
+        super().__init__(dtype=dtype)
+        if max_locations < 2:
+            raise ValueError(
+                f'A tile needs at least 2 locations, got {max_locations}.'
+            )
+
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'The table service URL {url} is not valid.')
+
+        self._url = url
+        self._host = parts.hostname
+        self._port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self._ssl = parts.scheme == 'https'
+        self._prefix = f'{parts.path.rstrip("/")}/table/v1/{profile}'
+        self._profile = profile
+        self._max_locations = max_locations
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self.statistics = TableStatistics()
+
+    def estimate(self, stops: List[Stop]) -> EstimationMatrix:
+        """Method that requests the times between all the stops"""
+
+        estimations = EstimationMatrix(
+            data=cast_estimations(self.estimate_matrix(stops), self._dtype)
+        )
+        logging.info(
+            f'Estimated {len(estimations)} paths with the '
+            f'TableServiceEstimator.'
+        )
+
+        return estimations
+
+    def estimate_matrix(self, stops: List[Stop]) -> np.ndarray:
+        """
+        Method that requests the times between all the stops in square
+        tiles, stitched into the matrix
+        """
+
+        lats, lngs = self._build_coordinates(stops)
+        side = self._max_locations // 2
+        blocks = [
+            np.arange(start, min(start + side, len(stops)))
+            for start in range(0, len(stops), side)
+        ]
+        tiles = [
+            (origins, destinations)
+            for origins in blocks
+            for destinations in blocks
+        ]
+        matrix = np.empty((len(stops), len(stops)))
+        for (origins, destinations), times in zip(
+                tiles,
+                self._request_tiles(lats, lngs, tiles)
+        ):
+            matrix[np.ix_(origins, destinations)] = times
+
+        unrouted = np.isnan(matrix)
+        if unrouted.any():
+            matrix[unrouted] = self._estimate_linear(
+                lats,
+                lngs,
+                *np.nonzero(unrouted)
+            )
+
+        np.fill_diagonal(matrix, 0)
+
+        return matrix
+
+    def estimate_paths(
+            self,
+            stops: List[Stop],
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Method that requests the times of a batch of paths. The distinct
+        origins are split in blocks, and the destinations of every block in
+        tiles that fill the rest of the locations, so only the destinations
+        of its paths are requested for every origin.
+        """
+
+        lats, lngs = self._build_coordinates(stops)
+        order = np.argsort(origins, kind='stable')
+        unique_origins = np.unique(origins)
+        side = self._max_locations // 2
+        tiles, tile_paths = [], []
+        for start in range(0, len(unique_origins), side):
+            block = unique_origins[start:start + side]
+            paths = order[
+                np.searchsorted(origins[order], block[0]):
+                np.searchsorted(origins[order], block[-1], side='right')
+            ]
+            block_destinations = np.unique(destinations[paths])
+            width = self._max_locations - len(block)
+            for tile_start in range(0, len(block_destinations), width):
+                tile_destinations = block_destinations[
+                    tile_start:tile_start + width
+                ]
+                tiles.append((block, tile_destinations))
+                tile_paths.append(paths[
+                    (destinations[paths] >= tile_destinations[0]) &
+                    (destinations[paths] <= tile_destinations[-1])
+                ])
+
+        times = np.empty(len(origins))
+        for (tile_origins, tile_destinations), paths, tile_times in zip(
+                tiles,
+                tile_paths,
+                self._request_tiles(lats, lngs, tiles)
+        ):
+            times[paths] = tile_times[
+                np.searchsorted(tile_origins, origins[paths]),
+                np.searchsorted(tile_destinations, destinations[paths])
+            ]
+
+        unrouted = np.isnan(times)
+        if unrouted.any():
+            times[unrouted] = self._estimate_linear(
+                lats,
+                lngs,
+                origins[unrouted],
+                destinations[unrouted]
+            )
+
+        times[origins == destinations] = 0
+
+        return times
+
+    @property
+    def identity(self) -> str:
+        """The times depend on the service and its profile"""
+
+        return f'TableServiceEstimator({self._url}, {self._profile})'
+
+    def _request_tiles(
+            self,
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            tiles: List[Tuple[np.ndarray, np.ndarray]]
+    ) -> List[np.ndarray]:
+        """
+        Method to request the times of every tile concurrently, measuring
+        the requests in fresh statistics
+        """
+
+        self.statistics = TableStatistics(tiles=len(tiles))
+        start = time.perf_counter()
+        times = asyncio.run(self._gather_tiles(lats, lngs, tiles))
+        self.statistics.seconds = time.perf_counter() - start
+        logging.info(
+            f'Requested {len(tiles)} tiles from the table service, '
+            f'statistics: {self.statistics.to_dict()}.'
+        )
+
+        return times
+
+    async def _gather_tiles(
+            self,
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            tiles: List[Tuple[np.ndarray, np.ndarray]]
+    ) -> List[np.ndarray]:
+        """Method to request the tiles over a pool of connections"""
+
+        pool = HttpConnectionPool(
+            self._host,
+            self._port,
+            max_connections=self._max_concurrency,
+            timeout=self._timeout,
+            use_ssl=self._ssl
+        )
+        try:
+            return await asyncio.gather(*[
+                self._request_tile(pool, lats, lngs, origins, destinations)
+                for origins, destinations in tiles
+            ])
+
+        finally:
+            await pool.close()
+            self.statistics.connections = pool.connections
+
+    async def _request_tile(
+            self,
+            pool: HttpConnectionPool,
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Method to request the times from some origins to some destinations,
+        retrying with an exponential backoff. The paths the service cannot
+        route are NaN.
+        """
+
+        stops = np.concatenate((origins, destinations))
+        coordinates = ';'.join(
+            f'{lng:.6f},{lat:.6f}'
+            for lat, lng in zip(lats[stops].tolist(), lngs[stops].tolist())
+        )
+        path = (
+            f'{self._prefix}/{coordinates}'
+            f'?sources={";".join(map(str, range(len(origins))))}'
+            f'&destinations='
+            f'{";".join(map(str, range(len(origins), len(stops))))}'
+            f'&annotations=duration'
+        )
+        for attempt in range(self._max_retries + 1):
+            if attempt > 0:
+                self.statistics.retries += 1
+                await asyncio.sleep(self._backoff * 2 ** (attempt - 1))
+
+            try:
+                response = await pool.request('GET', path)
+
+            except (OSError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError) as error:
+                failure = f'{type(error).__name__}: {error}'
+                continue
+
+            except ValueError as error:
+                raise TableServiceError(
+                    f'The table service answered an unsupported response: '
+                    f'{error}'
+                ) from error
+
+            self.statistics.requests += 1
+            self.statistics.latencies.append(response.seconds)
+            self.statistics.bytes_sent += response.bytes_sent
+            self.statistics.bytes_received += response.bytes_received
+            if response.status in RETRY_STATUSES:
+                failure = f'status {response.status}'
+                continue
+
+            if response.status != 200:
+                raise TableServiceError(
+                    f'The table service answered {response.status}: '
+                    f'{response.body[:200].decode("utf-8", "replace")}'
+                )
+
+            try:
+                table = json.loads(response.body)
+
+            except ValueError as error:
+                raise TableServiceError(
+                    f'The table service answered an invalid table: {error}.'
+                ) from error
+
+            if not isinstance(table, dict) or table.get('code') != 'Ok':
+                raise TableServiceError(
+                    f'The table service answered an invalid table: '
+                    f'{response.body[:200].decode("utf-8", "replace")}'
+                )
+
+            return np.array(table['durations'], dtype=np.float64)
+
+        raise TableServiceError(
+            f'The table service failed {self._max_retries + 1} times, the '
+            f'last one with {failure}.'
+        )
+
+    @staticmethod
+    def _estimate_linear(
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """Method that falls back to the linear time of some paths"""
+
+        logging.warning(
+            f'{len(origins)} paths could not be routed by the table '
+            f'service, their linear time is used.'
+        )
+
+        return haversine_vector(
+            lats[origins],
+            lngs[origins],
+            lats[destinations],
+            lngs[destinations]
+        ) / DEFAULT_VELOCITY
@@ -1,45 +1,257 @@
 import argparse
+import json
+import os
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Optional
 
 from constraints.capacity_constraint import CapacityConstraint
+from constraints.max_ride_duration_constraint import \
+    MaxRideDurationConstraint
+from constraints.max_stops_constraint import MaxStopsConstraint
+from estimators.cached_estimator import CachedEstimator
+from estimators.estimator import Estimator
 from estimators.linear_estimator import LinearEstimator
+from estimators.precomputed_estimator import PrecomputedEstimator
+from estimators.road_network_estimator import RoadNetworkEstimator
+from estimators.table_service_estimator import TableServiceEstimator
+from models.params import Params
 from optimization_model.optimization_model_builder import \
     OptimizationModelBuilder
+from optimization_model.portfolio_optimization_model import \
+    PortfolioOptimizationModelBuilder
 from problem.problem_builder import ProblemBuilder
+from problem.problem_decomposer import ProblemDecomposer
 from router import Router
-from utils.file_utils import read_entities, write_routes
+from settings import TELEMETRY_FILE
+from utils.file_utils import read_entities, read_estimations, \
+    read_road_network
 from utils.logging_utils import configure_logs
+from utils.profile_utils import Profiler, profile_stage, \
+    DEFAULT_SAMPLE_INTERVAL
+from writers.json_routes_writer import JsonRoutesWriter
+from writers.ndjson_routes_writer import NdjsonRoutesWriter
+from writers.npz_routes_writer import NpzRoutesWriter
+from writers.routes_writer import RoutesWriter
 
-"""Main method to execute the Router"""
-
-# CLI parsing
-parser = argparse.ArgumentParser(description='Route some school buses.')
-parser.add_argument(
-    '--input-dir',
-    type=str,
-    help='Directory for reading the Input. Default is ./input',
-    default='./input'
-)
-parser.add_argument(
-    '--output-dir',
-    type=str,
-    help='Directory for reading the Output. Default is ./output',
-    default='./output',
-)
-args = parser.parse_args()
-input_dir = args.input_dir
-output_dir = args.output_dir
-
-# Method execution
-configure_logs()
-riders, vehicles, depots, params = read_entities(input_dir)
-estimator = LinearEstimator()
-problem_builder = ProblemBuilder(params=params, estimator=estimator)
-optimization_model_builder = OptimizationModelBuilder(
-    constraints=[CapacityConstraint()]
-)
-router = Router(
-    problem_builder=problem_builder,
-    optimization_model_builder=optimization_model_builder
-)
-routes = router.route(riders, vehicles, depots)
-write_routes(output_dir, routes)
+# Formats in which the Routes can be written
+OUTPUT_FORMATS = ['json', 'ndjson', 'ndjson.gz', 'npz']
+
+
+def build_router(
+        params: Params,
+        estimator: Estimator,
+        telemetry: bool = False
+) -> Router:
+    """
+    Method to build the Router with the services set by the Params. With
+    telemetry, the searches record their solutions and callback calls.
+    """
+
+    problem_builder = ProblemBuilder(params=params, estimator=estimator)
+    constraints = [CapacityConstraint()]
+    if params.MAX_RIDE_DURATION is not None:
+        constraints.append(
+            MaxRideDurationConstraint(
+                max_ride_duration=params.MAX_RIDE_DURATION
+            )
+        )
+    if params.MAX_STOPS_PER_ROUTE is not None:
+        constraints.append(
+            MaxStopsConstraint(max_stops=params.MAX_STOPS_PER_ROUTE)
+        )
+    if params.PORTFOLIO_SIZE > 1:
+        optimization_model_builder = PortfolioOptimizationModelBuilder(
+            constraints=constraints,
+            portfolio_size=params.PORTFOLIO_SIZE
+        )
+    else:
+        optimization_model_builder = OptimizationModelBuilder(
+            constraints=constraints,
+            telemetry=telemetry
+        )
+    problem_decomposer = (
+        ProblemDecomposer(sector_size=params.DECOMPOSITION_SECTOR_SIZE)
+        if params.DECOMPOSITION_SECTOR_SIZE is not None
+        else None
+    )
+
+    return Router(
+        problem_builder=problem_builder,
+        optimization_model_builder=optimization_model_builder,
+        problem_decomposer=problem_decomposer
+    )
+
+
+def build_routes_writer(output_format: str) -> RoutesWriter:
+    """Method to build the writer of the Routes for an output format"""
+
+    if output_format == 'json':
+        return JsonRoutesWriter()
+
+    if output_format in ('ndjson', 'ndjson.gz'):
+        return NdjsonRoutesWriter(compress=output_format.endswith('.gz'))
+
+    if output_format == 'npz':
+        return NpzRoutesWriter()
+
+    raise ValueError(
+        f'The output format {output_format} is not one of {OUTPUT_FORMATS}.'
+    )
+
+
+def run(
+        input_dir: str,
+        output_dir: str,
+        cache_file: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        output_format: str = 'json',
+        profiler: Optional[Profiler] = None,
+        telemetry: bool = False,
+        table_url: Optional[str] = None
+) -> int:
+    """
+    Method to execute the Router from an input dir to an output dir, in an
+    output format, returning the number of Routes. The optional time limit
+    caps the search time limit of the Params. With a Profiler, the stages
+    are profiled and the profile is written next to the Routes, and so is
+    the telemetry of the searches, if recorded. Without precomputed
+    estimations, the times are requested from the table service at the
+    table URL, if any, or else estimated along the road graph of the input
+    dir, if any.
+    """
+
+    routes_writer = build_routes_writer(output_format)
+    with profiler or nullcontext():
+        with profile_stage('read_entities'):
+            riders, vehicles, depots, params = read_entities(input_dir)
+            estimations = read_estimations(input_dir)
+            hierarchy = (
+                read_road_network(input_dir)
+                if estimations is None and table_url is None
+                else None
+            )
+
+        if time_limit is not None:
+            params = replace(
+                params,
+                SEARCH_TIME_LIMIT=min(params.SEARCH_TIME_LIMIT, time_limit)
+            )
+
+        if estimations is not None:
+            estimator = PrecomputedEstimator(*estimations)
+        else:
+            if table_url is not None:
+                estimator = TableServiceEstimator(table_url)
+            elif hierarchy is not None:
+                estimator = RoadNetworkEstimator(hierarchy)
+            else:
+                estimator = LinearEstimator()
+
+            if cache_file is not None:
+                estimator = CachedEstimator(
+                    estimator=estimator,
+                    cache_file=cache_file
+                )
+        router = build_router(params, estimator, telemetry=telemetry)
+        with profile_stage('route'):
+            problem, solution = router.solve(riders, vehicles, depots)
+
+        with profile_stage('write_routes'):
+            num_routes = routes_writer.write(output_dir, problem, solution)
+
+    if profiler is not None:
+        profiler.write(output_dir)
+
+    if telemetry:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(TELEMETRY_FILE.format(output_dir=output_dir), 'w') as f:
+            json.dump(
+                {
+                    'searches': [
+                        search.to_dict() for search in router.telemetry
+                    ]
+                },
+                f,
+                indent=4
+            )
+
+    return num_routes
+
+
+if __name__ == '__main__':
+    """Main method to execute the Router"""
+
+    # CLI parsing
+    parser = argparse.ArgumentParser(description='Route some school buses.')
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        help='Directory for reading the Input. Default is ./input',
+        default='./input'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        help='Directory for reading the Output. Default is ./output',
+        default='./output',
+    )
+    parser.add_argument(
+        '--cache-file',
+        type=str,
+        help='SQLite file to cache estimations between runs. Default is None',
+        default=None
+    )
+    parser.add_argument(
+        '--output-format',
+        type=str,
+        choices=OUTPUT_FORMATS,
+        help='Format of the Routes file. Default is json',
+        default='json'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Write the wall time, CPU time and peak memory of every stage '
+             'to profile.json in the output dir'
+    )
+    parser.add_argument(
+        '--profile-stats',
+        action='store_true',
+        help='Profile as --profile does, which it implies, and also write '
+             'the cProfile stats (profile.prof) and the collapsed stacks for '
+             'flamegraphs (profile.collapsed)'
+    )
+    parser.add_argument(
+        '--telemetry',
+        action='store_true',
+        help='Write the objective over time of the search and the calls '
+             'and time of its Python callbacks to telemetry.json in the '
+             'output dir. Portfolio searches record no telemetry'
+    )
+    parser.add_argument(
+        '--table-url',
+        type=str,
+        help='URL of an OSRM-style table service to request the times '
+             'between stops from, e.g. http://127.0.0.1:5000. Default is '
+             'None',
+        default=None
+    )
+    args = parser.parse_args()
+
+    # Method execution
+    configure_logs()
+    run(
+        args.input_dir,
+        args.output_dir,
+        cache_file=args.cache_file,
+        output_format=args.output_format,
+        profiler=Profiler(
+            cprofile=args.profile_stats,
+            sample_interval=(
+                DEFAULT_SAMPLE_INTERVAL if args.profile_stats else None
+            )
+        ) if args.profile or args.profile_stats else None,
+        telemetry=args.telemetry,
+        table_url=args.table_url
+    )
@@ -0,0 +1,469 @@
+import heapq
+import logging
+from math import inf
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+# Nodes settled by a witness search before it gives up and adds a shortcut
+WITNESS_SETTLED_LIMIT = 100
+
+# Arrays persisted in the file of a ContractionHierarchy
+HIERARCHY_ARRAYS = [
+    'lats',
+    'lngs',
+    'ranks',
+    'forward_indptr',
+    'forward_indices',
+    'forward_weights',
+    'backward_indptr',
+    'backward_indices',
+    'backward_weights'
+]
+
+
+class ContractionHierarchy:
+    """
+    Class that holds a road graph preprocessed into a contraction
+    hierarchy: its nodes are contracted one at a time, in rank order, and
+    shortcuts are added between the neighbours of a node whenever the
+    node is on their only shortest path. Every shortest path then goes up
+    the ranks and down again, so a query only searches the upward edges:
+    the forward edges from a node to higher ranks, and the backward edges
+    into a node from higher ranks, in compressed sparse rows.
+    """
+
+    def __init__(
+            self,
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            ranks: np.ndarray,
+            forward: Tuple[np.ndarray, np.ndarray, np.ndarray],
+            backward: Tuple[np.ndarray, np.ndarray, np.ndarray],
+            checksum: str = ''
+    ):
+        self.lats = lats
+        self.lngs = lngs
+        self.ranks = ranks
+        self.forward = forward
+        self.backward = backward
+        self.checksum = checksum
+
+        # The searches run in Python, where lists index faster than arrays
+        self._forward_lists = [array.tolist() for array in forward]
+        self._backward_lists = [array.tolist() for array in backward]
+
+    @classmethod
+    def build(
+            cls,
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            sources: np.ndarray,
+            targets: np.ndarray,
+            weights: np.ndarray,
+            checksum: str = ''
+    ):
+        """
+        Method to contract a directed road graph, whose nodes are located
+        at some coordinates and whose edges go from the sources to the
+        targets in some weights (seconds). Parallel edges keep the lightest
+        weight and loops are dropped.
+        """
+
+        num_nodes = len(lats)
+        out_edges = [{} for _ in range(num_nodes)]
+        in_edges = [{} for _ in range(num_nodes)]
+        for source, target, weight in zip(
+                sources.tolist(),
+                targets.tolist(),
+                weights.tolist()
+        ):
+            if source != target and (
+                    weight < out_edges[source].get(target, inf)
+            ):
+                out_edges[source][target] = weight
+                in_edges[target][source] = weight
+
+        ranks, forward_edges, backward_edges = _contract(out_edges, in_edges)
+        hierarchy = cls(
+            lats=lats,
+            lngs=lngs,
+            ranks=ranks,
+            forward=_to_csr(forward_edges),
+            backward=_to_csr(backward_edges),
+            checksum=checksum
+        )
+        logging.info(
+            f'Contracted {num_nodes} nodes and {len(weights)} edges into '
+            f'{hierarchy.num_edges} upward edges.'
+        )
+
+        return hierarchy
+
+    @classmethod
+    def load(cls, hierarchy_file: str):
+        """Method to read a ContractionHierarchy saved to a file"""
+
+        with np.load(hierarchy_file, allow_pickle=False) as arrays:
+            return cls(
+                lats=arrays['lats'],
+                lngs=arrays['lngs'],
+                ranks=arrays['ranks'],
+                forward=(
+                    arrays['forward_indptr'],
+                    arrays['forward_indices'],
+                    arrays['forward_weights']
+                ),
+                backward=(
+                    arrays['backward_indptr'],
+                    arrays['backward_indices'],
+                    arrays['backward_weights']
+                ),
+                checksum=str(arrays['checksum'])
+            )
+
+    def save(self, hierarchy_file: str):
+        """Method to write the ContractionHierarchy to a file"""
+
+        arrays = dict(zip(
+            HIERARCHY_ARRAYS,
+            (self.lats, self.lngs, self.ranks) + self.forward + self.backward
+        ))
+        with open(hierarchy_file, 'wb') as f:
+            np.savez(f, checksum=np.array(self.checksum), **arrays)
+
+    @property
+    def num_nodes(self) -> int:
+        """Method that returns the number of nodes of the road graph"""
+
+        return len(self.ranks)
+
+    @property
+    def num_edges(self) -> int:
+        """Method that returns the number of upward edges, with shortcuts"""
+
+        return len(self.forward[1]) + len(self.backward[1])
+
+    def many_to_many(
+            self,
+            sources: np.ndarray,
+            targets: np.ndarray
+    ) -> np.ndarray:
+        """
+        Method to obtain the shortest times from some source nodes to some
+        target nodes, with the bucket algorithm: the backward searches of
+        all the targets are stored in buckets by the nodes they settle, and
+        the forward search of every source is joined with the buckets of
+        its nodes in a single vectorized pass. Unreachable targets are
+        infinite.
+        """
+
+        buckets = self._build_buckets(targets)
+
+        return np.array(
+            [
+                self._search_row(source, buckets, len(targets))
+                for source in sources.tolist()
+            ],
+            dtype=np.float64
+        ).reshape(len(sources), len(targets))
+
+    def paths(
+            self,
+            origins: np.ndarray,
+            destinations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Method to obtain the shortest times of some (origin, destination)
+        node paths. The buckets of the distinct destinations are built once
+        and every distinct origin is searched once, so the memory is that of
+        a single row.
+        """
+
+        targets, target_positions = np.unique(
+            destinations,
+            return_inverse=True
+        )
+        buckets = self._build_buckets(targets)
+        order = np.argsort(origins, kind='stable')
+        sources, starts = np.unique(origins[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        times = np.empty(len(origins), dtype=np.float64)
+        for source, start, end in zip(
+                sources.tolist(),
+                starts.tolist(),
+                ends.tolist()
+        ):
+            paths = order[start:end]
+            times[paths] = self._search_row(source, buckets, len(targets))[
+                target_positions[paths]
+            ]
+
+        return times
+
+    def _build_buckets(
+            self,
+            targets: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Method to search backwards from every target, storing the settled
+        nodes in buckets: the targets and times of every node, in compressed
+        sparse rows
+        """
+
+        bucket_nodes, bucket_targets, bucket_times = [], [], []
+        for target_ix, target in enumerate(targets.tolist()):
+            nodes, times = _upward_search(
+                self._backward_lists,
+                self._forward_lists,
+                target
+            )
+            bucket_nodes.append(nodes)
+            bucket_targets.append(np.full(len(nodes), target_ix))
+            bucket_times.append(times)
+
+        bucket_nodes = np.concatenate(bucket_nodes or [np.zeros(0, int)])
+        order = np.argsort(bucket_nodes, kind='stable')
+
+        return (
+            np.searchsorted(
+                bucket_nodes[order],
+                np.arange(self.num_nodes + 1)
+            ),
+            np.concatenate(bucket_targets or [np.zeros(0, int)])[order],
+            np.concatenate(bucket_times or [np.zeros(0)])[order]
+        )
+
+    def _search_row(
+            self,
+            source: int,
+            buckets: Tuple[np.ndarray, np.ndarray, np.ndarray],
+            num_targets: int
+    ) -> np.ndarray:
+        """
+        Method to search forwards from a source and join its settled nodes
+        with their buckets, obtaining the times to every target
+        """
+
+        bucket_indptr, bucket_targets, bucket_times = buckets
+        nodes, times = _upward_search(
+            self._forward_lists,
+            self._backward_lists,
+            source
+        )
+        counts = bucket_indptr[nodes + 1] - bucket_indptr[nodes]
+        entries = np.arange(counts.sum()) + np.repeat(
+            bucket_indptr[nodes] - np.cumsum(counts) + counts,
+            counts
+        )
+        row = np.full(num_targets, np.inf)
+        np.minimum.at(
+            row,
+            bucket_targets[entries],
+            np.repeat(times, counts) + bucket_times[entries]
+        )
+
+        return row
+
+
+def _contract(
+        out_edges: List[Dict[int, float]],
+        in_edges: List[Dict[int, float]]
+) -> Tuple[np.ndarray, List[Dict[int, float]], List[Dict[int, float]]]:
+    """
+    Method to contract the nodes of a graph in order of their priority: the
+    shortcuts they need minus the edges they remove, plus their contracted
+    neighbours, which spreads the contraction evenly. Priorities are
+    updated lazily: a popped node whose priority grew past the next one is
+    pushed back instead of contracted. It returns the rank of every node
+    and its upward forward and backward edges.
+    """
+
+    num_nodes = len(out_edges)
+    contracted_neighbours = [0] * num_nodes
+
+    def _shortcuts(node: int) -> List[Tuple[int, int, float]]:
+        """Method to find the shortcuts needed to contract a node"""
+
+        shortcuts = []
+        for source, in_weight in in_edges[node].items():
+            via_times = {
+                target: in_weight + out_weight
+                for target, out_weight in out_edges[node].items()
+                if target != source
+            }
+            if not via_times:
+                continue
+
+            witness_times = _witness_search(
+                out_edges,
+                source,
+                node,
+                via_times
+            )
+            shortcuts.extend(
+                (source, target, via_time)
+                for target, via_time in via_times.items()
+                if witness_times.get(target, inf) > via_time
+            )
+
+        return shortcuts
+
+    def _priority(node: int, shortcuts: List) -> int:
+        """Method to obtain the priority of contracting a node"""
+
+        return (
+            len(shortcuts) -
+            len(in_edges[node]) -
+            len(out_edges[node]) +
+            contracted_neighbours[node]
+        )
+
+    queue = [
+        (_priority(node, _shortcuts(node)), node)
+        for node in range(num_nodes)
+    ]
+    heapq.heapify(queue)
+    ranks = np.full(num_nodes, -1, dtype=np.int64)
+    forward_edges, backward_edges = [{}] * num_nodes, [{}] * num_nodes
+    rank = 0
+    while queue:
+        _, node = heapq.heappop(queue)
+        shortcuts = _shortcuts(node)
+        priority = _priority(node, shortcuts)
+        if queue and priority > queue[0][0]:
+            heapq.heappush(queue, (priority, node))
+            continue
+
+        forward_edges[node] = out_edges[node]
+        backward_edges[node] = in_edges[node]
+        for target in out_edges[node]:
+            del in_edges[target][node]
+        for source in in_edges[node]:
+            del out_edges[source][node]
+        for source, target, weight in shortcuts:
+            if weight < out_edges[source].get(target, inf):
+                out_edges[source][target] = weight
+                in_edges[target][source] = weight
+
+        out_edges[node], in_edges[node] = {}, {}
+        ranks[node] = rank
+        rank += 1
+        for neighbour in set(forward_edges[node]) | set(backward_edges[node]):
+            contracted_neighbours[neighbour] += 1
+
+    return ranks, forward_edges, backward_edges
+
+
+def _witness_search(
+        out_edges: List[Dict[int, float]],
+        source: int,
+        node: int,
+        via_times: Dict[int, float]
+) -> Dict[int, float]:
+    """
+    Method to search the shortest times from a source to the targets of a
+    node without going through it, up to the longest time via the node or
+    the settled limit. Targets that are not reached need a shortcut.
+    """
+
+    max_time = max(via_times.values())
+    times = {source: 0}
+    queue = [(0, source)]
+    settled = 0
+    remaining = len(via_times)
+    while queue and settled < WITNESS_SETTLED_LIMIT and remaining:
+        time, current = heapq.heappop(queue)
+        if time > times[current]:
+            continue
+
+        if time > max_time:
+            break
+
+        settled += 1
+        if current in via_times:
+            remaining -= 1
+
+        for neighbour, weight in out_edges[current].items():
+            neighbour_time = time + weight
+            if neighbour_time < times.get(neighbour, inf) and (
+                    neighbour != node
+            ):
+                times[neighbour] = neighbour_time
+                heapq.heappush(queue, (neighbour_time, neighbour))
+
+    return times
+
+
+def _upward_search(
+        edges: List[List],
+        stall_edges: List[List],
+        start: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Method to search the shortest times from a node to every node above it
+    in the hierarchy, along the upward edges. A node reached sooner from
+    above, along the opposite upward edges, is not on a shortest path, so
+    it is stalled: it is neither relaxed nor returned. It returns the
+    settled nodes and their times.
+    """
+
+    indptr, indices, weights = edges
+    stall_indptr, stall_indices, stall_weights = stall_edges
+    times = {start: 0.}
+    queue = [(0., start)]
+    settled_nodes, settled_times = [], []
+    while queue:
+        time, current = heapq.heappop(queue)
+        if time > times[current]:
+            continue
+
+        if any(
+                times.get(stall_indices[position], inf) +
+                stall_weights[position] < time
+                for position in range(
+                    stall_indptr[current],
+                    stall_indptr[current + 1]
+                )
+        ):
+            continue
+
+        settled_nodes.append(current)
+        settled_times.append(time)
+        for position in range(indptr[current], indptr[current + 1]):
+            neighbour = indices[position]
+            neighbour_time = time + weights[position]
+            if neighbour_time < times.get(neighbour, inf):
+                times[neighbour] = neighbour_time
+                heapq.heappush(queue, (neighbour_time, neighbour))
+
+    return (
+        np.array(settled_nodes, dtype=np.int64),
+        np.array(settled_times, dtype=np.float64)
+    )
+
+
+def _to_csr(
+        edges: List[Dict[int, float]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Method to store the edges of every node in compressed sparse rows"""
+
+    counts = np.fromiter(
+        (len(node_edges) for node_edges in edges),
+        dtype=np.int64,
+        count=len(edges)
+    )
+
+    return (
+        np.concatenate(([0], np.cumsum(counts))),
+        np.fromiter(
+            (target for node_edges in edges for target in node_edges),
+            dtype=np.int64,
+            count=counts.sum()
+        ),
+        np.fromiter(
+            (weight for node_edges in edges for weight in node_edges.values()),
+            dtype=np.float64,
+            count=counts.sum()
+        )
+    )
@@ -0,0 +1,192 @@
+from typing import Tuple, Iterator, Union
+
+import numpy as np
+
+
+class EstimationMatrix:
+    """
+    Class that holds the estimated time between Stops in a contiguous array.
+    The array is either a dense (num_stops, num_stops) matrix or, for
+    symmetric estimations, the condensed upper triangle (diagonal included)
+    in row-major order.
+    """
+
+    def __init__(self, data: np.ndarray):
+        if data.ndim == 2:
+            num_stops = data.shape[0]
+            if data.shape != (num_stops, num_stops):
+                raise ValueError(
+                    f'A dense EstimationMatrix must be square, '
+                    f'got shape {data.shape}.'
+                )
+        else:
+            num_stops = int((np.sqrt(8 * data.size + 1) - 1) / 2)
+            if num_stops * (num_stops + 1) // 2 != data.size:
+                raise ValueError(
+                    f'A condensed EstimationMatrix must have n(n+1)/2 '
+                    f'values, got {data.size}.'
+                )
+
+        self._data = data
+        self._num_stops = num_stops
+
+    @classmethod
+    def from_dense(
+            cls,
+            matrix: np.ndarray,
+            dtype: np.dtype = np.float64,
+            condensed: bool = False
+    ):
+        """Method to instantiate an EstimationMatrix from a dense matrix"""
+
+        if not condensed:
+            return cls(data=cast_estimations(matrix, dtype))
+
+        num_stops = matrix.shape[0]
+        data = np.empty(num_stops * (num_stops + 1) // 2, dtype=dtype)
+        for stop_ix in range(num_stops):
+            start = condensed_index(stop_ix, stop_ix, num_stops)
+            data[start:start + num_stops - stop_ix] = cast_estimations(
+                matrix[stop_ix, stop_ix:], dtype
+            )
+
+        return cls(data=data)
+
+    @property
+    def condensed(self) -> bool:
+        """Method that returns if the upper triangle storage is used"""
+
+        return self._data.ndim == 1
+
+    @property
+    def data(self) -> np.ndarray:
+        """Method that returns the underlying array"""
+
+        return self._data
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Method that returns the storage type of the estimations"""
+
+        return self._data.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """Method that returns the memory used by the estimations"""
+
+        return self._data.nbytes
+
+    @property
+    def num_stops(self) -> int:
+        """Method that returns the number of Stops in the matrix"""
+
+        return self._num_stops
+
+    def __len__(self) -> int:
+        """Method that returns the number of estimated paths"""
+
+        return self._num_stops ** 2
+
+    def __getitem__(self, path: Tuple[int, int]) -> Union[float, int]:
+        """Method to obtain the estimation of an (origin, destination) path"""
+
+        origin, destination = path
+        if self.condensed:
+            if origin > destination:
+                origin, destination = destination, origin
+
+            return self._data[
+                condensed_index(origin, destination, self._num_stops)
+            ].item()
+
+        return self._data[origin, destination].item()
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Union[float, int]]]:
+        """Method to iterate over the ((origin, destination), time) pairs"""
+
+        for origin in range(self._num_stops):
+            row = self.row(origin).tolist()
+            for destination in range(self._num_stops):
+                yield (origin, destination), row[destination]
+
+    def row(self, origin: int) -> np.ndarray:
+        """Method to obtain the estimations from an origin to every Stop"""
+
+        if not self.condensed:
+            return self._data[origin]
+
+        return self._data[self._symmetric_indices(origin)]
+
+    def column(self, destination: int) -> np.ndarray:
+        """Method to obtain the estimations from every Stop to a destination"""
+
+        if not self.condensed:
+            return self._data[:, destination]
+
+        return self.row(destination)
+
+    def take(self, indices: np.ndarray) -> 'EstimationMatrix':
+        """Method to obtain the dense estimations between some Stops"""
+
+        if not self.condensed:
+            return EstimationMatrix(data=self._data[np.ix_(indices, indices)])
+
+        origins, destinations = np.meshgrid(indices, indices, indexing='ij')
+
+        return EstimationMatrix(
+            data=self._data[condensed_index(
+                np.minimum(origins, destinations),
+                np.maximum(origins, destinations),
+                self._num_stops
+            )]
+        )
+
+    def to_dense(self) -> np.ndarray:
+        """Method to obtain the estimations as a dense matrix"""
+
+        if not self.condensed:
+            return self._data
+
+        matrix = np.empty((self._num_stops, self._num_stops), self.dtype)
+        for stop_ix in range(self._num_stops):
+            start = condensed_index(stop_ix, stop_ix, self._num_stops)
+            upper = self._data[start:start + self._num_stops - stop_ix]
+            matrix[stop_ix, stop_ix:] = upper
+            matrix[stop_ix:, stop_ix] = upper
+
+        return matrix
+
+    def _symmetric_indices(self, stop_ix: int) -> np.ndarray:
+        """Method to obtain the condensed indices of a Stop's row"""
+
+        lower = np.arange(stop_ix)
+        start = condensed_index(stop_ix, stop_ix, self._num_stops)
+
+        return np.concatenate((
+            condensed_index(lower, stop_ix, self._num_stops),
+            np.arange(start, start + self._num_stops - stop_ix)
+        ))
+
+
+def condensed_index(
+        origin: Union[int, np.ndarray],
+        destination: Union[int, np.ndarray],
+        num_stops: int
+) -> Union[int, np.ndarray]:
+    """Method to obtain the position of (origin <= destination) in storage"""
+
+    return (
+        origin * num_stops -
+        origin * (origin - 1) // 2 +
+        destination -
+        origin
+    )
+
+
+def cast_estimations(values: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Method to cast estimations, rounding them for integer storage"""
+
+    if np.issubdtype(np.dtype(dtype), np.integer):
+        values = np.rint(values)
+
+    return values.astype(dtype, copy=False)
@@ -1,16 +1,24 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Tuple
 
 from geohash import encode
 
 
-@dataclass
+@dataclass(init=False)
 class Location:
-    """Class that defines a physical Location"""
+    """
+    Class that defines a physical Location. Its geohash is encoded the first
+    time it is read; batches of Locations are encoded with the geohash utils.
+    """
 
     lat: float
     lng: float
-    geohash: str = ''
+    _geohash: str = field(default='', repr=False, compare=False)
+
+    def __init__(self, lat: float, lng: float, geohash: str = ''):
+        self.lat = lat
+        self.lng = lng
+        self._geohash = geohash
 
     @property
     def coordinates(self) -> Tuple[float, float]:
@@ -18,11 +26,14 @@ class Location:
 
         return self.lat, self.lng
 
-    def __post_init__(self):
-        """Method to process initialized information for the class"""
+    @property
+    def geohash(self) -> str:
+        """Method that returns the geohash, encoding it on first access"""
+
+        if not bool(self._geohash):
+            self._geohash = encode(self.lat, self.lng)
 
-        if not bool(self.geohash):
-            self.geohash = encode(self.lat, self.lng)
+        return self._geohash
 
     def extract_geohash(self, precision: int = 12) -> str:
         """Method to extract the geohash to a desired precision"""
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 @dataclass
@@ -11,6 +11,18 @@ class Params:
     SEARCH_METAHEURISTIC: str = 'AUTOMATIC'
     SEARCH_TIME_LIMIT: float = 3
     SEARCH_SOLUTIONS_LIMIT: int = 1000
+    OBJECTIVE_FUNCTION: str = 'CALLBACK'
+    COST_RESOLUTION: float = 1
+    MAX_RIDE_DURATION: Optional[float] = None
+    MAX_STOPS_PER_ROUTE: Optional[int] = None
+    PORTFOLIO_SIZE: int = 1
+    DECOMPOSITION_SECTOR_SIZE: Optional[int] = None
+    EARLY_STOP_WINDOW: Optional[float] = None
+    EARLY_STOP_THRESHOLD: float = 0.001
+    EARLY_STOP_MIN_TIME: float = 0
+    SPARSE_NEIGHBOURS: Optional[int] = None
+    STOP_GROUPING: str = 'GEOHASH'
+    MAX_WALKING_DISTANCE: float = 0.3
 
     @classmethod
     def from_dict(cls, params_dict: Dict[str, Any]):
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Any
+
+import numpy as np
+
+from models.location import Location
+from models.rider import Rider
+
+
+@dataclass
+class RiderColumns:
+    """Class that holds the Riders of the input as columns"""
+
+    rider_ids: np.ndarray
+    lats: np.ndarray
+    lngs: np.ndarray
+
+    def __len__(self) -> int:
+        """Method that returns the number of Riders"""
+
+        return len(self.rider_ids)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]):
+        """
+        Method to instantiate the columns from Rider Dicts (JSON). The ids
+        are strings, as when the Riders are streamed from a file.
+        """
+
+        rider_ids, lats, lngs = [], [], []
+        for record in records:
+            rider_ids.append(str(record['rider_id']))
+            lats.append(float(record['lat']))
+            lngs.append(float(record['lng']))
+
+        return cls(
+            rider_ids=np.array(rider_ids, dtype=object),
+            lats=np.array(lats, dtype=np.float64),
+            lngs=np.array(lngs, dtype=np.float64)
+        )
+
+    def to_riders(self) -> Dict[str, Rider]:
+        """Method to build the Riders, without reflecting over their fields"""
+
+        return {
+            rider_id: Rider(
+                location=Location(lat=lat, lng=lng),
+                rider_id=rider_id
+            )
+            for rider_id, lat, lng in zip(
+                self.rider_ids.tolist(),
+                self.lats.tolist(),
+                self.lngs.tolist()
+            )
+        }
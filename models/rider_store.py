@@ -0,0 +1,288 @@
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from geohash import encode
+
+from models.rider_columns import RiderColumns
+
+
+class RiderStore(Mapping):
+    """
+    Class that stores the Riders as arrays: the ids, interned into integer
+    indices, and the coordinates. It is read as a Dict of Riders, whose
+    values are lightweight views built on access. The Stops of a grouping
+    are index ranges into an order of the Riders, so they do not duplicate
+    the Riders either. The ids of the Riders must be unique.
+    """
+
+    def __init__(
+            self,
+            rider_ids: np.ndarray,
+            lats: np.ndarray,
+            lngs: np.ndarray
+    ):
+        ids = rider_ids.tolist()
+        if len(set(ids)) < len(ids):
+            repeated = [
+                rider_id
+                for rider_id, count in Counter(ids).items()
+                if count > 1
+            ]
+            raise ValueError(f'The riders {repeated} are repeated.')
+
+        self._rider_ids = rider_ids
+        self._lats = lats
+        self._lngs = lngs
+        self._indices = None
+
+    @classmethod
+    def from_columns(cls, columns: RiderColumns):
+        """Method to instantiate a RiderStore from the Rider columns"""
+
+        return cls(
+            rider_ids=columns.rider_ids,
+            lats=columns.lats,
+            lngs=columns.lngs
+        )
+
+    @property
+    def lats(self) -> np.ndarray:
+        """Method that returns the latitudes of the Riders"""
+
+        return self._lats
+
+    @property
+    def lngs(self) -> np.ndarray:
+        """Method that returns the longitudes of the Riders"""
+
+        return self._lngs
+
+    @property
+    def nbytes(self) -> int:
+        """Method that returns the memory used by the arrays of the store"""
+
+        return self._rider_ids.nbytes + self._lats.nbytes + self._lngs.nbytes
+
+    def __getitem__(self, rider_id: str) -> 'RiderView':
+        """Method to obtain the view of a Rider by its id"""
+
+        return RiderView(self, self.index(rider_id))
+
+    def __iter__(self) -> Iterator[str]:
+        """Method to iterate over the ids of the Riders"""
+
+        return iter(self._rider_ids.tolist())
+
+    def __len__(self) -> int:
+        """Method that returns the number of Riders"""
+
+        return len(self._rider_ids)
+
+    def __contains__(self, rider_id) -> bool:
+        """Method that returns if a Rider is in the store"""
+
+        return rider_id in self._build_indices()
+
+    def items(self) -> Iterator[Tuple[str, 'RiderView']]:
+        """Method to iterate over the (id, view) pairs of the Riders"""
+
+        for rider_ix, rider_id in enumerate(self._rider_ids.tolist()):
+            yield rider_id, RiderView(self, rider_ix)
+
+    def values(self) -> Iterator['RiderView']:
+        """Method to iterate over the views of the Riders"""
+
+        for rider_ix in range(len(self._rider_ids)):
+            yield RiderView(self, rider_ix)
+
+    def index(self, rider_id: str) -> int:
+        """Method to obtain the integer index of a Rider id"""
+
+        return self._build_indices()[rider_id]
+
+    def rider_id(self, rider_ix: int) -> str:
+        """Method to obtain the id of a Rider by its index"""
+
+        return self._rider_ids[rider_ix]
+
+    def lat(self, rider_ix: int) -> float:
+        """Method to obtain the latitude of a Rider by its index"""
+
+        return self._lats[rider_ix].item()
+
+    def lng(self, rider_ix: int) -> float:
+        """Method to obtain the longitude of a Rider by its index"""
+
+        return self._lngs[rider_ix].item()
+
+    def slices(
+            self,
+            labels: np.ndarray,
+            num_groups: int
+    ) -> List['RiderSlice']:
+        """
+        Method to obtain a slice of Riders per group, from the group label
+        of every Rider
+        """
+
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels, minlength=num_groups)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        return [
+            RiderSlice(self, order, start, end)
+            for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+        ]
+
+    def _build_indices(self) -> Dict[str, int]:
+        """Method to index the Rider ids, the first time they are looked up"""
+
+        if self._indices is None:
+            self._indices = {
+                rider_id: rider_ix
+                for rider_ix, rider_id in enumerate(self._rider_ids.tolist())
+            }
+
+        return self._indices
+
+
+class RiderSlice(Mapping):
+    """
+    Class that reads a range of an order of the Riders of a store as a Dict
+    of Riders, holding the Riders of a Stop
+    """
+
+    __slots__ = ('_store', '_order', '_start', '_end')
+
+    def __init__(
+            self,
+            store: RiderStore,
+            order: np.ndarray,
+            start: int,
+            end: int
+    ):
+        self._store = store
+        self._order = order
+        self._start = start
+        self._end = end
+
+    def __getitem__(self, rider_id: str) -> 'RiderView':
+        """Method to obtain the view of a Rider of the slice by its id"""
+
+        rider_ix = self._store.index(rider_id)
+        if rider_ix not in self._order[self._start:self._end]:
+            raise KeyError(rider_id)
+
+        return RiderView(self._store, rider_ix)
+
+    def __iter__(self) -> Iterator[str]:
+        """Method to iterate over the ids of the Riders of the slice"""
+
+        for rider_ix in self._order[self._start:self._end].tolist():
+            yield self._store.rider_id(rider_ix)
+
+    def __len__(self) -> int:
+        """Method that returns the number of Riders of the slice"""
+
+        return self._end - self._start
+
+    def items(self) -> Iterator[Tuple[str, 'RiderView']]:
+        """Method to iterate over the (id, view) pairs of the slice"""
+
+        for rider_ix in self._order[self._start:self._end].tolist():
+            yield self._store.rider_id(rider_ix), RiderView(
+                self._store,
+                rider_ix
+            )
+
+    def values(self) -> Iterator['RiderView']:
+        """Method to iterate over the views of the Riders of the slice"""
+
+        for rider_ix in self._order[self._start:self._end].tolist():
+            yield RiderView(self._store, rider_ix)
+
+
+class RiderView:
+    """Class that reads a Rider of a store as a Rider"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: RiderStore, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def rider_id(self) -> str:
+        """Method that returns the id of the Rider"""
+
+        return self._store.rider_id(self._index)
+
+    @property
+    def location(self) -> 'LocationView':
+        """Method that returns the Location of the Rider"""
+
+        return LocationView(self._store, self._index)
+
+    def __eq__(self, other) -> bool:
+        """Method to compare the Rider to another Rider or view"""
+
+        return (
+            self.rider_id == getattr(other, 'rider_id', None) and
+            self.location == getattr(other, 'location', None)
+        )
+
+    def __repr__(self) -> str:
+        """Method to represent the Rider as its dataclass would"""
+
+        return f'Rider(location={self.location!r}, rider_id={self.rider_id!r})'
+
+
+class LocationView:
+    """Class that reads the Location of a Rider of a store as a Location"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: RiderStore, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def lat(self) -> float:
+        """Method that returns the latitude of the Location"""
+
+        return self._store.lat(self._index)
+
+    @property
+    def lng(self) -> float:
+        """Method that returns the longitude of the Location"""
+
+        return self._store.lng(self._index)
+
+    @property
+    def coordinates(self) -> Tuple[float, float]:
+        """Method that returns the Location's coordinates"""
+
+        return self.lat, self.lng
+
+    @property
+    def geohash(self) -> str:
+        """Method that returns the geohash of the Location"""
+
+        return encode(self.lat, self.lng)
+
+    def extract_geohash(self, precision: int = 12) -> str:
+        """Method to extract the geohash to a desired precision"""
+
+        return self.geohash[0:precision]
+
+    def __eq__(self, other) -> bool:
+        """Method to compare the Location to another Location or view"""
+
+        return self.coordinates == getattr(other, 'coordinates', None)
+
+    def __repr__(self) -> str:
+        """Method to represent the Location as its dataclass would"""
+
+        return f'Location(lat={self.lat!r}, lng={self.lng!r})'
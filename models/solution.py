@@ -0,0 +1,90 @@
+from collections.abc import Sequence
+from typing import List, Iterator
+
+import numpy as np
+
+
+class Solution(Sequence):
+    """
+    Class that holds the routes of a solution as flat index arrays: the
+    Stop indices of every route, one after the other, and the offsets where
+    the route of each Vehicle starts. It is read as a list of routes, which
+    are lists of Stop indices built on access.
+    """
+
+    def __init__(self, offsets: np.ndarray, stops: np.ndarray):
+        if len(offsets) == 0 or offsets[-1] != len(stops):
+            raise ValueError(
+                f'The offsets of a Solution must end at its '
+                f'{len(stops)} stops.'
+            )
+
+        self._offsets = offsets
+        self._stops = stops
+
+    @classmethod
+    def from_routes(cls, routes: List[List[int]]):
+        """Method to instantiate a Solution from lists of Stop indices"""
+
+        lengths = np.fromiter(
+            (len(route) for route in routes),
+            dtype=np.int64,
+            count=len(routes)
+        )
+        offsets = np.zeros(len(routes) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        return cls(
+            offsets=offsets,
+            stops=np.fromiter(
+                (stop_ix for route in routes for stop_ix in route),
+                dtype=np.int64,
+                count=int(offsets[-1])
+            )
+        )
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Method that returns the offsets of the routes"""
+
+        return self._offsets
+
+    @property
+    def stops(self) -> np.ndarray:
+        """Method that returns the Stop indices of every route in a row"""
+
+        return self._stops
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Method that returns the number of Stops of every route"""
+
+        return np.diff(self._offsets)
+
+    def route(self, vehicle_ix: int) -> np.ndarray:
+        """Method to obtain the Stop indices of a route as an array view"""
+
+        return self._stops[
+            self._offsets[vehicle_ix]:self._offsets[vehicle_ix + 1]
+        ]
+
+    def __getitem__(self, vehicle_ix: int) -> List[int]:
+        """Method to obtain the Stop indices of a route"""
+
+        if not -len(self) <= vehicle_ix < len(self):
+            raise IndexError(vehicle_ix)
+
+        return self.route(vehicle_ix % len(self)).tolist()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        """Method to iterate over the routes"""
+
+        offsets = self._offsets.tolist()
+        stops = self._stops.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            yield stops[start:end]
+
+    def __len__(self) -> int:
+        """Method that returns the number of routes (Vehicles)"""
+
+        return len(self._offsets) - 1
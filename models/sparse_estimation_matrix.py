@@ -0,0 +1,180 @@
+from typing import Tuple, Iterator, Union
+
+import numpy as np
+
+
+class SparseEstimationMatrix:
+    """
+    Class that holds the estimated time of some paths between Stops, in
+    compressed sparse rows: the destinations of an origin are sorted in
+    `indices[indptr[origin]:indptr[origin + 1]]` and their times are at the
+    same positions of `data`. The paths that were not estimated are not
+    arcs of the Problem.
+    """
+
+    def __init__(
+            self,
+            indptr: np.ndarray,
+            indices: np.ndarray,
+            data: np.ndarray,
+            num_stops: int
+    ):
+        if indptr.shape != (num_stops + 1,):
+            raise ValueError(
+                f'A SparseEstimationMatrix of {num_stops} stops must have '
+                f'{num_stops + 1} row pointers, got {indptr.shape}.'
+            )
+
+        if not indices.size == data.size == indptr[-1]:
+            raise ValueError(
+                f'A SparseEstimationMatrix must have {indptr[-1]} indices '
+                f'and values, got {indices.size} and {data.size}.'
+            )
+
+        self._indptr = indptr
+        self._indices = indices
+        self._data = data
+        self._num_stops = num_stops
+
+    @classmethod
+    def from_paths(
+            cls,
+            origins: np.ndarray,
+            destinations: np.ndarray,
+            times: np.ndarray,
+            num_stops: int
+    ):
+        """
+        Method to instantiate a SparseEstimationMatrix from the times of
+        (origin, destination) paths. Repeated paths keep their first time.
+        """
+
+        _, first = np.unique(
+            origins.astype(np.int64) * num_stops + destinations,
+            return_index=True
+        )
+        counts = np.bincount(origins[first], minlength=num_stops)
+
+        return cls(
+            indptr=np.concatenate(([0], np.cumsum(counts))),
+            indices=destinations[first].astype(np.int64),
+            data=times[first],
+            num_stops=num_stops
+        )
+
+    @property
+    def condensed(self) -> bool:
+        """Sparse estimations are never stored in the upper triangle"""
+
+        return False
+
+    @property
+    def data(self) -> np.ndarray:
+        """Method that returns the times of the estimated paths"""
+
+        return self._data
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Method that returns the storage type of the estimations"""
+
+        return self._data.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """Method that returns the memory used by the estimations"""
+
+        return self._indptr.nbytes + self._indices.nbytes + self._data.nbytes
+
+    @property
+    def num_stops(self) -> int:
+        """Method that returns the number of Stops in the matrix"""
+
+        return self._num_stops
+
+    def __len__(self) -> int:
+        """Method that returns the number of estimated paths"""
+
+        return self._data.size
+
+    def __getitem__(self, path: Tuple[int, int]) -> Union[float, int]:
+        """Method to obtain the estimation of an (origin, destination) path"""
+
+        origin, destination = path
+        start, end = self._indptr[origin], self._indptr[origin + 1]
+        position = start + np.searchsorted(
+            self._indices[start:end],
+            destination
+        )
+        if position == end or self._indices[position] != destination:
+            raise KeyError(f'The path {path} was not estimated.')
+
+        return self._data[position].item()
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Union[float, int]]]:
+        """Method to iterate over the estimated paths and their times"""
+
+        indptr = self._indptr.tolist()
+        indices = self._indices.tolist()
+        data = self._data.tolist()
+        for origin in range(self._num_stops):
+            for position in range(indptr[origin], indptr[origin + 1]):
+                yield (origin, indices[position]), data[position]
+
+    def neighbours(self, origin: int) -> np.ndarray:
+        """Method to obtain the destinations estimated from an origin"""
+
+        return self._indices[self._indptr[origin]:self._indptr[origin + 1]]
+
+    def row(self, origin: int) -> np.ndarray:
+        """Method to obtain the estimations from an origin to its neighbours"""
+
+        return self._data[self._indptr[origin]:self._indptr[origin + 1]]
+
+    def column(self, destination: int) -> np.ndarray:
+        """Method to obtain the estimations from every origin estimated"""
+
+        return self._data[self._indices == destination]
+
+    def take(self, indices: np.ndarray) -> 'SparseEstimationMatrix':
+        """
+        Method to obtain the sparse estimations between some Stops, which
+        keep the paths between them
+        """
+
+        positions = np.full(self._num_stops, -1, dtype=np.int64)
+        positions[indices] = np.arange(len(indices))
+        counts = np.diff(self._indptr)[indices]
+        arcs = np.arange(counts.sum()) + np.repeat(
+            self._indptr[indices] - np.cumsum(counts) + counts,
+            counts
+        )
+        origins = np.repeat(np.arange(len(indices)), counts)
+        destinations = positions[self._indices[arcs]]
+        kept = destinations >= 0
+
+        return SparseEstimationMatrix.from_paths(
+            origins[kept],
+            destinations[kept],
+            self._data[arcs][kept],
+            len(indices)
+        )
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Method to obtain the estimations as a dense matrix. The paths that
+        were not estimated take the longest estimated time.
+        """
+
+        matrix = np.full(
+            (self._num_stops, self._num_stops),
+            self._data.max() if self._data.size else 0,
+            dtype=self.dtype
+        )
+        origins = np.repeat(
+            np.arange(self._num_stops),
+            np.diff(self._indptr)
+        )
+        matrix[origins, self._indices] = self._data
+
+        return matrix
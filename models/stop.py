@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from statistics import mean
+from math import fsum
 from typing import Dict, Optional, Any
 
 from models.location import Location
@@ -21,9 +21,12 @@ class Stop:
 
         self.demand = len(self.riders) if not self.depot_id else self.demand
         if self.location is None:
-            lat = mean([rider.location.lat for rider in self.riders.values()])
-            lng = mean([rider.location.lng for rider in self.riders.values()])
-            self.location = Location(lat=lat, lng=lng)
+            lat = fsum(rider.location.lat for rider in self.riders.values())
+            lng = fsum(rider.location.lng for rider in self.riders.values())
+            self.location = Location(
+                lat=lat / len(self.riders),
+                lng=lng / len(self.riders)
+            )
 
     def to_dict(self) -> Dict[str, Any]:
         """Method to parse the Stop to a Dict (JSON) for dumping"""
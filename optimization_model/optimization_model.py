@@ -1,12 +1,17 @@
 import logging
 from dataclasses import dataclass
-from typing import List
+from typing import Optional
 
+import numpy as np
 from ortools.constraint_solver.pywrapcp import RoutingIndexManager, \
     RoutingModel
 from ortools.constraint_solver.routing_parameters_pb2 import \
     RoutingSearchParameters
 
+from models.solution import Solution
+from optimization_model.plateau_stop import PlateauStop
+from optimization_model.search_telemetry import SearchTelemetry
+
 SOLVER_STATUS = {
     0: 'ROUTING_NOT_SOLVED',
     1: 'ROUTING_SUCCESS',
@@ -16,6 +21,10 @@ SOLVER_STATUS = {
 }
 
 
+class NoSolutionError(Exception):
+    """Error raised when the search finds no solution to the Problem"""
+
+
 @dataclass
 class OptimizationModel:
     """Class that represents the mathematical Opt. Model to solve the VRP"""
@@ -23,6 +32,9 @@ class OptimizationModel:
     manager: RoutingIndexManager
     solver: RoutingModel
     search_parameters: RoutingSearchParameters
+    objective_value: Optional[int] = None
+    telemetry: Optional[SearchTelemetry] = None
+    plateau_stop: Optional[PlateauStop] = None
 
     def __post_init__(self):
         """Procedures to be completed after the Opt. Model is instantiated"""
@@ -32,41 +44,76 @@ class OptimizationModel:
             'search_parameters.'
         )
 
-    def solve(self) -> List[List[int]]:
-        """Method to solve the Optimization Model using the Parameters"""
+    def solve(self) -> Solution:
+        """
+        Method to solve the Optimization Model using the Parameters, raising
+        a NoSolutionError if the search finds no solution
+        """
 
+        if self.telemetry is not None:
+            self.telemetry.watch(self.solver)
+        if self.plateau_stop is not None:
+            self.plateau_stop.watch(self.solver)
         solution = self.solver.SolveWithParameters(self.search_parameters)
+        status = SOLVER_STATUS[self.solver.status()]
         logging.info(
             f'Solved the OptimizationModel and '
-            f'the solver status is: {SOLVER_STATUS[self.solver.status()]}.'
+            f'the solver status is: {status}.'
         )
+        stop_reason, time_saved = None, None
+        if self.plateau_stop is not None:
+            self.plateau_stop.finish()
+            stop_reason = self.plateau_stop.reason
+            time_saved = self.plateau_stop.time_saved
+            logging.info(
+                f'The search stopped after {self.plateau_stop.seconds:.3f} s '
+                f'by {stop_reason}, saving {time_saved:.3f} s of the time '
+                f'limit.'
+            )
+        if self.telemetry is not None:
+            self.telemetry.finish(status, stop_reason, time_saved)
+            logging.info(
+                f'Recorded the search telemetry: {self.telemetry.summary()}.'
+            )
+        if solution is None:
+            raise NoSolutionError(
+                f'The OptimizationModel has no solution, the solver status '
+                f'is: {status}.'
+            )
+
+        self.objective_value = solution.ObjectiveValue()
         processed_solution = self._process_solution(solution)
 
         return processed_solution
 
-    def _process_solution(self, solution) -> List[List[int]]:
-        """Method to process the solution given by or-tools"""
+    def _process_solution(self, solution) -> Solution:
+        """
+        Method to process the solution given by or-tools into flat arrays,
+        following every route with a single call per visit to the solver
+        """
 
         num_vehicles = self.manager.GetNumberOfVehicles()
-        routes = [[]] * num_vehicles
-
+        next_index = self.solver.Next
+        index_to_node = self.manager.IndexToNode
+        offsets, stops = [0], []
         for vehicle_ix in range(num_vehicles):
-            route = []
             model_index = self.solver.Start(vehicle_ix)
-            stop_index = self.manager.IndexToNode(model_index)
-            route.append(stop_index)
+            end_index = self.solver.End(vehicle_ix)
+            stops.append(index_to_node(model_index))
+            while model_index != end_index:
+                model_index = next_index(solution, model_index)
+                stops.append(index_to_node(model_index))
 
-            while not self.solver.IsEnd(model_index):
-                model_index = solution.Value(self.solver.NextVar(model_index))
-                stop_index = self.manager.IndexToNode(model_index)
-                route.append(stop_index)
-
-            routes[vehicle_ix] = route
+            offsets.append(len(stops))
 
+        processed_solution = Solution(
+            offsets=np.array(offsets, dtype=np.int64),
+            stops=np.array(stops, dtype=np.int64)
+        )
         logging.info(
             f'Processed the OptimizationModel solution and '
-            f'obtained {len(routes)} routes with these '
-            f'number of stops: {[len(route) for route in routes]}.'
+            f'obtained {len(processed_solution)} routes with these '
+            f'number of stops: {processed_solution.lengths.tolist()}.'
         )
 
-        return routes
+        return processed_solution
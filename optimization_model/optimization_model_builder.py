@@ -1,13 +1,18 @@
 import logging
-from typing import List
+from typing import List, Union, Optional, Dict
 
+import numpy as np
 from ortools.constraint_solver.pywrapcp import RoutingIndexManager, \
     RoutingModel, DefaultRoutingSearchParameters
 from ortools.constraint_solver.routing_parameters_pb2 import \
     RoutingSearchParameters
 
 from constraints.constraint import Constraint
+from constraints.dimension_constraint import DimensionConstraint
+from models.sparse_estimation_matrix import SparseEstimationMatrix
 from optimization_model.optimization_model import OptimizationModel
+from optimization_model.plateau_stop import PlateauStop
+from optimization_model.search_telemetry import SearchTelemetry
 from problem.problem import Problem
 
 LOCAL_SEARCH_METAHEURISTIC = {
@@ -36,10 +41,18 @@ FIRST_SOLUTION_STRATEGY = {
 
 
 class OptimizationModelBuilder:
-    """A class to build an Optimization Model"""
+    """
+    A class to build an Optimization Model. With telemetry, the Opt. Model
+    records the solutions of its search and the calls of its callbacks.
+    """
 
-    def __init__(self, constraints: List[Constraint]):
+    def __init__(
+            self,
+            constraints: List[Union[Constraint, DimensionConstraint]],
+            telemetry: bool = False
+    ):
         self._constraints = constraints
+        self._telemetry = telemetry
 
     def build(self, problem: Problem) -> OptimizationModel:
         """Method to build an Opt. Model from the Problem"""
@@ -52,54 +65,329 @@ class OptimizationModelBuilder:
         )
         solver = RoutingModel(manager)
         search_parameters = self._build_search_parameters(problem)
-        self._apply_constraints(problem, manager, solver)
-        self._set_objective_function(problem, manager, solver)
+        telemetry = SearchTelemetry() if self._telemetry else None
+        self._apply_constraints(problem, manager, solver, telemetry)
+        self._set_objective_function(problem, manager, solver, telemetry)
+        if isinstance(problem.estimations, SparseEstimationMatrix):
+            self._remove_sparse_arcs(problem, manager, solver)
 
         return OptimizationModel(
             manager=manager,
             solver=solver,
-            search_parameters=search_parameters
+            search_parameters=search_parameters,
+            telemetry=telemetry,
+            plateau_stop=PlateauStop.from_params(problem.params)
         )
 
     def _apply_constraints(
             self,
             problem: Problem,
             manager: RoutingIndexManager,
-            solver: RoutingModel
+            solver: RoutingModel,
+            telemetry: Optional[SearchTelemetry] = None
     ):
         """Method to apply the Constraints to the Optimization Model"""
 
         for constraint in self._constraints:
-            constraint.problem = problem
-            constraint.manager = manager
-            constraint.apply(solver)
+            if isinstance(constraint, DimensionConstraint):
+                self._apply_dimension_constraint(
+                    constraint, problem, manager, solver, telemetry
+                )
+
+            else:
+                constraint.problem = problem
+                constraint.manager = manager
+                constraint.apply(solver)
 
         logging.info(
             f'Applied {len(self._constraints)} constraints to '
             f'the OptimizationModel.'
         )
 
+    @staticmethod
+    def _apply_dimension_constraint(
+            constraint: DimensionConstraint,
+            problem: Problem,
+            manager: RoutingIndexManager,
+            solver: RoutingModel,
+            telemetry: Optional[SearchTelemetry] = None
+    ):
+        """
+        Method to register the demands or transits declared by the
+        Constraint natively in the solver and add them as a Dimension
+        """
+
+        demands = constraint.demands(problem)
+        if demands is not None:
+            callback_index = (
+                OptimizationModelBuilder._register_unary_transit_vector(
+                    manager, solver, demands, telemetry, constraint.name
+                )
+            )
+
+        elif isinstance(problem.estimations, SparseEstimationMatrix):
+            rows = constraint.sparse_transits(problem)
+            if rows is None:
+                raise ValueError(
+                    f'The {constraint.name} does not support sparse '
+                    f'estimations (SPARSE_NEIGHBOURS).'
+                )
+
+            callback_index = (
+                OptimizationModelBuilder._register_sparse_transits(
+                    manager, solver, rows, telemetry, constraint.name
+                )
+            )
+
+        else:
+            callback_index = OptimizationModelBuilder._register_transit_matrix(
+                manager,
+                solver,
+                constraint.transits(problem),
+                telemetry,
+                constraint.name
+            )
+
+        solver.AddDimensionWithVehicleCapacity(
+            evaluator_index=callback_index,
+            slack_max=constraint.slack_max,
+            vehicle_capacities=constraint.capacities(problem),
+            fix_start_cumul_to_zero=constraint.fix_start_cumul_to_zero,
+            name=constraint.name
+        )
+        constraint.restrict(
+            problem, manager, solver.GetDimensionOrDie(constraint.name)
+        )
+
     @staticmethod
     def _set_objective_function(
             problem: Problem,
             manager: RoutingIndexManager,
-            solver: RoutingModel
+            solver: RoutingModel,
+            telemetry: Optional[SearchTelemetry] = None
     ):
-        """Method to set the objective function of the Optimization Model"""
+        """
+        Method to set the objective function of the Optimization Model. With
+        the MATRIX objective, travelling and service times are folded into
+        an integer cost matrix that the solver evaluates natively, instead
+        of calling back into Python for every arc. Both objectives round the
+        complete times to the nearest integer, as `build_time_matrix` does.
+        """
+
+        if isinstance(problem.estimations, SparseEstimationMatrix):
+            callback_index = OptimizationModelBuilder._register_sparse_costs(
+                problem, manager, solver, telemetry
+            )
 
-        def _time_callback(from_index: int, to_index: int):
-            """Callback to obtain the complete time between Stops"""
+        elif problem.params.OBJECTIVE_FUNCTION == 'MATRIX':
+            cost_matrix = problem.build_time_matrix(
+                resolution=problem.params.COST_RESOLUTION
+            )
+            callback_index = OptimizationModelBuilder._register_transit_matrix(
+                manager, solver, cost_matrix, telemetry, 'objective'
+            )
 
-            origin = manager.IndexToNode(from_index)
-            destination = manager.IndexToNode(to_index)
-            travelling_time = problem.estimations[(origin, destination)]
-            service_time = problem.stops[destination].service_time
+        else:
+            def _time_callback(from_index: int, to_index: int):
+                """Callback to obtain the complete time between Stops"""
 
-            return travelling_time + service_time
+                origin = manager.IndexToNode(from_index)
+                destination = manager.IndexToNode(to_index)
+                travelling_time = problem.estimations[(origin, destination)]
+                service_time = problem.stops[destination].service_time
+
+                return int(round(travelling_time + service_time))
+
+            if telemetry is not None:
+                _time_callback = telemetry.wrap_callback(
+                    'objective',
+                    _time_callback
+                )
+            callback_index = solver.RegisterTransitCallback(_time_callback)
 
-        callback_index = solver.RegisterTransitCallback(_time_callback)
         solver.SetArcCostEvaluatorOfAllVehicles(callback_index)
-        logging.info('Set the objective function to the OptimizationModel.')
+        logging.info(
+            f'Set the {problem.params.OBJECTIVE_FUNCTION} objective function '
+            f'to the OptimizationModel.'
+        )
+
+    @staticmethod
+    def _register_sparse_costs(
+            problem: Problem,
+            manager: RoutingIndexManager,
+            solver: RoutingModel,
+            telemetry: Optional[SearchTelemetry] = None
+    ) -> int:
+        """
+        Method to register the complete times of the sparse arcs as the
+        cost callback, scaled and rounded as the objective function does
+        """
+
+        resolution = (
+            problem.params.COST_RESOLUTION
+            if problem.params.OBJECTIVE_FUNCTION == 'MATRIX'
+            else 1
+        )
+
+        return OptimizationModelBuilder._register_sparse_transits(
+            manager,
+            solver,
+            problem.build_time_rows(resolution=resolution),
+            telemetry,
+            'objective'
+        )
+
+    @staticmethod
+    def _register_sparse_transits(
+            manager: RoutingIndexManager,
+            solver: RoutingModel,
+            rows: List[Dict[int, int]],
+            telemetry: Optional[SearchTelemetry] = None,
+            name: str = 'transit'
+    ) -> int:
+        """
+        Method to register the integer transits of the sparse arcs, given
+        by origin, as a callback. The arcs that were not estimated, which
+        the solver may still evaluate before checking the allowed next
+        values, get a transit no route can afford.
+        """
+
+        missing_transit = int(
+            max((max(row.values()) for row in rows if row), default=0) *
+            len(rows)
+        ) + 1
+        nodes = OptimizationModelBuilder._build_index_nodes(manager)
+
+        def _sparse_callback(from_index: int, to_index: int):
+            """Callback to obtain the transit of a sparse arc"""
+
+            return rows[nodes[from_index]].get(
+                nodes[to_index],
+                missing_transit
+            )
+
+        if telemetry is not None:
+            _sparse_callback = telemetry.wrap_callback(name, _sparse_callback)
+
+        return solver.RegisterTransitCallback(_sparse_callback)
+
+    @staticmethod
+    def _remove_sparse_arcs(
+            problem: Problem,
+            manager: RoutingIndexManager,
+            solver: RoutingModel
+    ):
+        """
+        Method to restrict the next values of every rider Stop to its
+        estimated neighbours and the ends of the Vehicles. Depot Stops keep
+        every next value, since their paths to every Stop are estimated. The
+        values are posted as member constraints, since setting the sparse
+        domains directly is orders of magnitude slower with many Vehicles.
+        """
+
+        ends = [
+            solver.End(vehicle_ix)
+            for vehicle_ix in range(len(problem.vehicles))
+        ]
+        depots = {
+            stop_ix
+            for stop_ix, stop in enumerate(problem.stops)
+            if stop.depot_id
+        }
+        constraint_solver = solver.solver()
+        num_arcs = 0
+        for stop_ix in range(len(problem.stops)):
+            if stop_ix in depots:
+                continue
+
+            allowed = [
+                manager.NodeToIndex(neighbour)
+                for neighbour in problem.estimations.neighbours(
+                    stop_ix
+                ).tolist()
+                if neighbour not in depots
+            ] + ends
+            # A Stop is its own next value only if it is not visited
+            index = manager.NodeToIndex(stop_ix)
+            constraint_solver.Add(constraint_solver.MemberCt(
+                solver.NextVar(index),
+                allowed + [index]
+            ))
+            num_arcs += len(allowed)
+
+        logging.info(
+            f'Restricted the rider stops of the OptimizationModel to '
+            f'{num_arcs} arcs.'
+        )
+
+    @staticmethod
+    def _register_transit_matrix(
+            manager: RoutingIndexManager,
+            solver: RoutingModel,
+            matrix: np.ndarray,
+            telemetry: Optional[SearchTelemetry] = None,
+            name: str = 'transit'
+    ) -> int:
+        """
+        Method to register an integer (node, node) matrix as a transit in
+        the solver. Versions of or-tools without native matrices get a
+        callback over plain lists, with the index to node map precomputed,
+        which the telemetry records by name.
+        """
+
+        if hasattr(solver, 'RegisterTransitMatrix'):
+            return solver.RegisterTransitMatrix(matrix.tolist())
+
+        rows = matrix.tolist()
+        nodes = OptimizationModelBuilder._build_index_nodes(manager)
+
+        def _matrix_callback(from_index: int, to_index: int):
+            """Callback to obtain the transit between Stops from the matrix"""
+
+            return rows[nodes[from_index]][nodes[to_index]]
+
+        if telemetry is not None:
+            _matrix_callback = telemetry.wrap_callback(name, _matrix_callback)
+
+        return solver.RegisterTransitCallback(_matrix_callback)
+
+    @staticmethod
+    def _register_unary_transit_vector(
+            manager: RoutingIndexManager,
+            solver: RoutingModel,
+            vector: np.ndarray,
+            telemetry: Optional[SearchTelemetry] = None,
+            name: str = 'transit'
+    ) -> int:
+        """
+        Method to register an integer per-node vector as a unary transit in
+        the solver, with the same fallback as `_register_transit_matrix`
+        """
+
+        if hasattr(solver, 'RegisterUnaryTransitVector'):
+            return solver.RegisterUnaryTransitVector(vector.tolist())
+
+        values = vector.tolist()
+        nodes = OptimizationModelBuilder._build_index_nodes(manager)
+
+        def _vector_callback(from_index: int):
+            """Callback to obtain the transit at a Stop from the vector"""
+
+            return values[nodes[from_index]]
+
+        if telemetry is not None:
+            _vector_callback = telemetry.wrap_callback(name, _vector_callback)
+
+        return solver.RegisterUnaryTransitCallback(_vector_callback)
+
+    @staticmethod
+    def _build_index_nodes(manager: RoutingIndexManager) -> List[int]:
+        """Method to map every solver index to its node (Stop) once"""
+
+        return [
+            manager.IndexToNode(index)
+            for index in range(manager.GetNumberOfIndices())
+        ]
 
     @staticmethod
     def _build_search_parameters(problem: Problem) -> RoutingSearchParameters:
@@ -112,8 +400,8 @@ class OptimizationModelBuilder:
         search_parameters.local_search_metaheuristic = (
             LOCAL_SEARCH_METAHEURISTIC[problem.params.SEARCH_METAHEURISTIC]
         )
-        search_parameters.time_limit.seconds = (
-            problem.params.SEARCH_TIME_LIMIT
+        search_parameters.time_limit.FromMilliseconds(
+            int(problem.params.SEARCH_TIME_LIMIT * 1000)
         )
         search_parameters.solution_limit = (
             problem.params.SEARCH_SOLUTIONS_LIMIT
@@ -0,0 +1,126 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Deque, Tuple
+
+from ortools.constraint_solver.pywrapcp import RoutingModel
+
+from models.params import Params
+
+# Reasons for which a search stops
+STOP_REASONS = ['PLATEAU', 'TIME_LIMIT', 'SOLUTIONS_LIMIT', 'COMPLETED']
+
+
+@dataclass
+class PlateauStop:
+    """
+    Class that stops a search once it plateaus: when the relative
+    improvement of the best objective over the last window of seconds drops
+    below the threshold. The search never stops before the min time, and
+    the time limit still bounds it. The plateau is checked when a solution
+    is found, so a search that finds no more solutions runs to its limit.
+    """
+
+    window: float
+    threshold: float
+    min_time: float
+    time_limit: float
+    solutions_limit: int
+    reason: Optional[str] = None
+    seconds: Optional[float] = None
+    _improvements: Deque[Tuple[float, int]] = field(
+        default_factory=lambda: deque(),
+        repr=False
+    )
+    _num_solutions: int = field(default=0, repr=False)
+    _start: float = field(default=0., repr=False)
+
+    @classmethod
+    def from_params(cls, params: Params) -> Optional['PlateauStop']:
+        """Method to build the PlateauStop set by the Params, if any"""
+
+        if params.EARLY_STOP_WINDOW is None:
+            return None
+
+        return cls(
+            window=params.EARLY_STOP_WINDOW,
+            threshold=params.EARLY_STOP_THRESHOLD,
+            min_time=params.EARLY_STOP_MIN_TIME,
+            time_limit=params.SEARCH_TIME_LIMIT,
+            solutions_limit=params.SEARCH_SOLUTIONS_LIMIT
+        )
+
+    @property
+    def time_saved(self) -> float:
+        """Method that returns the seconds saved from the time limit"""
+
+        if self.reason != 'PLATEAU':
+            return 0.
+
+        return max(0., self.time_limit - self.seconds)
+
+    def watch(self, solver: RoutingModel):
+        """Method to watch the solutions of a solver and stop its search"""
+
+        def _at_solution():
+            """Callback to stop the search when it plateaus"""
+
+            self._num_solutions += 1
+            if self.reason is not None:
+                return
+
+            seconds = time.perf_counter() - self._start
+            objective_value = solver.CostVar().Value()
+            if (
+                    not self._improvements or
+                    objective_value < self._improvements[-1][1]
+            ):
+                self._improvements.append((seconds, objective_value))
+
+            if self._has_plateaued(seconds):
+                self.reason = 'PLATEAU'
+                solver.solver().FinishCurrentSearch()
+
+        solver.AddAtSolutionCallback(_at_solution)
+        self._start = time.perf_counter()
+
+    def finish(self):
+        """Method to record the end of the search and why it stopped"""
+
+        self.seconds = time.perf_counter() - self._start
+        if self.reason is not None:
+            return
+
+        if self.seconds >= self.time_limit:
+            self.reason = 'TIME_LIMIT'
+        elif self._num_solutions >= self.solutions_limit:
+            self.reason = 'SOLUTIONS_LIMIT'
+        else:
+            self.reason = 'COMPLETED'
+
+    def _has_plateaued(self, seconds: float) -> bool:
+        """
+        Method to compare the best objective to the best one a window ago,
+        which is the last improvement found before the window started. There
+        is no plateau until a solution was found a window ago.
+        """
+
+        if seconds < max(self.min_time, self.window):
+            return False
+
+        window_start = seconds - self.window
+        while (
+                len(self._improvements) > 1 and
+                self._improvements[1][0] <= window_start
+        ):
+            self._improvements.popleft()
+
+        previous_seconds, previous_best = self._improvements[0]
+        if previous_seconds > window_start:
+            return False
+
+        best = self._improvements[-1][1]
+
+        return (previous_best - best) / max(abs(previous_best), 1) < (
+            self.threshold
+        )
@@ -0,0 +1,213 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from constraints.constraint import Constraint
+from constraints.dimension_constraint import DimensionConstraint
+from models.solution import Solution
+from optimization_model.optimization_model import NoSolutionError
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from optimization_model.search_telemetry import SearchTelemetry
+from problem.problem import Problem
+
+# Strategy and metaheuristic pairs tried after the ones in the Params
+PORTFOLIO_STRATEGIES = [
+    ('PATH_CHEAPEST_ARC', 'GUIDED_LOCAL_SEARCH'),
+    ('SAVINGS', 'GUIDED_LOCAL_SEARCH'),
+    ('PARALLEL_CHEAPEST_INSERTION', 'GUIDED_LOCAL_SEARCH'),
+    ('PATH_CHEAPEST_ARC', 'TABU_SEARCH'),
+    ('CHRISTOFIDES', 'GUIDED_LOCAL_SEARCH'),
+    ('LOCAL_CHEAPEST_INSERTION', 'SIMULATED_ANNEALING'),
+    ('GLOBAL_CHEAPEST_ARC', 'GUIDED_LOCAL_SEARCH'),
+    ('SWEEP', 'TABU_SEARCH')
+]
+
+
+@dataclass
+class PortfolioConfiguration:
+    """
+    Class that represents a search configuration of the portfolio. The
+    routing search parameters have no random seed, so a non-zero seed
+    shuffles the order of the Vehicles in the model instead.
+    """
+
+    first_solution_strategy: str
+    search_metaheuristic: str
+    seed: int = 0
+
+
+@dataclass
+class PortfolioOptimizationModel:
+    """
+    Class that solves the same Problem with several search configurations
+    in parallel processes, keeping the best. When there are more
+    configurations than workers, they run in waves, and the search time
+    limit is split between the waves, so the whole portfolio keeps the time
+    limit of the Params. The searches of the workers record no telemetry.
+    """
+
+    problem: Problem
+    constraints: List[Union[Constraint, DimensionConstraint]]
+    configurations: List[PortfolioConfiguration]
+    max_workers: Optional[int] = None
+    objective_value: Optional[int] = None
+    winner: Optional[PortfolioConfiguration] = None
+    results: List[Tuple[PortfolioConfiguration, Optional[int]]] = field(
+        default_factory=lambda: list()
+    )
+    telemetry: Optional[SearchTelemetry] = None
+
+    def solve(self) -> Solution:
+        """
+        Method to solve every configuration and return the best solution,
+        raising a NoSolutionError if no configuration finds one
+        """
+
+        max_workers = self.max_workers or min(
+            len(self.configurations), os.cpu_count() or 1
+        )
+        waves = -(-len(self.configurations) // max_workers)
+        time_limit = self.problem.params.SEARCH_TIME_LIMIT / waves
+        problem = replace(
+            self.problem,
+            params=replace(self.problem.params, SEARCH_TIME_LIMIT=time_limit)
+        )
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            solutions = list(executor.map(
+                _solve_configuration,
+                [problem] * len(self.configurations),
+                [self.constraints] * len(self.configurations),
+                self.configurations
+            ))
+
+        self.results = [
+            (configuration, objective_value)
+            for configuration, (objective_value, _) in zip(
+                self.configurations, solutions
+            )
+        ]
+        best_solution = None
+        for configuration, (objective_value, solution) in zip(
+                self.configurations, solutions
+        ):
+            if objective_value is not None and (
+                    self.objective_value is None or
+                    objective_value < self.objective_value
+            ):
+                self.objective_value = objective_value
+                self.winner = configuration
+                best_solution = solution
+
+        if best_solution is None:
+            raise NoSolutionError(
+                f'None of the {len(self.configurations)} configurations of '
+                f'the PortfolioOptimizationModel has a solution.'
+            )
+
+        logging.info(
+            f'Solved {len(self.configurations)} configurations of the '
+            f'PortfolioOptimizationModel with {max_workers} workers in '
+            f'{waves} waves of {time_limit:.3f} s, the winner is '
+            f'{self.winner} with objective {self.objective_value}.'
+        )
+
+        return best_solution
+
+
+class PortfolioOptimizationModelBuilder(OptimizationModelBuilder):
+    """A class to build a Portfolio of Optimization Models"""
+
+    def __init__(
+            self,
+            constraints: List[Union[Constraint, DimensionConstraint]],
+            portfolio_size: int,
+            max_workers: Optional[int] = None
+    ):
+        super().__init__(constraints=constraints)
+        self._portfolio_size = portfolio_size
+        self._max_workers = max_workers
+
+    def build(self, problem: Problem) -> PortfolioOptimizationModel:
+        """
+        Method to build the Portfolio from the Problem. The Params' own
+        configuration comes first, followed by the portfolio strategies,
+        which are repeated with new seeds if the portfolio is larger.
+        """
+
+        strategies = [(
+            problem.params.FIRST_SOLUTION_STRATEGY,
+            problem.params.SEARCH_METAHEURISTIC
+        )] + [
+            strategy
+            for strategy in PORTFOLIO_STRATEGIES
+            if strategy != (
+                problem.params.FIRST_SOLUTION_STRATEGY,
+                problem.params.SEARCH_METAHEURISTIC
+            )
+        ]
+        configurations = [
+            PortfolioConfiguration(
+                first_solution_strategy=strategies[ix % len(strategies)][0],
+                search_metaheuristic=strategies[ix % len(strategies)][1],
+                seed=ix // len(strategies)
+            )
+            for ix in range(self._portfolio_size)
+        ]
+        logging.info(
+            f'Built a PortfolioOptimizationModel with '
+            f'{len(configurations)} configurations.'
+        )
+
+        return PortfolioOptimizationModel(
+            problem=problem,
+            constraints=self._constraints,
+            configurations=configurations,
+            max_workers=self._max_workers
+        )
+
+
+def _solve_configuration(
+        problem: Problem,
+        constraints: List[Union[Constraint, DimensionConstraint]],
+        configuration: PortfolioConfiguration
+) -> Tuple[Optional[int], Optional[Solution]]:
+    """
+    Method to solve the Problem with a configuration, in a worker, without
+    a solution if the configuration finds none
+    """
+
+    order = np.arange(len(problem.vehicles))
+    if configuration.seed:
+        order = np.random.default_rng(configuration.seed).permutation(order)
+
+    vehicles = list(problem.vehicles.items())
+    configured_problem = replace(
+        problem,
+        params=replace(
+            problem.params,
+            FIRST_SOLUTION_STRATEGY=configuration.first_solution_strategy,
+            SEARCH_METAHEURISTIC=configuration.search_metaheuristic
+        ),
+        vehicles=dict(vehicles[ix] for ix in order),
+        starts=[problem.starts[ix] for ix in order],
+        ends=[problem.ends[ix] for ix in order]
+    )
+    model = OptimizationModelBuilder(
+        constraints=constraints
+    ).build(configured_problem)
+    try:
+        shuffled_solution = model.solve()
+
+    except NoSolutionError:
+        return None, None
+
+    routes = [[] for _ in range(len(problem.vehicles))]
+    for position, vehicle_ix in enumerate(order.tolist()):
+        routes[vehicle_ix] = shuffled_solution[position]
+
+    return model.objective_value, Solution.from_routes(routes)
@@ -0,0 +1,148 @@
+import time
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Optional, Callable, Any
+
+from ortools.constraint_solver.pywrapcp import RoutingModel
+
+
+@dataclass
+class SolutionEvent:
+    """
+    Class that represents a solution found by the search: the seconds since
+    the search started, its objective value, the best objective value so
+    far and the number of solutions found until then
+    """
+
+    seconds: float
+    objective_value: int
+    best_objective_value: int
+    solution_count: int
+
+
+@dataclass
+class CallbackStats:
+    """Class that counts the calls of a Python callback and their time"""
+
+    calls: int = 0
+    seconds: float = 0
+
+
+@dataclass
+class SearchTelemetry:
+    """
+    Class that records the telemetry of a search: every solution found, as
+    the objective over time, and the calls and time of the Python callbacks
+    registered in the solver. The time of a callback is measured inside
+    Python, so the cost of crossing from the solver is not included.
+    """
+
+    solutions: List[SolutionEvent] = field(default_factory=lambda: list())
+    callbacks: Dict[str, CallbackStats] = field(
+        default_factory=lambda: dict()
+    )
+    status: Optional[str] = None
+    search_seconds: Optional[float] = None
+    stop_reason: Optional[str] = None
+    time_saved: Optional[float] = None
+    _start: float = field(default=0., repr=False)
+
+    def wrap_callback(self, name: str, callback: Callable) -> Callable:
+        """Method to wrap a callback, counting and timing its calls"""
+
+        stats = self.callbacks.setdefault(name, CallbackStats())
+
+        def _timed_callback(*args):
+            """Callback that times the wrapped callback"""
+
+            start = time.perf_counter()
+            value = callback(*args)
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+
+            return value
+
+        return _timed_callback
+
+    def watch(self, solver: RoutingModel):
+        """Method to record the solutions found by the search of a solver"""
+
+        def _at_solution():
+            """Callback to record a solution when it is found"""
+
+            objective_value = solver.CostVar().Value()
+            self.solutions.append(SolutionEvent(
+                seconds=time.perf_counter() - self._start,
+                objective_value=objective_value,
+                best_objective_value=min(
+                    objective_value,
+                    self.solutions[-1].best_objective_value
+                ) if self.solutions else objective_value,
+                solution_count=len(self.solutions) + 1
+            ))
+
+        solver.AddAtSolutionCallback(_at_solution)
+        self._start = time.perf_counter()
+
+    def finish(
+            self,
+            status: str,
+            stop_reason: Optional[str] = None,
+            time_saved: Optional[float] = None
+    ):
+        """
+        Method to record the end of the search and, if the search stops at a
+        plateau, why it stopped and the seconds saved from its time limit
+        """
+
+        self.search_seconds = time.perf_counter() - self._start
+        self.status = status
+        self.stop_reason = stop_reason
+        self.time_saved = time_saved
+
+    @property
+    def time_to_best(self) -> Optional[float]:
+        """Method that returns the seconds until the best solution was found"""
+
+        if not self.solutions:
+            return None
+
+        best = self.solutions[-1].best_objective_value
+        return next(
+            event.seconds
+            for event in self.solutions
+            if event.objective_value == best
+        )
+
+    def summary(self) -> str:
+        """Method to summarize the telemetry in a line for logging"""
+
+        calls = {name: stats.calls for name, stats in self.callbacks.items()}
+
+        return (
+            f'{len(self.solutions)} solutions in {self.search_seconds:.3f} '
+            f's, the best one after {self.time_to_best} s, and these '
+            f'callback calls: {calls}'
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Method to parse the telemetry to a Dict (JSON) for dumping"""
+
+        return {
+            'status': self.status,
+            'search_seconds': self.search_seconds,
+            'stop_reason': self.stop_reason,
+            'time_saved': self.time_saved,
+            'time_to_best': self.time_to_best,
+            'solutions': [asdict(event) for event in self.solutions],
+            'callbacks': {
+                name: {
+                    **asdict(stats),
+                    'mean_us': (
+                        stats.seconds / stats.calls * 1e6
+                        if stats.calls
+                        else None
+                    )
+                }
+                for name, stats in self.callbacks.items()
+            }
+        }
@@ -0,0 +1,272 @@
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Tuple, Set
+
+import numpy as np
+
+from models.estimation_matrix import EstimationMatrix, cast_estimations
+from models.rider import Rider
+from models.sparse_estimation_matrix import SparseEstimationMatrix
+from models.stop import Stop
+from problem.problem import Problem
+from problem.problem_builder import ProblemBuilder
+
+
+@dataclass
+class RiderDelta:
+    """
+    Class that represents the changes of the Riders between two runs: Riders
+    that are added, removed by id, or moved to a new Location
+    """
+
+    added: Dict[str, Rider] = field(default_factory=lambda: dict())
+    removed: List[str] = field(default_factory=lambda: list())
+    moved: Dict[str, Rider] = field(default_factory=lambda: dict())
+
+
+class IncrementalProblemBuilder(ProblemBuilder):
+    """
+    A class to rebuild a Routing Problem from a previous one and a
+    RiderDelta. Only the Stops whose Riders change are rebuilt, and only
+    their rows and columns are estimated; the other estimations are copied
+    into a new dense matrix, so every update still takes O(n^2) time and
+    memory for n Stops, without calling the Estimator for those paths.
+    Unchanged Stops keep their index, except the last ones, which are moved
+    into the slots left by emptied Stops when no new Stop takes them.
+    """
+
+    def update(self, problem: Problem, delta: RiderDelta) -> Problem:
+        """Method to apply a RiderDelta to a Problem"""
+
+        self._validate(problem, delta)
+        old_positions = self._build_positions(problem)
+        groups, dirty = self._regroup(problem, delta, old_positions)
+        positions = self._assign_positions(old_positions, groups)
+
+        num_depot_stops = len(problem.stops) - len(old_positions)
+        stops = problem.stops[:num_depot_stops] + [None] * len(groups)
+        kept, moved_to = list(range(num_depot_stops)), []
+        dirty_positions = []
+        for key, position in positions.items():
+            if key in dirty:
+                stops[position] = Stop(riders=groups[key])
+                dirty_positions.append(position)
+
+            else:
+                stops[position] = problem.stops[old_positions[key]]
+                kept.append(old_positions[key])
+                moved_to.append(position)
+
+        estimations = self._update_estimations(
+            problem,
+            stops,
+            np.array(kept, dtype=np.int64),
+            np.array(list(range(num_depot_stops)) + moved_to, dtype=np.int64),
+            np.array(sorted(dirty_positions), dtype=np.int64)
+        )
+        removed = set(delta.removed)
+        riders = {
+            rider_id: rider
+            for rider_id, rider in problem.riders.items()
+            if rider_id not in removed
+        }
+        riders.update(delta.moved)
+        riders.update(delta.added)
+        logging.info(
+            f'Updated the Problem with {len(delta.added)} added, '
+            f'{len(delta.removed)} removed and {len(delta.moved)} moved '
+            f'riders, rebuilding {len(dirty_positions)} of {len(stops)} '
+            f'stops.'
+        )
+
+        return replace(
+            problem,
+            estimations=estimations,
+            riders=riders,
+            stops=stops
+        )
+
+    @staticmethod
+    def _validate(problem: Problem, delta: RiderDelta):
+        """Method to check the Riders of the delta against the Problem"""
+
+        if problem.params.STOP_GROUPING != 'GEOHASH':
+            raise ValueError(
+                'Only Problems with GEOHASH stop grouping can be updated, '
+                f'got {problem.params.STOP_GROUPING}.'
+            )
+
+        if isinstance(problem.estimations, SparseEstimationMatrix):
+            raise ValueError(
+                'Only Problems with dense estimations can be updated, got '
+                'sparse estimations (SPARSE_NEIGHBOURS).'
+            )
+
+        unknown = [
+            rider_id
+            for rider_id in list(delta.removed) + list(delta.moved)
+            if rider_id not in problem.riders
+        ]
+        if unknown:
+            raise ValueError(f'The riders {unknown} are not in the Problem.')
+
+        repeated = [
+            rider_id
+            for rider_id in delta.added
+            if rider_id in problem.riders
+        ]
+        if repeated:
+            raise ValueError(f'The riders {repeated} are already added.')
+
+    def _build_positions(self, problem: Problem) -> Dict[str, int]:
+        """Method to index the rider Stops of a Problem by their geohash"""
+
+        return {
+            self._group_key(next(iter(stop.riders.values()))): stop_ix
+            for stop_ix, stop in enumerate(problem.stops)
+            if not stop.depot_id
+        }
+
+    def _regroup(
+            self,
+            problem: Problem,
+            delta: RiderDelta,
+            old_positions: Dict[str, int]
+    ) -> Tuple[Dict[str, Dict[str, Rider]], Set[str]]:
+        """
+        Method to move the Riders of the delta between the geohash groups
+        of the rider Stops, returning the groups and the changed geohashes
+        """
+
+        groups = {
+            key: problem.stops[stop_ix].riders
+            for key, stop_ix in old_positions.items()
+        }
+        dirty = set()
+        for rider_id in list(delta.removed) + list(delta.moved):
+            key = self._group_key(problem.riders[rider_id])
+            if key not in dirty:
+                groups[key] = dict(groups[key])
+                dirty.add(key)
+            del groups[key][rider_id]
+
+        for rider_id, rider in list(delta.moved.items()) + list(
+                delta.added.items()
+        ):
+            key = self._group_key(rider)
+            if key not in dirty:
+                groups[key] = dict(groups.get(key, {}))
+                dirty.add(key)
+            groups[key][rider_id] = rider
+
+        for key in list(dirty):
+            if not groups[key]:
+                del groups[key]
+
+        return groups, dirty
+
+    @staticmethod
+    def _assign_positions(
+            old_positions: Dict[str, int],
+            groups: Dict[str, Dict[str, Rider]]
+    ) -> Dict[str, int]:
+        """
+        Method to assign the index of every rider Stop. Kept Stops keep
+        their index and new Stops take the slots of emptied Stops first,
+        then the ones after the last Stop. If slots remain, the last Stops
+        are moved into them, so the indices stay contiguous.
+        """
+
+        positions = {
+            key: old_positions[key]
+            for key in groups
+            if key in old_positions
+        }
+        free = sorted(
+            position
+            for key, position in old_positions.items()
+            if key not in groups
+        )
+        end = max(old_positions.values(), default=-1) + 1
+        for key in groups:
+            if key not in positions:
+                if free:
+                    positions[key] = free.pop(0)
+                else:
+                    positions[key] = end
+                    end += 1
+
+        size = end - len(free)
+        free = [position for position in free if position < size]
+        for key in sorted(positions, key=positions.get, reverse=True):
+            if not free:
+                break
+            positions[key] = free.pop(0)
+
+        return positions
+
+    def _update_estimations(
+            self,
+            problem: Problem,
+            stops: List[Stop],
+            kept: np.ndarray,
+            moved_to: np.ndarray,
+            dirty_positions: np.ndarray
+    ) -> EstimationMatrix:
+        """
+        Method that:
+        1) copies the leading block of the estimations, shared by both
+           Problems,
+        2) copies the rows and columns of the kept Stops that were moved,
+        3) estimates the rows and columns of the rebuilt Stops.
+        The previous estimations are expanded to a dense matrix and a new
+        n x n matrix is allocated on every update: only the estimated paths
+        are limited to the changed rows and columns, not the copies.
+        """
+
+        previous = problem.estimations.to_dense()
+        common = min(len(stops), len(previous))
+        matrix = np.empty((len(stops), len(stops)), dtype=previous.dtype)
+        matrix[:common, :common] = previous[:common, :common]
+
+        moved = np.flatnonzero(kept != moved_to)
+        if len(moved) > 0:
+            matrix[np.ix_(moved_to[moved], moved_to)] = (
+                previous[np.ix_(kept[moved], kept)]
+            )
+            matrix[np.ix_(moved_to, moved_to[moved])] = (
+                previous[np.ix_(kept, kept[moved])]
+            )
+
+        if len(dirty_positions) > 0:
+            origins = np.concatenate((
+                np.repeat(dirty_positions, len(stops)),
+                np.tile(moved_to, len(dirty_positions))
+            ))
+            destinations = np.concatenate((
+                np.tile(np.arange(len(stops)), len(dirty_positions)),
+                np.repeat(dirty_positions, len(moved_to))
+            ))
+            matrix[origins, destinations] = cast_estimations(
+                self._estimator.estimate_paths(stops, origins, destinations),
+                matrix.dtype
+            )
+
+        logging.info(
+            f'Copied {len(kept) ** 2} and estimated '
+            f'{len(stops) ** 2 - len(kept) ** 2} paths for the updated '
+            f'Problem.'
+        )
+
+        return EstimationMatrix.from_dense(
+            matrix,
+            dtype=matrix.dtype,
+            condensed=problem.estimations.condensed
+        )
+
+    def _group_key(self, rider: Rider) -> str:
+        """Method to obtain the geohash that groups a Rider into a Stop"""
+
+        return rider.location.extract_geohash(
+            precision=self._params.GEOHASH_PRECISION_GROUPING
+        )
@@ -1,10 +1,14 @@
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Union
+
+import numpy as np
 
 from models.depot import Depot
+from models.estimation_matrix import EstimationMatrix
 from models.params import Params
 from models.rider import Rider
+from models.sparse_estimation_matrix import SparseEstimationMatrix
 from models.stop import Stop
 from models.vehicle import Vehicle
 
@@ -15,7 +19,7 @@ class Problem:
 
     depots: Dict[str, Depot]
     ends: List[int]
-    estimations: Dict[Tuple, float]
+    estimations: Union[EstimationMatrix, SparseEstimationMatrix]
     params: Params
     riders: Dict[str, Rider]
     starts: List[int]
@@ -35,3 +39,55 @@ class Problem:
             f'{len(self.stops)} stops, '
             f'{len(self.vehicles)} vehicles.'
         )
+
+    def build_time_matrix(self, resolution: float = 1) -> np.ndarray:
+        """
+        Method to build the integer matrix of complete times between Stops:
+        the travelling time plus the service time at the destination, in
+        units of `resolution` seconds. Sparse estimations are rejected,
+        since the matrix would hold every path they leave out; their times
+        are built by `build_time_rows`.
+        """
+
+        if isinstance(self.estimations, SparseEstimationMatrix):
+            raise ValueError(
+                'The time matrix of sparse estimations (SPARSE_NEIGHBOURS) '
+                'would be dense, their times are built by origin instead.'
+            )
+
+        service_times = self._build_service_times()
+        times = (
+            self.estimations.to_dense() +
+            service_times[np.newaxis, :]
+        ) / resolution
+
+        return np.rint(times).astype(np.int64)
+
+    def build_time_rows(self, resolution: float = 1) -> List[Dict[int, int]]:
+        """
+        Method to build the integer complete times of the paths of sparse
+        estimations, as the times to the destinations of every origin, in
+        units of `resolution` seconds and rounded as `build_time_matrix`
+        """
+
+        service_times = self._build_service_times()
+        rows = []
+        for origin in range(self.estimations.num_stops):
+            destinations = self.estimations.neighbours(origin)
+            times = (
+                self.estimations.row(origin) + service_times[destinations]
+            ) / resolution
+            rows.append(dict(zip(
+                destinations.tolist(),
+                np.rint(times).astype(np.int64).tolist()
+            )))
+
+        return rows
+
+    def _build_service_times(self) -> np.ndarray:
+        """Method to obtain the service time of every Stop"""
+
+        return np.array(
+            [stop.service_time for stop in self.stops],
+            dtype=np.float64
+        )
@@ -1,14 +1,20 @@
 import logging
-from collections import defaultdict
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
 
 from estimators.estimator import Estimator
 from models.depot import Depot
+from models.location import Location
 from models.params import Params
 from models.rider import Rider
+from models.rider_store import RiderStore
 from models.stop import Stop
 from models.vehicle import Vehicle
 from problem.problem import Problem
+from utils.cluster_utils import cluster_coordinates
+from utils.geohash_utils import group_geohash
+from utils.profile_utils import profile_stage
 
 
 class ProblemBuilder:
@@ -26,9 +32,28 @@ class ProblemBuilder:
     ) -> Problem:
         """Method to build a VRP from Riders and Vehicles"""
 
-        starts, ends = self._build_vehicles_starts_ends(vehicles, depots)
-        stops = self._build_stops(riders, depots, starts, ends)
-        estimations = self._estimator.estimate(stops)
+        with profile_stage('build_stops'):
+            starts, ends = self._build_vehicles_starts_ends(vehicles, depots)
+            stops = self._build_stops(
+                riders,
+                depots,
+                starts,
+                ends,
+                max_demand=min(
+                    (vehicle.capacity for vehicle in vehicles.values()),
+                    default=None
+                )
+            )
+
+        with profile_stage('estimate'):
+            estimations = (
+                self._estimator.estimate(stops)
+                if self._params.SPARSE_NEIGHBOURS is None
+                else self._estimator.estimate_sparse(
+                    stops,
+                    self._params.SPARSE_NEIGHBOURS
+                )
+            )
 
         return Problem(
             depots=depots,
@@ -46,28 +71,26 @@ class ProblemBuilder:
             riders: Dict[str, Rider],
             depots: Dict[str, Depot],
             starts: List[int],
-            ends: List[int]
+            ends: List[int],
+            max_demand: Optional[int] = None
     ) -> List[Stop]:
-        """Method to build Stops from locations of Riders and Depots"""
-
-        stop_groups = defaultdict(list)
-        for rider_id, rider in riders.items():
-            geohash = rider.location.extract_geohash(
-                precision=self._params.GEOHASH_PRECISION_GROUPING
-            )
-            stop_groups[geohash] += [rider_id]
-
-        stops = [
-            Stop(riders={rider_id: riders[rider_id] for rider_id in rider_ids})
-            for rider_ids in stop_groups.values()
-        ]
+        """
+        Method to build Stops from locations of Riders and Depots. When the
+        Riders are clustered, a Stop has at most `max_demand` Riders.
+        """
+
+        if isinstance(riders, RiderStore):
+            stops = self._build_store_stops(riders, max_demand)
+        else:
+            stops = self._build_rider_stops(riders, max_demand)
         logging.info(
             f'Built {len(stops)} rider stops from {len(riders)} riders.'
         )
+        used_depots = set(starts) | set(ends)
         depot_stops = [
             Stop(depot_id=depot.depot_id, location=depot.location)
             for depot_ix, depot in enumerate(depots.values())
-            if depot_ix in starts or depot_ix in ends
+            if depot_ix in used_depots
         ]
         logging.info(
             f'Built {len(depot_stops)} depot stops from {len(depots)} depots.'
@@ -75,6 +98,112 @@ class ProblemBuilder:
 
         return depot_stops + stops
 
+    def _build_rider_stops(
+            self,
+            riders: Dict[str, Rider],
+            max_demand: Optional[int] = None
+    ) -> List[Stop]:
+        """
+        Method to build Stops from the groups of the Riders, computed in a
+        single pass
+        """
+
+        lats = np.fromiter(
+            (rider.location.lat for rider in riders.values()),
+            dtype=np.float64,
+            count=len(riders)
+        )
+        lngs = np.fromiter(
+            (rider.location.lng for rider in riders.values()),
+            dtype=np.float64,
+            count=len(riders)
+        )
+        labels, stop_lats, stop_lngs = self._group_riders(
+            lats,
+            lngs,
+            max_demand
+        )
+        stop_groups = [{} for _ in range(len(stop_lats))]
+        for (rider_id, rider), label in zip(riders.items(), labels.tolist()):
+            stop_groups[label][rider_id] = rider
+
+        return [
+            Stop(riders=stop_riders, location=Location(lat=lat, lng=lng))
+            for stop_riders, lat, lng in zip(
+                stop_groups,
+                stop_lats.tolist(),
+                stop_lngs.tolist()
+            )
+        ]
+
+    def _build_store_stops(
+            self,
+            riders: RiderStore,
+            max_demand: Optional[int] = None
+    ) -> List[Stop]:
+        """
+        Method to build Stops from the groups of a RiderStore, whose Riders
+        are slices of the store
+        """
+
+        labels, stop_lats, stop_lngs = self._group_riders(
+            riders.lats,
+            riders.lngs,
+            max_demand
+        )
+        rider_slices = riders.slices(labels, len(stop_lats))
+
+        return [
+            Stop(riders=rider_slice, location=Location(lat=lat, lng=lng))
+            for rider_slice, lat, lng in zip(
+                rider_slices,
+                stop_lats.tolist(),
+                stop_lngs.tolist()
+            )
+        ]
+
+    def _group_riders(
+            self,
+            lats: np.ndarray,
+            lngs: np.ndarray,
+            max_demand: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Method to group the locations of the Riders, according to the
+        STOP_GROUPING param. GEOHASH groups them by their geohash at a fixed
+        precision, located at the group means. CLUSTER groups them within
+        the MAX_WALKING_DISTANCE of a Stop, with at most `max_demand` Riders
+        each. It returns the group of every Rider and the latitude and
+        longitude of every group.
+        """
+
+        if self._params.STOP_GROUPING == 'CLUSTER':
+            return cluster_coordinates(
+                lats,
+                lngs,
+                radius=self._params.MAX_WALKING_DISTANCE,
+                max_size=max_demand
+            )
+
+        if self._params.STOP_GROUPING != 'GEOHASH':
+            raise ValueError(
+                f'Unknown STOP_GROUPING {self._params.STOP_GROUPING}, use '
+                f'GEOHASH or CLUSTER.'
+            )
+
+        labels, num_groups = group_geohash(
+            lats,
+            lngs,
+            precision=self._params.GEOHASH_PRECISION_GROUPING
+        )
+        counts = np.bincount(labels, minlength=num_groups)
+
+        return (
+            labels,
+            np.bincount(labels, weights=lats, minlength=num_groups) / counts,
+            np.bincount(labels, weights=lngs, minlength=num_groups) / counts
+        )
+
     @staticmethod
     def _build_vehicles_starts_ends(
             vehicles: Dict[str, Vehicle],
@@ -82,12 +211,14 @@ class ProblemBuilder:
     ) -> Tuple[List[int], List[int]]:
         """Method to build lists with the start and end depots"""
 
-        depot_keys = list(depots.keys())
-        starts, ends = [None] * len(vehicles), [None] * len(vehicles)
-
-        for vehicle_ix, vehicle in enumerate(vehicles.values()):
-            starts[vehicle_ix] = depot_keys.index(vehicle.start)
-            ends[vehicle_ix] = depot_keys.index(vehicle.end)
+        depot_indices = {
+            depot_id: depot_ix
+            for depot_ix, depot_id in enumerate(depots.keys())
+        }
+        starts = [
+            depot_indices[vehicle.start] for vehicle in vehicles.values()
+        ]
+        ends = [depot_indices[vehicle.end] for vehicle in vehicles.values()]
 
         logging.info(
             f'Built start and end locations from {len(vehicles)} vehicles and '
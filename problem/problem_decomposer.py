@@ -0,0 +1,242 @@
+import logging
+from dataclasses import dataclass, replace
+from typing import List
+
+import numpy as np
+
+from problem.problem import Problem
+
+
+@dataclass
+class SubProblem:
+    """
+    Class that holds a sector of a Problem as an independent Problem, with
+    the global indices of its local Stops and Vehicles
+    """
+
+    problem: Problem
+    stops: np.ndarray
+    vehicles: np.ndarray
+
+
+class ProblemDecomposer:
+    """
+    A class to decompose a Problem into capacity-balanced sectors, sweeping
+    the rider Stops by their polar angle around the most common start depot.
+    Sectors that turn out infeasible can be merged and solved together.
+    """
+
+    def __init__(self, sector_size: int):
+        self._sector_size = sector_size
+
+    def decompose(self, problem: Problem) -> List[SubProblem]:
+        """
+        Method that:
+        1) assigns the Vehicles to sectors of similar capacity,
+        2) sorts the rider Stops by angle, starting after the widest gap,
+        3) cuts them into sectors with a demand proportional to their
+           capacity, so the spare capacity of the fleet is spread between
+           them, and never above it,
+        4) builds a SubProblem for every sector.
+        """
+
+        rider_stops = np.array(
+            [
+                stop_ix
+                for stop_ix, stop in enumerate(problem.stops)
+                if not stop.depot_id
+            ],
+            dtype=np.int64
+        )
+        num_sectors = max(1, min(
+            int(np.ceil(len(rider_stops) / self._sector_size)),
+            len(problem.vehicles)
+        ))
+        capacities = np.array(
+            [vehicle.capacity for vehicle in problem.vehicles.values()],
+            dtype=np.float64
+        )
+        sector_vehicles = self._assign_vehicles(capacities, num_sectors)
+        order = rider_stops[self._sweep(problem, rider_stops)]
+        demands = np.array(
+            [problem.stops[stop_ix].demand for stop_ix in order],
+            dtype=np.float64
+        )
+        sectors = self._cut_sectors(
+            demands,
+            np.array([
+                capacities[vehicles].sum() for vehicles in sector_vehicles
+            ])
+        )
+
+        sub_problems = [
+            self._build_sub_problem(
+                problem,
+                order[sectors == sector_ix],
+                vehicles
+            )
+            for sector_ix, vehicles in enumerate(sector_vehicles)
+        ]
+        logging.info(
+            f'Decomposed the Problem into {len(sub_problems)} sectors with '
+            f'these number of stops: '
+            f'{[len(sub.stops) for sub in sub_problems]}.'
+        )
+
+        return sub_problems
+
+    def merge(
+            self,
+            problem: Problem,
+            sub_problems: List[SubProblem],
+            vehicles: List[int]
+    ) -> SubProblem:
+        """
+        Method to merge some sectors into a single SubProblem, with their
+        Vehicles and some more
+        """
+
+        rider_stops = np.array(
+            [
+                stop_ix
+                for sub in sub_problems
+                for stop_ix in sub.stops.tolist()
+                if not problem.stops[stop_ix].depot_id
+            ],
+            dtype=np.int64
+        )
+
+        return self._build_sub_problem(
+            problem,
+            rider_stops,
+            sorted(
+                [
+                    vehicle_ix
+                    for sub in sub_problems
+                    for vehicle_ix in sub.vehicles.tolist()
+                ] + vehicles
+            )
+        )
+
+    @staticmethod
+    def _sweep(problem: Problem, rider_stops: np.ndarray) -> np.ndarray:
+        """Method to order the rider Stops by their angle around the depot"""
+
+        center = problem.stops[int(np.bincount(problem.starts).argmax())]
+        lats = np.array(
+            [problem.stops[stop_ix].location.lat for stop_ix in rider_stops]
+        )
+        lngs = np.array(
+            [problem.stops[stop_ix].location.lng for stop_ix in rider_stops]
+        )
+        angles = np.arctan2(
+            lats - center.location.lat,
+            (lngs - center.location.lng) *
+            np.cos(np.radians(center.location.lat))
+        )
+        order = np.argsort(angles, kind='stable')
+        if len(order) < 2:
+            return order
+
+        # The sweep starts after the widest empty gap between angles
+        sorted_angles = angles[order]
+        gaps = np.diff(sorted_angles, append=sorted_angles[0] + 2 * np.pi)
+
+        return np.roll(order, -(int(gaps.argmax()) + 1))
+
+    @staticmethod
+    def _assign_vehicles(
+            capacities: np.ndarray,
+            num_sectors: int
+    ) -> List[List[int]]:
+        """
+        Method to assign the largest Vehicles first to the sector that lacks
+        most of an even share of the capacity, so every sector has one
+        """
+
+        missing = np.full(num_sectors, capacities.sum() / num_sectors)
+        sector_vehicles = [[] for _ in range(num_sectors)]
+        for vehicle_ix in np.argsort(-capacities, kind='stable').tolist():
+            sector_ix = int(missing.argmax())
+            sector_vehicles[sector_ix].append(vehicle_ix)
+            missing[sector_ix] -= capacities[vehicle_ix]
+
+        return sector_vehicles
+
+    @staticmethod
+    def _cut_sectors(
+            demands: np.ndarray,
+            capacities: np.ndarray
+    ) -> np.ndarray:
+        """
+        Method to cut the swept demands into sectors with a share of the
+        demand proportional to their capacity. A sector is closed early
+        rather than exceeding its capacity, so only the last one may exceed
+        it, when the fleet lacks capacity.
+        """
+
+        bounds = (
+            np.cumsum(capacities) *
+            demands.sum() / max(capacities.sum(), 1)
+        ).tolist()
+        midpoints = (np.cumsum(demands) - demands / 2).tolist()
+        sectors = np.zeros(len(demands), dtype=np.int64)
+        sector_ix, load = 0, 0.
+        for position, demand in enumerate(demands.tolist()):
+            while sector_ix < len(capacities) - 1 and (
+                    midpoints[position] > bounds[sector_ix] or
+                    load + demand > capacities[sector_ix]
+            ):
+                sector_ix, load = sector_ix + 1, 0.
+
+            sectors[position] = sector_ix
+            load += demand
+
+        return sectors
+
+    @staticmethod
+    def _build_sub_problem(
+            problem: Problem,
+            rider_stops: np.ndarray,
+            vehicles: List[int]
+    ) -> SubProblem:
+        """Method to build the Problem of a sector, depot Stops first"""
+
+        depot_stops = np.unique(
+            [problem.starts[ix] for ix in vehicles] +
+            [problem.ends[ix] for ix in vehicles]
+        )
+        stops = np.concatenate((depot_stops, np.sort(rider_stops)))
+        local_indices = {
+            stop_ix: local_ix
+            for local_ix, stop_ix in enumerate(stops.tolist())
+        }
+        vehicle_items = list(problem.vehicles.items())
+        depot_ids = {
+            problem.stops[stop_ix].depot_id
+            for stop_ix in depot_stops
+        }
+        sub_problem = replace(
+            problem,
+            depots={
+                depot_id: depot
+                for depot_id, depot in problem.depots.items()
+                if depot_id in depot_ids
+            },
+            ends=[local_indices[problem.ends[ix]] for ix in vehicles],
+            estimations=problem.estimations.take(stops),
+            riders={
+                rider_id: rider
+                for stop_ix in rider_stops
+                for rider_id, rider in problem.stops[stop_ix].riders.items()
+            },
+            starts=[local_indices[problem.starts[ix]] for ix in vehicles],
+            stops=[problem.stops[stop_ix] for stop_ix in stops],
+            vehicles=dict(vehicle_items[ix] for ix in vehicles)
+        )
+
+        return SubProblem(
+            problem=sub_problem,
+            stops=stops,
+            vehicles=np.array(vehicles, dtype=np.int64)
+        )
@@ -1,26 +1,43 @@
 import logging
-from typing import Dict, List, Any
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+import numpy as np
 
 from models.depot import Depot
 from models.rider import Rider
-from models.route import Route
+from models.solution import Solution
 from models.vehicle import Vehicle
+from optimization_model.optimization_model import NoSolutionError
 from optimization_model.optimization_model_builder import \
     OptimizationModelBuilder
+from optimization_model.search_telemetry import SearchTelemetry
 from problem.problem import Problem
 from problem.problem_builder import ProblemBuilder
+from problem.problem_decomposer import ProblemDecomposer
+from utils.profile_utils import profile_stage
 
 
 class Router:
-    """Class that creates Routes using different services"""
+    """
+    Class that creates Routes using different services. The telemetry of the
+    searches of the last solve is kept, if the Opt. Models record it.
+    """
 
     def __init__(
             self,
             problem_builder: ProblemBuilder,
-            optimization_model_builder: OptimizationModelBuilder
+            optimization_model_builder: OptimizationModelBuilder,
+            problem_decomposer: Optional[ProblemDecomposer] = None,
+            max_workers: Optional[int] = None
     ):
         self._problem_builder = problem_builder
         self._optimization_model_builder = optimization_model_builder
+        self._problem_decomposer = problem_decomposer
+        self._max_workers = max_workers
+        self.telemetry: List[SearchTelemetry] = []
 
     def route(
             self,
@@ -30,36 +47,190 @@ class Router:
     ) -> List[Dict[str, Any]]:
         """Method that orchestrates the services and returns the Routes"""
 
-        problem = self._problem_builder.build(riders, vehicles, depots)
-        model = self._optimization_model_builder.build(problem)
-        solution = model.solve()
-        routes = self._parse_routes(problem, solution)
+        problem, solution = self.solve(riders, vehicles, depots)
+        with profile_stage('parse_routes'):
+            routes = self._parse_routes(problem, solution)
 
         return routes
 
+    def solve(
+            self,
+            riders: Dict[str, Rider],
+            vehicles: Dict[str, Vehicle],
+            depots: Dict[str, Depot]
+    ) -> Tuple[Problem, Solution]:
+        """Method to build and solve the Problem, without parsing Routes"""
+
+        with profile_stage('build_problem'):
+            problem = self._problem_builder.build(riders, vehicles, depots)
+
+        if self._problem_decomposer is not None:
+            with profile_stage('solve_decomposed'):
+                solution = self._solve_decomposed(problem)
+        else:
+            with profile_stage('build_model'):
+                model = self._optimization_model_builder.build(problem)
+            with profile_stage('solve'):
+                solution = model.solve()
+            self.telemetry = (
+                [model.telemetry] if model.telemetry is not None else []
+            )
+
+        return problem, solution
+
+    def _solve_decomposed(self, problem: Problem) -> Solution:
+        """
+        Method to solve the sectors of the Problem in parallel processes and
+        merge their solutions with the global Stop indices. The search time
+        limit of the Params is split between the waves of workers. The
+        sectors without a solution are merged and solved together, with the
+        Vehicles left idle by the other sectors, in one more wave, so the
+        search can then exceed the time limit by the share of a wave; if
+        that fails as well, a NoSolutionError is raised rather than leaving
+        their riders out.
+        """
+
+        sub_problems = self._problem_decomposer.decompose(problem)
+        max_workers = self._max_workers or min(
+            len(sub_problems), os.cpu_count() or 1
+        )
+        waves = -(-len(sub_problems) // max_workers)
+        time_limit = problem.params.SEARCH_TIME_LIMIT / waves
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            sub_results = list(executor.map(
+                _solve_sub_problem,
+                [self._optimization_model_builder] * len(sub_problems),
+                [
+                    self._limit_time(sub.problem, time_limit)
+                    for sub in sub_problems
+                ]
+            ))
+
+        routes = [
+            [start, end]
+            for start, end in zip(problem.starts, problem.ends)
+        ]
+        failed_sub_problems, idle_vehicles = [], []
+        for sub, (sub_solution, _) in zip(sub_problems, sub_results):
+            if sub_solution is None:
+                failed_sub_problems.append(sub)
+                continue
+
+            for vehicle_ix, route in zip(sub.vehicles.tolist(), sub_solution):
+                routes[vehicle_ix] = sub.stops[route].tolist()
+                if len(route) <= 2:
+                    idle_vehicles.append(vehicle_ix)
+
+        if failed_sub_problems:
+            logging.warning(
+                f'{len(failed_sub_problems)} sectors of the Problem have no '
+                f'solution, they are solved together with '
+                f'{len(idle_vehicles)} idle vehicles.'
+            )
+            merged = self._problem_decomposer.merge(
+                problem,
+                failed_sub_problems,
+                idle_vehicles
+            )
+            merged_solution, merged_telemetry = _solve_sub_problem(
+                self._optimization_model_builder,
+                self._limit_time(merged.problem, time_limit)
+            )
+            if merged_solution is None:
+                raise NoSolutionError(
+                    f'{len(failed_sub_problems)} sectors of the Problem have '
+                    f'no solution, even when solved together.'
+                )
+
+            for vehicle_ix, route in zip(
+                    merged.vehicles.tolist(), merged_solution
+            ):
+                routes[vehicle_ix] = merged.stops[route].tolist()
+            sub_results.append((merged_solution, merged_telemetry))
+
+        self.telemetry = [
+            telemetry
+            for _, telemetry in sub_results
+            if telemetry is not None
+        ]
+        logging.info(
+            f'Solved {len(sub_problems)} sectors of the Problem with '
+            f'{max_workers} workers and a time limit of {time_limit:.3f} s.'
+        )
+
+        return Solution.from_routes(routes)
+
+    @staticmethod
+    def _limit_time(problem: Problem, time_limit: float) -> Problem:
+        """Method to set the search time limit of a Problem"""
+
+        return replace(
+            problem,
+            params=replace(problem.params, SEARCH_TIME_LIMIT=time_limit)
+        )
+
+    @staticmethod
+    def iter_routes(
+            problem: Problem,
+            solution: Solution
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Method that parses the optimizer's response to the Routes, one at a
+        time, straight from the flat arrays of the solution. Only the routes
+        that visit a Stop are parsed, and the depot Stops are parsed once.
+        """
+
+        vehicle_ids = list(problem.vehicles.keys())
+        depot_dicts = {}
+        offsets = solution.offsets.tolist()
+        stops = solution.stops.tolist()
+        for vehicle_ix in np.flatnonzero(solution.lengths > 1).tolist():
+            stop_dicts = []
+            for stop_ix in stops[offsets[vehicle_ix]:offsets[vehicle_ix + 1]]:
+                stop = problem.stops[stop_ix]
+                if not stop.depot_id:
+                    stop_dicts.append(stop.to_dict())
+                else:
+                    if stop_ix not in depot_dicts:
+                        depot_dicts[stop_ix] = stop.to_dict()
+                    stop_dicts.append(depot_dicts[stop_ix])
+
+            yield {
+                'vehicle_id': vehicle_ids[vehicle_ix],
+                'stops': stop_dicts
+            }
+
     @staticmethod
     def _parse_routes(
             problem: Problem,
-            solution: List[List[int]]
+            solution: Solution
     ) -> List[Dict[str, Any]]:
         """Method that parses the optimizer's response to the Routes"""
 
-        routes = []
-        for vehicle_ix, solution_stops in enumerate(solution):
-            if len(solution_stops) > 1:
-                route = Route(
-                    stops=[
-                        problem.stops[stop_ix]
-                        for stop_ix in solution_stops
-                    ],
-                    vehicle_id=list(problem.vehicles.keys())[vehicle_ix]
-                )
-                route_dict = route.to_dict()
-                routes.append(route_dict)
-
+        routes = list(Router.iter_routes(problem, solution))
         logging.info(
             f'Obtained {len(routes)} routes from '
             f'the OptimizationModel solution.'
         )
 
         return routes
+
+
+def _solve_sub_problem(
+        optimization_model_builder: OptimizationModelBuilder,
+        problem: Problem
+) -> Tuple[Optional[Solution], Optional[SearchTelemetry]]:
+    """
+    Method to solve the Problem of a sector, in a worker, returning the
+    telemetry of its search as well. The solution is None if the search
+    finds none.
+    """
+
+    model = optimization_model_builder.build(problem)
+    try:
+        solution = model.solve()
+
+    except NoSolutionError:
+        solution = None
+
+    return solution, model.telemetry
@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+
+from service.http_server import HttpServer
+from service.routing_service import RoutingService
+from utils.logging_utils import configure_logs
+
+"""Main method to execute the Router as an HTTP service"""
+
+
+async def serve(
+        host: str,
+        port: int,
+        max_workers: int,
+        max_queue_size: int
+):
+    """Method to run the service until it is interrupted"""
+
+    service = RoutingService(
+        max_workers=max_workers,
+        max_queue_size=max_queue_size
+    )
+    await service.start()
+    server = HttpServer(service, host=host, port=port)
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+
+    finally:
+        await server.stop()
+        await service.stop()
+
+
+if __name__ == '__main__':
+    # CLI parsing
+    parser = argparse.ArgumentParser(
+        description='Route school buses as an HTTP service.'
+    )
+    parser.add_argument(
+        '--host',
+        type=str,
+        help='Host to listen on. Default is 127.0.0.1',
+        default='127.0.0.1'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Port to listen on. Default is 8080',
+        default=8080
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of worker processes. Default is the number of CPUs',
+        default=None
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        help='Maximum number of queued jobs. Default is 100',
+        default=100
+    )
+    args = parser.parse_args()
+
+    # Method execution
+    configure_logs()
+    try:
+        asyncio.run(serve(
+            args.host,
+            args.port,
+            args.workers,
+            args.queue_size
+        ))
+
+    except KeyboardInterrupt:
+        pass
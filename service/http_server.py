@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+from typing import Dict, Any, Tuple, Optional
+
+from service.routing_service import RoutingService, QueueFullError
+
+# Maximum size of a request body, in bytes
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+# Reason phrases of the statuses returned by the server
+HTTP_STATUSES = {
+    200: 'OK',
+    202: 'Accepted',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    429: 'Too Many Requests'
+}
+
+
+class PayloadTooLargeError(ValueError):
+    """Error raised when the body of a request exceeds the maximum size"""
+
+
+class HttpServer:
+    """
+    Class that exposes a RoutingService over HTTP/1.1 with JSON bodies:
+    - POST /jobs queues a Job from {"riders", "vehicles", "depots",
+      "params", "priority"} and returns its id,
+    - GET /jobs/{job_id} returns the status of a Job and its Routes,
+    - GET /health and GET /metrics report on the service.
+    Every response closes its connection.
+    """
+
+    def __init__(
+            self,
+            service: RoutingService,
+            host: str = '127.0.0.1',
+            port: int = 8080
+    ):
+        self._service = service
+        self._host = host
+        self._port = port
+        self._server = None
+
+    @property
+    def port(self) -> int:
+        """Method that returns the port the server listens on"""
+
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        """Method to start listening for requests"""
+
+        self._server = await asyncio.start_server(
+            self._handle,
+            self._host,
+            self._port,
+            limit=MAX_BODY_SIZE
+        )
+        logging.info(f'Listening on http://{self._host}:{self.port}.')
+
+    async def stop(self):
+        """Method to stop listening for requests"""
+
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ):
+        """Method to answer a request on a connection"""
+
+        try:
+            method, path, body = await self._read_request(reader)
+            status, response = self._dispatch(method, path, body)
+
+        except (PayloadTooLargeError, asyncio.LimitOverrunError) as error:
+            status, response = 413, {'error': str(error)}
+
+        except ValueError as error:
+            status, response = 400, {'error': str(error)}
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+
+        payload = json.dumps(response).encode()
+        writer.write(
+            f'HTTP/1.1 {status} {HTTP_STATUSES[status]}\r\n'
+            f'Content-Type: application/json\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            f'Connection: close\r\n\r\n'.encode() + payload
+        )
+        try:
+            await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        writer.close()
+
+    @staticmethod
+    async def _read_request(
+            reader: asyncio.StreamReader
+    ) -> Tuple[str, str, Optional[bytes]]:
+        """Method to read the method, path and body of a request"""
+
+        head = await reader.readuntil(b'\r\n\r\n')
+        request_line, *header_lines = head.decode('latin-1').split('\r\n')
+        parts = request_line.split(' ')
+        if len(parts) != 3:
+            raise ValueError(f'Malformed request line: {request_line}.')
+
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (
+                line.partition(':') for line in header_lines if line
+            )
+        }
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_SIZE:
+            raise PayloadTooLargeError(
+                f'The body of {length} bytes is too large.'
+            )
+
+        body = await reader.readexactly(length) if length else None
+
+        return parts[0], parts[1], body
+
+    def _dispatch(
+            self,
+            method: str,
+            path: str,
+            body: Optional[bytes]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Method to route a request to the service"""
+
+        path = path.split('?')[0].rstrip('/')
+        if path == '/health' and method == 'GET':
+            return 200, self._service.health
+
+        if path == '/metrics' and method == 'GET':
+            return 200, self._service.metrics
+
+        if path == '/jobs' and method == 'POST':
+            if body is None:
+                raise ValueError('The request has no body.')
+
+            job_dict = json.loads(body)
+            if not isinstance(job_dict, dict):
+                raise ValueError('The body must be a JSON object.')
+
+            try:
+                priority = int(job_dict.get('priority', 0))
+
+            except (TypeError, ValueError):
+                raise ValueError('The priority must be an integer.')
+
+            try:
+                job = self._service.submit(job_dict, priority=priority)
+
+            except QueueFullError as error:
+                return 429, {'error': str(error)}
+
+            return 202, {'job_id': job.job_id, 'status': job.status}
+
+        if path.startswith('/jobs/') and method == 'GET':
+            job_id = path[len('/jobs/'):]
+            job = self._service.get(job_id)
+            if job is None:
+                return 404, {'error': f'The job {job_id} does not exist.'}
+
+            return 200, job.to_dict()
+
+        if path in ('/health', '/metrics', '/jobs'):
+            return 405, {'error': f'{method} is not allowed on {path}.'}
+
+        return 404, {'error': f'The path {path} does not exist.'}
@@ -0,0 +1,44 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+# Statuses of a Job, from submission to completion
+JOB_STATUSES = ('queued', 'running', 'success', 'failed')
+
+
+@dataclass
+class Job:
+    """
+    Class that represents a routing Job of the service. Jobs with a higher
+    priority run first, and equal priorities run in submission order.
+    """
+
+    job_id: str
+    payload: Dict[str, Any] = field(repr=False)
+    priority: int = 0
+    status: str = 'queued'
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    routes: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Method that returns if the Job has finished"""
+
+        return self.status in ('success', 'failed')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Method to parse the Job to a Dict (JSON) for dumping"""
+
+        return {
+            'job_id': self.job_id,
+            'priority': self.priority,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'routes': self.routes,
+            'error': self.error
+        }
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+import traceback
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from estimators.linear_estimator import LinearEstimator
+from main import build_router
+from service.job import Job
+from utils.file_utils import parse_entities
+from utils.logging_utils import configure_logs
+
+# Keys of a Job payload, in the shape of the input files
+PAYLOAD_KEYS = ('riders', 'vehicles', 'depots')
+
+# Number of finished Jobs whose timings are kept for the metrics
+METRICS_WINDOW = 1000
+
+
+class QueueFullError(Exception):
+    """Error raised when the queue of the service has no room for a Job"""
+
+
+class RoutingService:
+    """
+    Class that runs routing Jobs in a pool of worker processes. Jobs wait in
+    a bounded priority queue and at most `max_workers` run at once, which
+    is the CPU budget of the service. Submitting to a full queue raises a
+    QueueFullError, so clients back off instead of piling up Jobs. Only the
+    last `max_results` finished Jobs are kept for fetching their results.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            max_queue_size: int = 100,
+            max_results: int = 1000
+    ):
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._max_queue_size = max_queue_size
+        self._max_results = max_results
+        self._jobs = OrderedDict()
+        self._sequence = 0
+        self._queue = None
+        self._executor = None
+        self._tasks = []
+        self._started_at = None
+        self._counters = {
+            'submitted': 0,
+            'rejected': 0,
+            'succeeded': 0,
+            'failed': 0
+        }
+        self._waits = deque(maxlen=METRICS_WINDOW)
+        self._runs = deque(maxlen=METRICS_WINDOW)
+
+    async def start(self):
+        """
+        Method to start the worker processes and the queue consumers. The
+        workers are spawned, and not forked, so they do not inherit the
+        sockets of the connections, and they import the Router before the
+        first Job arrives.
+        """
+
+        self._queue = asyncio.PriorityQueue(maxsize=self._max_queue_size)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=configure_logs
+        )
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self._executor, os.getpid)
+            for _ in range(self._max_workers)
+        ])
+        self._tasks = [
+            asyncio.ensure_future(self._consume())
+            for _ in range(self._max_workers)
+        ]
+        self._started_at = time.time()
+        logging.info(
+            f'Started the RoutingService with {self._max_workers} workers '
+            f'and a queue of {self._max_queue_size} jobs.'
+        )
+
+    async def stop(self):
+        """Method to cancel the consumers and shut the worker processes"""
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+        logging.info('Stopped the RoutingService.')
+
+    def submit(self, payload: Dict[str, Any], priority: int = 0) -> Job:
+        """Method to validate a payload and queue its Job"""
+
+        missing = [key for key in PAYLOAD_KEYS if key not in payload]
+        if missing:
+            raise ValueError(f'The payload is missing the keys {missing}.')
+
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            payload=payload,
+            priority=priority
+        )
+        try:
+            self._queue.put_nowait((-priority, self._sequence, job))
+
+        except asyncio.QueueFull:
+            self._counters['rejected'] += 1
+            raise QueueFullError(
+                f'The queue is full with {self._queue.qsize()} jobs.'
+            )
+
+        self._sequence += 1
+        self._counters['submitted'] += 1
+        self._remember(job)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Method to obtain a Job by its id, if it is still kept"""
+
+        return self._jobs.get(job_id)
+
+    @property
+    def health(self) -> Dict[str, Any]:
+        """Method that returns the health of the service"""
+
+        alive = sum(not task.done() for task in self._tasks)
+
+        return {
+            'status': 'ok' if alive == len(self._tasks) else 'degraded',
+            'workers': alive,
+            'uptime': time.time() - self._started_at
+        }
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Method that returns the counters and timings of the service"""
+
+        return {
+            **self._counters,
+            'queued': self._queue.qsize(),
+            'running': sum(
+                job.status == 'running' for job in self._jobs.values()
+            ),
+            'workers': self._max_workers,
+            'queue_size': self._max_queue_size,
+            'wait_seconds': _percentiles(self._waits),
+            'run_seconds': _percentiles(self._runs)
+        }
+
+    async def _consume(self):
+        """Method to run the queued Jobs in the worker processes"""
+
+        loop = asyncio.get_event_loop()
+        while True:
+            _, _, job = await self._queue.get()
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                job.routes = await loop.run_in_executor(
+                    self._executor,
+                    route_payload,
+                    job.payload
+                )
+                job.status = 'success'
+                self._counters['succeeded'] += 1
+
+            except Exception as error:
+                logging.error(f'The job {job.job_id} failed: {error}')
+                job.status = 'failed'
+                job.error = ''.join(traceback.format_exception_only(
+                    type(error), error
+                )).strip()
+                self._counters['failed'] += 1
+
+            job.finished_at = time.time()
+            job.payload = None
+            self._waits.append(job.started_at - job.submitted_at)
+            self._runs.append(job.finished_at - job.started_at)
+            self._queue.task_done()
+
+    def _remember(self, job: Job):
+        """Method to keep a Job, forgetting the oldest finished ones"""
+
+        self._jobs[job.job_id] = job
+        finished = [
+            job_id
+            for job_id, kept_job in self._jobs.items()
+            if kept_job.done
+        ] if len(self._jobs) > self._max_results else []
+        for job_id in finished[:len(self._jobs) - self._max_results]:
+            del self._jobs[job_id]
+
+
+def route_payload(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Method to route the payload of a Job, in a worker"""
+
+    riders, vehicles, depots, params = parse_entities(
+        payload['riders'],
+        payload['vehicles'],
+        payload['depots'],
+        payload.get('params', {})
+    )
+    router = build_router(params, LinearEstimator())
+
+    return router.route(riders, vehicles, depots)
+
+
+def _percentiles(values: deque) -> Dict[str, Optional[float]]:
+    """Method to summarize timings with their median and 95th percentile"""
+
+    if not values:
+        return {'p50': None, 'p95': None}
+
+    p50, p95 = np.percentile(np.fromiter(values, dtype=np.float64), (50, 95))
+
+    return {'p50': float(p50), 'p95': float(p95)}
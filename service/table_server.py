@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple, Optional, Iterator
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from estimators.estimator import Estimator
+from estimators.linear_estimator import LinearEstimator
+from models.location import Location
+from models.stop import Stop
+from utils.logging_utils import configure_logs
+
+# Reason phrases of the statuses returned by the server
+HTTP_STATUSES = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    503: 'Service Unavailable'
+}
+
+
+class TableServer:
+    """
+    Class that stands in for an OSRM-style table service, for tests and
+    benchmarks of the TableServiceEstimator. It answers
+    `GET /table/v1/{profile}/{lng,lat;...}?sources=...&destinations=...`
+    with the durations of an Estimator between the coordinates, over
+    keep-alive connections. Requests of more than `max_locations`
+    coordinates are rejected as TooBig, the first `failures` requests fail
+    with a 503 status, and every response waits `latency` seconds.
+    """
+
+    def __init__(
+            self,
+            estimator: Optional[Estimator] = None,
+            host: str = '127.0.0.1',
+            port: int = 5000,
+            max_locations: int = 100,
+            latency: float = 0,
+            failures: int = 0
+    ):
+        self._estimator = estimator or LinearEstimator()
+        self._host = host
+        self._port = port
+        self._max_locations = max_locations
+        self._latency = latency
+        self._failures = failures
+        self._server = None
+        self.requests = 0
+        self.connections = 0
+
+    @property
+    def port(self) -> int:
+        """Method that returns the port the server listens on"""
+
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        """Method to start listening for requests"""
+
+        self._server = await asyncio.start_server(
+            self._handle,
+            self._host,
+            self._port
+        )
+        logging.info(
+            f'Serving tables on http://{self._host}:{self.port}.'
+        )
+
+    async def stop(self):
+        """Method to stop listening for requests"""
+
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ):
+        """Method to answer the requests of a connection until it closes"""
+
+        self.connections += 1
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            headers = {
+                name.strip().lower(): value.strip()
+                for name, _, value in (
+                    line.partition(':') for line in header_lines if line
+                )
+            }
+            await reader.readexactly(int(headers.get('content-length', 0)))
+            self.requests += 1
+            status, response = self._dispatch(request_line)
+            if self._latency:
+                await asyncio.sleep(self._latency)
+
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            payload = json.dumps(response).encode()
+            writer.write(
+                f'HTTP/1.1 {status} {HTTP_STATUSES[status]}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(payload)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}'
+                f'\r\n\r\n'.encode() + payload
+            )
+            try:
+                await writer.drain()
+
+            except ConnectionError:
+                break
+
+            if not keep_alive:
+                break
+
+        writer.close()
+
+    def _dispatch(self, request_line: str) -> Tuple[int, Dict[str, Any]]:
+        """Method to answer a table request"""
+
+        if self.requests <= self._failures:
+            return 503, {'code': 'Unavailable', 'message': 'Try again.'}
+
+        method, target, _ = request_line.split(' ')
+        url = urlsplit(target)
+        parts = url.path.split('/')
+        if method != 'GET' or len(parts) != 5 or parts[1:3] != ['table', 'v1']:
+            return 404, {'code': 'NotFound', 'message': 'Unknown path.'}
+
+        try:
+            coordinates = np.array(
+                [
+                    [float(value) for value in pair.split(',')]
+                    for pair in parts[4].split(';')
+                ],
+                dtype=np.float64
+            ).reshape(-1, 2)
+            query = parse_qs(url.query)
+            sources, destinations = (
+                np.array(
+                    [int(ix) for ix in query[key][0].split(';')],
+                    dtype=np.int64
+                )
+                if key in query
+                else np.arange(len(coordinates))
+                for key in ('sources', 'destinations')
+            )
+
+        except (ValueError, IndexError):
+            return 400, {'code': 'InvalidQuery', 'message': 'Bad query.'}
+
+        if len(coordinates) > self._max_locations:
+            return 400, {
+                'code': 'TooBig',
+                'message': 'Too many table coordinates'
+            }
+
+        stops = [
+            Stop(depot_id=str(ix), location=Location(lat=lat, lng=lng))
+            for ix, (lng, lat) in enumerate(coordinates.tolist())
+        ]
+        durations = self._estimator.estimate_paths(
+            stops,
+            np.repeat(sources, len(destinations)),
+            np.tile(destinations, len(sources))
+        ).reshape(len(sources), len(destinations))
+
+        return 200, {'code': 'Ok', 'durations': durations.tolist()}
+
+
+@contextmanager
+def serve_in_thread(server: TableServer) -> Iterator[TableServer]:
+    """
+    Method to run a TableServer in the event loop of a background thread,
+    so that it answers the requests of synchronous code
+    """
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    try:
+        yield server
+
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def serve(server: TableServer):
+    """Method to run a TableServer until it is cancelled"""
+
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+
+    finally:
+        await server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Stand in for an OSRM-style table service.'
+    )
+    parser.add_argument(
+        '--host',
+        type=str,
+        help='Host of the server. Default is 127.0.0.1',
+        default='127.0.0.1'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Port of the server. Default is 5000',
+        default=5000
+    )
+    parser.add_argument(
+        '--max-locations',
+        type=int,
+        help='Maximum coordinates of a request. Default is 100',
+        default=100
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        help='Seconds every response waits. Default is 0',
+        default=0
+    )
+    args = parser.parse_args()
+
+    configure_logs()
+    asyncio.run(serve(TableServer(
+        host=args.host,
+        port=args.port,
+        max_locations=args.max_locations,
+        latency=args.latency
+    )))
@@ -4,7 +4,26 @@ VERSION = '0.0.0'
 
 # Files
 RIDERS_FILE = '{input_dir}/riders.json'
+RIDERS_FILES = [
+    RIDERS_FILE,
+    '{input_dir}/riders.json.gz',
+    '{input_dir}/riders.ndjson',
+    '{input_dir}/riders.ndjson.gz',
+    '{input_dir}/riders.csv',
+    '{input_dir}/riders.csv.gz'
+]
 VEHICLES_FILE = '{input_dir}/vehicles.json'
 DEPOTS_FILE = '{input_dir}/depots.json'
 PARAMS_FILE = '{input_dir}/params.json'
+ESTIMATIONS_FILE = '{input_dir}/estimations.npy'
+STOPS_FILE = '{input_dir}/stops.json'
+ROAD_NODES_FILE = '{input_dir}/road_nodes.csv'
+ROAD_EDGES_FILE = '{input_dir}/road_edges.csv'
+ROAD_HIERARCHY_FILE = '{input_dir}/road_hierarchy.npz'
 ROUTES_FILE = '{output_dir}/routes.json'
+ROUTES_NDJSON_FILE = '{output_dir}/routes.ndjson'
+ROUTES_NPZ_FILE = '{output_dir}/routes.npz'
+PROFILE_FILE = '{output_dir}/profile.json'
+PROFILE_STATS_FILE = '{output_dir}/profile.prof'
+PROFILE_STACKS_FILE = '{output_dir}/profile.collapsed'
+TELEMETRY_FILE = '{output_dir}/telemetry.json'
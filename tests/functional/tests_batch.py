@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from batch import build_jobs, run_batch
+from settings import ROUTES_FILE
+
+
+class TestsBatch(unittest.TestCase):
+    """Tests for the batch execution of the Router"""
+
+    def test_run_batch(self):
+        """Asserts every job is run and summarized, even if it fails"""
+
+        with tempfile.TemporaryDirectory() as batch_dir:
+            for school in ('school_a', 'school_b'):
+                shutil.copytree('./input', os.path.join(batch_dir, school))
+            os.mkdir(os.path.join(batch_dir, 'school_c'))
+            output_dir = os.path.join(batch_dir, 'output')
+            jobs = build_jobs(
+                input_glob=os.path.join(batch_dir, 'school_*'),
+                output_dir=output_dir
+            )
+            self.assertEqual(
+                jobs[0],
+                (
+                    os.path.join(batch_dir, 'school_a'),
+                    os.path.join(output_dir, 'school_a')
+                ),
+                msg='Output dir of a globbed job is incorrect.'
+            )
+
+            summary = run_batch(jobs, max_workers=2, time_limit=1)
+            self.assertEqual(
+                [result['status'] for result in summary['jobs']],
+                ['success', 'success', 'failed'],
+                msg='Status of the jobs is incorrect.'
+            )
+            self.assertIn(
+                'FileNotFoundError', summary['jobs'][2]['error'],
+                msg='Error of the failed job is not reported.'
+            )
+            self.assertEqual(
+                summary['num_failed'], 1,
+                msg='Number of failed jobs is incorrect.'
+            )
+            with open(ROUTES_FILE.format(output_dir=jobs[1][1])) as f:
+                self.assertTrue(json.load(f), msg='Routes were not written.')
+            json.dumps(summary)
+
+    def test_build_jobs_repeated_output(self):
+        """Asserts jobs that share an output dir are rejected"""
+
+        with tempfile.TemporaryDirectory() as batch_dir:
+            jobs_file = os.path.join(batch_dir, 'jobs.json')
+            with open(jobs_file, 'w') as f:
+                json.dump(
+                    [
+                        {'input_dir': './input', 'output_dir': './output'},
+                        {'input_dir': './input', 'output_dir': './output'}
+                    ],
+                    f
+                )
+            with self.assertRaises(ValueError):
+                build_jobs(jobs_file=jobs_file)
+
+    def test_run_batch_no_jobs(self):
+        """Asserts a glob that matches no input dirs is rejected"""
+
+        with tempfile.TemporaryDirectory() as batch_dir:
+            jobs = build_jobs(input_glob=os.path.join(batch_dir, 'school_*'))
+            self.assertEqual(jobs, [], msg='Jobs of an empty glob exist.')
+            with self.assertRaises(ValueError):
+                run_batch(jobs)
@@ -0,0 +1,149 @@
+import unittest
+from dataclasses import replace
+
+from constraints.capacity_constraint import CapacityConstraint
+from constraints.max_ride_duration_constraint import \
+    MaxRideDurationConstraint
+from constraints.max_stops_constraint import MaxStopsConstraint
+from estimators.linear_estimator import LinearEstimator
+from models.depot import Depot
+from models.rider import Rider
+from models.vehicle import Vehicle
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from problem.problem_builder import ProblemBuilder
+from tests.data.test_depots import test_depots
+from tests.data.test_riders import test_riders
+from tests.data.test_vehicles import test_vehicles
+from tests.test_utils import parse_models, get_params
+
+
+class TestsConstraints(unittest.TestCase):
+    """Tests for the Dimension Constraints"""
+
+    riders = parse_models(model_dicts=test_riders, cls=Rider)
+    vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+    depots = parse_models(model_dicts=test_depots, cls=Depot)
+    problem = ProblemBuilder(
+        params=get_params(),
+        estimator=LinearEstimator()
+    ).build(riders, vehicles, depots)
+
+    def test_capacity_constraint(self):
+        """Asserts the demands and capacities of the Capacity Constraint"""
+
+        constraint = CapacityConstraint()
+        self.assertEqual(
+            constraint.demands(self.problem).tolist(),
+            [stop.demand for stop in self.problem.stops],
+            msg='Demands differ to the Riders at each Stop.'
+        )
+        self.assertEqual(
+            constraint.capacities(self.problem),
+            [vehicle.capacity for vehicle in self.vehicles.values()],
+            msg='Capacities differ to those of the Vehicles.'
+        )
+        self.assertIsNone(
+            constraint.transits(self.problem),
+            msg='Capacity Constraint declares transits.'
+        )
+
+    def test_max_stops_constraint(self):
+        """Asserts no route visits more than the maximum number of Stops"""
+
+        max_stops = 3
+        model = OptimizationModelBuilder(
+            constraints=[
+                CapacityConstraint(),
+                MaxStopsConstraint(max_stops=max_stops)
+            ]
+        ).build(self.problem)
+        self.assertTrue(
+            model.solver.HasDimension('max_stops_constraint'),
+            msg='Max stops constraint not added.'
+        )
+        solution = model.solve()
+        for route in solution:
+            rider_stops = [
+                stop_ix
+                for stop_ix in route
+                if not self.problem.stops[stop_ix].depot_id
+            ]
+            self.assertLessEqual(
+                len(rider_stops), max_stops,
+                msg='Route visits more than the maximum number of Stops.'
+            )
+
+    def test_max_ride_duration_constraint(self):
+        """Asserts every Stop is served within the maximum ride duration"""
+
+        max_ride_duration = 3600
+        model = OptimizationModelBuilder(
+            constraints=[
+                CapacityConstraint(),
+                MaxRideDurationConstraint(max_ride_duration=max_ride_duration)
+            ]
+        ).build(self.problem)
+        dimension = model.solver.GetDimensionOrDie(
+            'max_ride_duration_constraint'
+        )
+        for stop_ix, stop in enumerate(self.problem.stops):
+            if not stop.depot_id:
+                self.assertEqual(
+                    dimension.CumulVar(
+                        model.manager.NodeToIndex(stop_ix)
+                    ).Max(),
+                    max_ride_duration,
+                    msg='Ride duration of a Stop is not restricted.'
+                )
+
+        times = self.problem.build_time_matrix()
+        solution = model.solve()
+        for route in solution:
+            ride_duration = 0
+            for origin, destination in zip(route, route[1:]):
+                ride_duration += times[origin, destination]
+                if not self.problem.stops[destination].depot_id:
+                    self.assertLessEqual(
+                        ride_duration, max_ride_duration,
+                        msg='Stop served after the maximum ride duration.'
+                    )
+
+    def test_max_ride_duration_constraint_sparse(self):
+        """
+        Asserts the ride duration of sparse estimations is registered from
+        the estimated paths, without building the dense time matrix
+        """
+
+        max_ride_duration = 3600
+        problem = ProblemBuilder(
+            params=replace(get_params(), SPARSE_NEIGHBOURS=3),
+            estimator=LinearEstimator()
+        ).build(self.riders, self.vehicles, self.depots)
+        with self.assertRaises(
+                ValueError,
+                msg='Sparse estimations were made dense.'
+        ):
+            problem.build_time_matrix()
+
+        model = OptimizationModelBuilder(
+            constraints=[
+                CapacityConstraint(),
+                MaxRideDurationConstraint(max_ride_duration=max_ride_duration)
+            ]
+        ).build(problem)
+        self.assertTrue(
+            model.solver.HasDimension('max_ride_duration_constraint'),
+            msg='Max ride duration constraint not added.'
+        )
+        rows = problem.build_time_rows()
+        solution = model.solve()
+        for route in solution:
+            ride_duration = 0
+            for origin, destination in zip(route, route[1:]):
+                ride_duration += rows[origin][destination]
+                if not problem.stops[destination].depot_id:
+                    self.assertLessEqual(
+                        ride_duration, max_ride_duration,
+                        msg='Stop served after the maximum ride duration.'
+                    )
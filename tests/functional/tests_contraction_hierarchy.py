@@ -0,0 +1,117 @@
+import heapq
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from models.contraction_hierarchy import ContractionHierarchy
+
+
+def _dijkstra(num_nodes, sources, targets, weights, start):
+    """Method to obtain the shortest times from a node with Dijkstra"""
+
+    edges = [[] for _ in range(num_nodes)]
+    for source, target, weight in zip(sources, targets, weights):
+        edges[source].append((target, weight))
+
+    times = np.full(num_nodes, np.inf)
+    times[start] = 0
+    queue = [(0, start)]
+    while queue:
+        time, node = heapq.heappop(queue)
+        if time > times[node]:
+            continue
+
+        for target, weight in edges[node]:
+            if time + weight < times[target]:
+                times[target] = time + weight
+                heapq.heappush(queue, (time + weight, target))
+
+    return times
+
+
+class TestsContractionHierarchy(unittest.TestCase):
+    """Tests for the ContractionHierarchy class"""
+
+    # A 12 x 12 grid of two-way streets, some of them one-way or closed,
+    # and an isolated node
+    side = 12
+    random = np.random.default_rng(0)
+    grid = np.arange(side * side).reshape(side, side)
+    sources = np.concatenate((
+        grid[:, :-1].ravel(), grid[:, 1:].ravel(),
+        grid[:-1, :].ravel(), grid[1:, :].ravel()
+    ))
+    targets = np.concatenate((
+        grid[:, 1:].ravel(), grid[:, :-1].ravel(),
+        grid[1:, :].ravel(), grid[:-1, :].ravel()
+    ))
+    kept = random.random(len(sources)) > 0.15
+    sources, targets = sources[kept], targets[kept]
+    weights = random.uniform(10, 60, len(sources))
+    num_nodes = side * side + 1
+    lats = 4.6 + np.append(grid.ravel() // side, 0) * 0.002
+    lngs = -74.1 + np.append(grid.ravel() % side, -1) * 0.002
+
+    def _build(self) -> ContractionHierarchy:
+        """Method to contract the grid"""
+
+        return ContractionHierarchy.build(
+            self.lats,
+            self.lngs,
+            self.sources,
+            self.targets,
+            self.weights,
+            checksum='grid'
+        )
+
+    def test_many_to_many(self):
+        """Asserts the queries match the shortest times of Dijkstra"""
+
+        hierarchy = self._build()
+        self.assertEqual(
+            sorted(hierarchy.ranks.tolist()), list(range(self.num_nodes)),
+            msg='Every node must have a distinct rank.'
+        )
+        nodes = np.array([0, 5, 77, 143, 144, 30])
+        matrix = hierarchy.many_to_many(nodes, nodes[::-1])
+        expected = np.array([
+            _dijkstra(
+                self.num_nodes,
+                self.sources.tolist(),
+                self.targets.tolist(),
+                self.weights.tolist(),
+                node
+            )[nodes[::-1]]
+            for node in nodes.tolist()
+        ])
+        np.testing.assert_allclose(
+            matrix, expected,
+            err_msg='Shortest times differ from those of Dijkstra.'
+        )
+        self.assertTrue(
+            np.isinf(matrix[4, :]).sum() == 5,
+            msg='The isolated node should reach no other node.'
+        )
+        np.testing.assert_allclose(
+            hierarchy.paths(nodes, nodes[::-1]), np.diag(matrix),
+            err_msg='Times of the paths differ from the many-to-many.'
+        )
+
+    def test_save_load(self):
+        """Asserts a saved hierarchy is loaded with the same queries"""
+
+        hierarchy = self._build()
+        nodes = np.arange(0, self.num_nodes, 7)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            hierarchy_file = os.path.join(tmp_dir, 'hierarchy.npz')
+            hierarchy.save(hierarchy_file)
+            loaded = ContractionHierarchy.load(hierarchy_file)
+
+        self.assertEqual(loaded.checksum, 'grid', msg='Checksum is lost.')
+        np.testing.assert_array_equal(
+            loaded.many_to_many(nodes, nodes),
+            hierarchy.many_to_many(nodes, nodes),
+            err_msg='Loaded hierarchy answers differently.'
+        )
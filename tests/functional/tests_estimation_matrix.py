@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+
+from models.estimation_matrix import EstimationMatrix
+
+
+class TestsEstimationMatrix(unittest.TestCase):
+    """Tests for the EstimationMatrix class"""
+
+    matrix = np.array([
+        [0., 12.4, 30.6],
+        [12.4, 0., 7.5],
+        [30.6, 7.5, 0.]
+    ])
+
+    def test_dense(self):
+        """Asserts a dense matrix is indexed by (origin, destination)"""
+
+        estimations = EstimationMatrix.from_dense(self.matrix)
+        self.assertFalse(
+            estimations.condensed,
+            msg='Dense matrix is reported as condensed.'
+        )
+        self.assertEqual(len(estimations), 9, msg='Number of paths incorrect.')
+        self.assertEqual(
+            estimations[0, 2], 30.6,
+            msg='Estimation of a path is incorrect.'
+        )
+        self.assertEqual(
+            estimations[(1, 2)], 7.5,
+            msg='Estimation of a tuple-keyed path is incorrect.'
+        )
+        self.assertTrue(
+            np.shares_memory(estimations.row(1), estimations.data),
+            msg='Row of a dense matrix is not a view.'
+        )
+        np.testing.assert_array_equal(
+            estimations.column(2), self.matrix[:, 2],
+            err_msg='Column of a dense matrix is incorrect.'
+        )
+
+    def test_condensed(self):
+        """Asserts the condensed storage matches the dense matrix"""
+
+        estimations = EstimationMatrix.from_dense(self.matrix, condensed=True)
+        self.assertTrue(
+            estimations.condensed,
+            msg='Condensed matrix is reported as dense.'
+        )
+        self.assertEqual(
+            estimations.data.size, 6,
+            msg='Condensed matrix does not store only the upper triangle.'
+        )
+        self.assertEqual(
+            estimations.num_stops, 3,
+            msg='Number of stops of the condensed matrix is incorrect.'
+        )
+        for origin in range(3):
+            np.testing.assert_array_equal(
+                estimations.row(origin), self.matrix[origin],
+                err_msg='Row of a condensed matrix is incorrect.'
+            )
+            for destination in range(3):
+                self.assertEqual(
+                    estimations[origin, destination],
+                    self.matrix[origin, destination],
+                    msg='Estimation of a condensed path is incorrect.'
+                )
+        np.testing.assert_array_equal(
+            estimations.to_dense(), self.matrix,
+            err_msg='Condensed matrix is expanded incorrectly.'
+        )
+
+    def test_take(self):
+        """Asserts the estimations between some Stops are gathered"""
+
+        indices = np.array([2, 0])
+        for condensed in (False, True):
+            estimations = EstimationMatrix.from_dense(
+                self.matrix,
+                condensed=condensed
+            ).take(indices)
+            np.testing.assert_array_equal(
+                estimations.to_dense(), self.matrix[np.ix_(indices, indices)],
+                err_msg='Gathered estimations are incorrect.'
+            )
+
+    def test_integer_storage(self):
+        """Asserts integer storage rounds the estimations"""
+
+        estimations = EstimationMatrix.from_dense(self.matrix, dtype=np.int32)
+        self.assertEqual(
+            estimations.dtype, np.int32,
+            msg='Storage type is incorrect.'
+        )
+        self.assertEqual(
+            estimations[0, 2], 31,
+            msg='Integer estimation is not rounded.'
+        )
+        self.assertIsInstance(
+            estimations[0, 2], int,
+            msg='Integer estimation is not a Python int.'
+        )
+
+    def test_items(self):
+        """Asserts the estimations are iterated as (path, time) pairs"""
+
+        estimations = EstimationMatrix.from_dense(self.matrix)
+        items = dict(estimations.items())
+        self.assertEqual(len(items), 9, msg='Number of items incorrect.')
+        self.assertEqual(
+            items[(2, 0)], 30.6,
+            msg='Item of a path is incorrect.'
+        )
+
+    def test_invalid_shape(self):
+        """Asserts non-square matrices are rejected"""
+
+        with self.assertRaises(ValueError):
+            EstimationMatrix(data=np.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            EstimationMatrix(data=np.zeros(4))
@@ -1,12 +1,67 @@
+import asyncio
+import os
+import tempfile
 import unittest
 
+import numpy as np
 from haversine import haversine
 
+from estimators.cached_estimator import CachedEstimator
 from estimators.estimator import Estimator
 from estimators.linear_estimator import LinearEstimator
+from estimators.precomputed_estimator import PrecomputedEstimator
+from estimators.road_network_estimator import RoadNetworkEstimator
+from estimators.table_service_estimator import TableServiceEstimator, \
+    TableServiceError
+from models.contraction_hierarchy import ContractionHierarchy
+from models.estimation_matrix import EstimationMatrix
 from models.location import Location
+from models.rider import Rider
 from models.stop import Stop
 from models.vehicle import DEFAULT_VELOCITY
+from service.table_server import TableServer, serve_in_thread
+from utils.file_utils import write_estimations, read_estimations
+
+
+class StubServer:
+    """Server that answers every request with a fixed raw response"""
+
+    def __init__(self, response: bytes):
+        self._response = response
+        self._server = None
+
+    @property
+    def port(self) -> int:
+        """Method that returns the port the server listens on"""
+
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        """Method to start listening for requests"""
+
+        self._server = await asyncio.start_server(
+            self._handle,
+            '127.0.0.1',
+            0
+        )
+
+    async def stop(self):
+        """Method to stop listening for requests"""
+
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ):
+        """Method to answer a request with the fixed response"""
+
+        await reader.readuntil(b'\r\n\r\n')
+        writer.write(self._response)
+        await writer.drain()
+        writer.close()
 
 
 class TestsEstimators(unittest.TestCase):
@@ -63,3 +118,485 @@ class TestsEstimators(unittest.TestCase):
                     round(est), expected_estimation,
                     msg='Estimated linear time differs to distance / velocity.'
                 )
+
+    def test_linear_estimator_estimate_matrix(self):
+        """Asserts the vectorized matrix matches pairwise estimations"""
+
+        stops = [
+            Stop(depot_id='depot_1', location=Location(lat=lat, lng=lng))
+            for lat, lng in [
+                (4.720634, -74.037228),
+                (4.708958, -74.035172),
+                (4.809486, -74.070967)
+            ]
+        ]
+        matrix = LinearEstimator().estimate_matrix(stops)
+        self.assertEqual(
+            matrix.shape, (3, 3),
+            msg='Shape of the estimation matrix is incorrect.'
+        )
+        for origin_ix, origin in enumerate(stops):
+            for destination_ix, destination in enumerate(stops):
+                self.assertAlmostEqual(
+                    matrix[origin_ix, destination_ix],
+                    haversine(
+                        point1=origin.location.coordinates,
+                        point2=destination.location.coordinates
+                    ) / DEFAULT_VELOCITY,
+                    places=6,
+                    msg='Vectorized estimation differs to haversine.'
+                )
+
+    def test_linear_estimator_approximate(self):
+        """Asserts the approximate estimations are within the error bound"""
+
+        stops = [
+            Stop(depot_id='depot_1', location=Location(lat=lat, lng=lng))
+            for lat, lng in [
+                (4.720634, -74.037228),
+                (4.708958, -74.035172),
+                (4.809486, -74.070967)
+            ]
+        ]
+        exact = LinearEstimator().estimate_matrix(stops)
+        approximate = LinearEstimator(approximate=True).estimate_matrix(stops)
+        off_diagonal = ~np.eye(len(stops), dtype=bool)
+        relative_error = np.abs(
+            approximate[off_diagonal] - exact[off_diagonal]
+        ) / exact[off_diagonal]
+        self.assertTrue(
+            np.all(relative_error < 1e-4),
+            msg='Approximate estimation exceeds the documented error bound.'
+        )
+
+    def test_linear_estimator_condensed(self):
+        """Asserts condensed and compact estimations match the dense ones"""
+
+        stops = [
+            Stop(depot_id='depot_1', location=Location(lat=lat, lng=lng))
+            for lat, lng in [
+                (4.720634, -74.037228),
+                (4.708958, -74.035172),
+                (4.809486, -74.070967)
+            ]
+        ]
+        dense = LinearEstimator().estimate(stops)
+        condensed = LinearEstimator(condensed=True).estimate(stops)
+        compact = LinearEstimator(
+            dtype=np.float32,
+            condensed=True
+        ).estimate(stops)
+        self.assertTrue(
+            condensed.condensed,
+            msg='Estimations are not stored in the upper triangle.'
+        )
+        np.testing.assert_array_equal(
+            condensed.to_dense(), dense.to_dense(),
+            err_msg='Condensed estimations differ to the dense ones.'
+        )
+        self.assertLess(
+            compact.nbytes, dense.nbytes / 2,
+            msg='Compact estimations are not smaller than the dense ones.'
+        )
+        np.testing.assert_allclose(
+            compact.to_dense(), dense.to_dense(),
+            rtol=1e-6,
+            err_msg='Compact estimations differ to the dense ones.'
+        )
+
+    def test_cached_estimator(self):
+        """Asserts cached estimations match and are served from each tier"""
+
+        stops = [
+            Stop(depot_id='depot_1', location=Location(lat=lat, lng=lng))
+            for lat, lng in [
+                (4.720634, -74.037228),
+                (4.708958, -74.035172),
+                (4.809486, -74.070967)
+            ]
+        ]
+        expected = LinearEstimator().estimate(stops).to_dense()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_file = os.path.join(cache_dir, 'estimations.sqlite')
+            estimator = CachedEstimator(
+                estimator=LinearEstimator(),
+                cache_file=cache_file
+            )
+            np.testing.assert_allclose(
+                estimator.estimate(stops).to_dense(), expected,
+                err_msg='Cached estimations differ to the estimator.'
+            )
+            self.assertEqual(
+                estimator.statistics.misses, 9,
+                msg='Every path is not estimated on an empty cache.'
+            )
+
+            estimator.estimate(stops)
+            self.assertEqual(
+                estimator.statistics.memory_hits, 9,
+                msg='Paths are not served from memory.'
+            )
+            self.assertEqual(
+                estimator.statistics.misses, 9,
+                msg='Cached paths are estimated again.'
+            )
+
+            other_run = CachedEstimator(
+                estimator=LinearEstimator(),
+                cache_file=cache_file
+            )
+            np.testing.assert_allclose(
+                other_run.estimate(stops[1:]).to_dense(), expected[1:, 1:],
+                err_msg='Estimations read from disk are incorrect.'
+            )
+            self.assertEqual(
+                other_run.statistics.disk_hits, 4,
+                msg='Paths are not served from disk.'
+            )
+            self.assertEqual(
+                other_run.statistics.misses, 0,
+                msg='Paths on disk are estimated again.'
+            )
+
+    def test_cached_estimator_eviction(self):
+        """Asserts the in-memory tier is bounded"""
+
+        stops = [
+            Stop(depot_id='depot_1', location=Location(lat=lat, lng=lng))
+            for lat, lng in [
+                (4.720634, -74.037228),
+                (4.708958, -74.035172),
+                (4.809486, -74.070967)
+            ]
+        ]
+        estimator = CachedEstimator(
+            estimator=LinearEstimator(),
+            memory_size=4
+        )
+        estimator.estimate(stops)
+        self.assertEqual(
+            estimator.statistics.memory_evictions, 2,
+            msg='Least recent origins are not evicted from memory.'
+        )
+
+    def test_precomputed_estimator(self):
+        """Asserts precomputed estimations are memory-mapped and validated"""
+
+        stops = [
+            Stop(
+                depot_id='depot_1',
+                location=Location(lat=4.720634, lng=-74.037228)
+            ),
+            Stop(
+                depot_id='depot_2',
+                location=Location(lat=4.708958, lng=-74.035172)
+            ),
+            Stop(
+                riders={
+                    'rider_1': Rider(
+                        location=Location(lat=4.809486, lng=-74.070967),
+                        rider_id='rider_1'
+                    )
+                }
+            )
+        ]
+        matrix = LinearEstimator().estimate_matrix(stops)
+        with tempfile.TemporaryDirectory() as input_dir:
+            write_estimations(input_dir, stops, matrix)
+            estimator = PrecomputedEstimator(*read_estimations(input_dir))
+
+            estimations = estimator.estimate(stops)
+            self.assertIsInstance(
+                estimations.data, np.memmap,
+                msg='Estimations in the manifest order are not memory-mapped.'
+            )
+            np.testing.assert_array_equal(
+                estimations.to_dense(), matrix,
+                err_msg='Precomputed estimations differ to the matrix.'
+            )
+
+            reordered = estimator.estimate([stops[2], stops[0]])
+            np.testing.assert_array_equal(
+                reordered.to_dense(), matrix[np.ix_([2, 0], [2, 0])],
+                err_msg='Estimations of reordered stops are incorrect.'
+            )
+
+            with self.assertRaises(ValueError):
+                estimator.estimate([
+                    Stop(depot_id='depot_3', location=Location(lat=0, lng=0))
+                ])
+
+    def test_precomputed_estimator_condensed(self):
+        """Asserts condensed precomputed estimations are gathered correctly"""
+
+        matrix = np.array([
+            [0., 1., 2.],
+            [1., 0., 3.],
+            [2., 3., 0.]
+        ])
+        stops_dicts = [{'depot_id': f'depot_{ix}'} for ix in range(3)]
+        estimator = PrecomputedEstimator(
+            EstimationMatrix.from_dense(matrix, condensed=True).data,
+            stops_dicts
+        )
+        stops = [
+            Stop(depot_id=f'depot_{ix}', location=Location(lat=0, lng=0))
+            for ix in (2, 1)
+        ]
+        np.testing.assert_array_equal(
+            estimator.estimate(stops).to_dense(),
+            matrix[np.ix_([2, 1], [2, 1])],
+            err_msg='Estimations gathered from the upper triangle incorrect.'
+        )
+        with self.assertRaises(ValueError):
+            PrecomputedEstimator(matrix, stops_dicts[:2])
+
+    def test_estimate_sparse(self):
+        """
+        Asserts sparse estimations hold the paths to the nearest neighbours
+        and from and to the depots, with the times of the dense matrix
+        """
+
+        random = np.random.default_rng(0)
+        stops = [
+            Stop(depot_id='depot_1', location=Location(lat=4.7, lng=-74.1))
+        ] + [
+            Stop(
+                riders={
+                    f'rider_{ix}': Rider(
+                        location=Location(lat=lat, lng=lng),
+                        rider_id=f'rider_{ix}'
+                    )
+                }
+            )
+            for ix, (lat, lng) in enumerate(zip(
+                random.uniform(4.6, 4.8, 30).tolist(),
+                random.uniform(-74.2, -74., 30).tolist()
+            ))
+        ]
+        matrix = LinearEstimator().estimate_matrix(stops)
+        with tempfile.TemporaryDirectory() as input_dir:
+            write_estimations(input_dir, stops, matrix)
+            estimators = [
+                LinearEstimator(),
+                CachedEstimator(estimator=LinearEstimator()),
+                PrecomputedEstimator(*read_estimations(input_dir))
+            ]
+            for estimator in estimators:
+                estimations = estimator.estimate_sparse(stops, neighbours=4)
+                for stop_ix in range(1, len(stops)):
+                    neighbours = set(estimations.neighbours(stop_ix).tolist())
+                    nearest = np.argsort(matrix[stop_ix])[1:5]
+                    self.assertTrue(
+                        {0, *nearest.tolist()} <= neighbours,
+                        msg='Paths to the nearest stops or depot missing.'
+                    )
+                    self.assertIn(
+                        stop_ix, estimations.neighbours(0),
+                        msg='Path from the depot missing.'
+                    )
+                for (origin, destination), time in estimations.items():
+                    self.assertAlmostEqual(
+                        time, matrix[origin, destination],
+                        msg='Sparse estimation differs to the matrix.'
+                    )
+                self.assertLess(
+                    len(estimations), matrix.size,
+                    msg='Sparse estimations are not sparse.'
+                )
+
+    def test_road_network_estimator(self):
+        """
+        Asserts road estimations follow the shortest roads between the
+        nodes of the stops, and the linear time where there is no road
+        """
+
+        # Three nodes on a two-way road, a one-way shortcut from the last to
+        # the first one, and an isolated node
+        hierarchy = ContractionHierarchy.build(
+            lats=np.array([4.70, 4.71, 4.72, 4.80]),
+            lngs=np.array([-74.10, -74.10, -74.10, -74.00]),
+            sources=np.array([0, 1, 1, 2, 2]),
+            targets=np.array([1, 0, 2, 1, 0]),
+            weights=np.array([100., 100., 100., 100., 50.])
+        )
+        stops = [
+            Stop(depot_id='depot_1', location=Location(lat=4.70, lng=-74.10))
+        ] + [
+            Stop(
+                riders={
+                    f'rider_{ix}': Rider(
+                        location=Location(lat=lat, lng=lng),
+                        rider_id=f'rider_{ix}'
+                    )
+                }
+            )
+            for ix, (lat, lng) in enumerate([
+                (4.71, -74.10),
+                (4.72, -74.10),
+                (4.80, -74.00)
+            ])
+        ]
+        estimator = RoadNetworkEstimator(hierarchy)
+        matrix = estimator.estimate(stops).to_dense()
+        linear = LinearEstimator().estimate_matrix(stops)
+        np.testing.assert_allclose(
+            matrix[:3, :3],
+            [[0, 100, 200], [100, 0, 100], [50, 100, 0]],
+            atol=1e-6,
+            err_msg='Road estimations are not the shortest road times.'
+        )
+        np.testing.assert_allclose(
+            matrix[3], linear[3],
+            err_msg='Stops without roads do not take the linear time.'
+        )
+        origins = np.array([0, 2, 3, 1, 2])
+        destinations = np.array([2, 0, 1, 1, 1])
+        np.testing.assert_allclose(
+            estimator.estimate_paths(stops, origins, destinations),
+            matrix[origins, destinations],
+            err_msg='Road times of the paths differ from the matrix.'
+        )
+        self.assertNotEqual(
+            estimator.identity,
+            RoadNetworkEstimator(
+                ContractionHierarchy.build(
+                    hierarchy.lats,
+                    hierarchy.lngs,
+                    np.array([0]),
+                    np.array([1]),
+                    np.array([1.]),
+                    checksum='other'
+                )
+            ).identity,
+            msg='Estimators of different road graphs share an identity.'
+        )
+
+    def test_table_service_estimator(self):
+        """
+        Asserts the tiles requested from a table service are stitched into
+        the linear times the stand-in server answers, within its limit of
+        locations, over a bounded pool of connections, and that failed
+        requests are retried
+        """
+
+        rng = np.random.default_rng(0)
+        stops = [
+            Stop(
+                depot_id=f'depot_{ix}',
+                location=Location(lat=round(lat, 6), lng=round(lng, 6))
+            )
+            for ix, (lat, lng) in enumerate(zip(
+                rng.uniform(4.6, 4.8, 13).tolist(),
+                rng.uniform(-74.2, -74.0, 13).tolist()
+            ))
+        ]
+        linear = LinearEstimator().estimate_matrix(stops)
+        with serve_in_thread(
+                TableServer(port=0, max_locations=6, failures=2)
+        ) as server:
+            estimator = TableServiceEstimator(
+                f'http://127.0.0.1:{server.port}',
+                max_locations=6,
+                max_concurrency=2,
+                backoff=0.01
+            )
+            matrix = estimator.estimate(stops).to_dense()
+            np.testing.assert_allclose(
+                matrix, linear,
+                err_msg='Stitched tiles differ from the service times.'
+            )
+            statistics = estimator.statistics.to_dict()
+            self.assertEqual(
+                (statistics['tiles'], statistics['retries']), (25, 2),
+                msg='Tiles or retries of the matrix are incorrect.'
+            )
+            self.assertEqual(
+                statistics['requests'], server.requests,
+                msg='Requests are not counted.'
+            )
+            self.assertLessEqual(
+                statistics['connections'], 2,
+                msg='Connections exceed the concurrency.'
+            )
+            self.assertTrue(
+                statistics['bytes_sent'] and statistics['bytes_received'],
+                msg='Bytes of the requests are not counted.'
+            )
+            self.assertIsNotNone(
+                statistics['latency_p99'],
+                msg='Latency percentiles are not reported.'
+            )
+
+            origins = rng.integers(0, len(stops), 40)
+            destinations = rng.integers(0, len(stops), 40)
+            np.testing.assert_allclose(
+                estimator.estimate_paths(stops, origins, destinations),
+                linear[origins, destinations],
+                err_msg='Times of the paths differ from the matrix.'
+            )
+
+        with serve_in_thread(
+                TableServer(port=0, max_locations=6, failures=100)
+        ) as server:
+            estimator = TableServiceEstimator(
+                f'http://127.0.0.1:{server.port}',
+                max_locations=6,
+                max_retries=1,
+                backoff=0.01
+            )
+            with self.assertRaises(
+                    TableServiceError,
+                    msg='Unavailable service did not fail the estimation.'
+            ):
+                estimator.estimate_matrix(stops)
+
+        with serve_in_thread(TableServer(port=0, max_locations=4)) as server:
+            estimator = TableServiceEstimator(
+                f'http://127.0.0.1:{server.port}',
+                max_locations=6
+            )
+            with self.assertRaises(
+                    TableServiceError,
+                    msg='Tiles over the limit of the service did not fail.'
+            ):
+                estimator.estimate_matrix(stops)
+
+    def test_table_service_estimator_errors(self):
+        """
+        Asserts error pages, invalid tables and unsupported responses of a
+        table service fail with a TableServiceError
+        """
+
+        stops = [
+            Stop(depot_id='depot_0', location=Location(lat=4.6, lng=-74.1)),
+            Stop(depot_id='depot_1', location=Location(lat=4.7, lng=-74.0))
+        ]
+        html = b'<html>Not Found</html>'
+        responses = {
+            'error page': (
+                b'HTTP/1.1 404 Not Found\r\n'
+                b'Content-Type: text/html\r\n'
+                b'Content-Length: %d\r\n\r\n%s' % (len(html), html)
+            ),
+            'invalid table': (
+                b'HTTP/1.1 200 OK\r\n'
+                b'Content-Type: text/html\r\n'
+                b'Content-Length: %d\r\n\r\n%s' % (len(html), html)
+            ),
+            'chunked response': (
+                b'HTTP/1.1 200 OK\r\n'
+                b'Transfer-Encoding: chunked\r\n\r\n0\r\n\r\n'
+            )
+        }
+        for name, response in responses.items():
+            with serve_in_thread(StubServer(response)) as server:
+                estimator = TableServiceEstimator(
+                    f'http://127.0.0.1:{server.port}',
+                    max_retries=0
+                )
+                with self.assertRaises(
+                        TableServiceError,
+                        msg=f'The {name} did not fail the estimation.'
+                ):
+                    estimator.estimate_matrix(stops)
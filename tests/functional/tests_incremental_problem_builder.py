@@ -0,0 +1,184 @@
+import unittest
+
+import numpy as np
+
+from estimators.linear_estimator import LinearEstimator
+from models.depot import Depot
+from models.location import Location
+from models.params import Params
+from models.rider import Rider
+from models.vehicle import Vehicle
+from problem.incremental_problem_builder import IncrementalProblemBuilder, \
+    RiderDelta
+from problem.problem_builder import ProblemBuilder
+from tests.data.test_depots import test_depots
+from tests.data.test_riders import test_riders
+from tests.data.test_vehicles import test_vehicles
+from tests.test_utils import parse_models, get_params
+
+
+class TestsIncrementalProblemBuilder(unittest.TestCase):
+    """Tests for the Incremental Problem Builder class"""
+
+    riders = parse_models(model_dicts=test_riders, cls=Rider)
+    vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+    depots = parse_models(model_dicts=test_depots, cls=Depot)
+
+    def _assert_same_problem(self, problem, expected):
+        """Asserts two Problems have the same Stops and estimations"""
+
+        def _keys(stops):
+            return [
+                stop.depot_id or tuple(sorted(stop.riders))
+                for stop in stops
+            ]
+
+        keys, expected_keys = _keys(problem.stops), _keys(expected.stops)
+        self.assertCountEqual(
+            keys, expected_keys,
+            msg='Stops differ from those of a complete build.'
+        )
+        order = [expected_keys.index(key) for key in keys]
+        np.testing.assert_allclose(
+            problem.estimations.to_dense(),
+            expected.estimations.to_dense()[np.ix_(order, order)],
+            err_msg='Estimations differ from those of a complete build.'
+        )
+        self.assertEqual(
+            set(problem.riders), set(expected.riders),
+            msg='Riders differ from those of a complete build.'
+        )
+
+    def test_update(self):
+        """Asserts an updated Problem equals a complete build"""
+
+        params = get_params()
+        estimator = LinearEstimator()
+        problem = ProblemBuilder(params=params, estimator=estimator).build(
+            self.riders, self.vehicles, self.depots
+        )
+        moved = Rider(
+            location=Location(lat=4.701, lng=-74.041),
+            rider_id='cedritos_1'
+        )
+        added = Rider(
+            location=Location(lat=4.699, lng=-74.052),
+            rider_id='new_rider'
+        )
+        removed = [
+            rider_id
+            for rider_id in self.riders
+            if rider_id.startswith('recodo')
+        ]
+        delta = RiderDelta(
+            added={added.rider_id: added},
+            removed=removed,
+            moved={moved.rider_id: moved}
+        )
+        updated = IncrementalProblemBuilder(
+            params=params,
+            estimator=estimator
+        ).update(problem, delta)
+
+        riders = {
+            rider_id: rider
+            for rider_id, rider in self.riders.items()
+            if rider_id not in removed
+        }
+        riders.update(delta.moved)
+        riders.update(delta.added)
+        expected = ProblemBuilder(params=params, estimator=estimator).build(
+            riders, self.vehicles, self.depots
+        )
+        self._assert_same_problem(updated, expected)
+
+        unchanged = [
+            stop_ix
+            for stop_ix, stop in enumerate(problem.stops)
+            if stop.depot_id or not (
+                set(stop.riders) & (set(removed) | {'cedritos_1'})
+            )
+        ]
+        for stop_ix in unchanged:
+            if stop_ix < len(updated.stops):
+                self.assertIs(
+                    updated.stops[stop_ix], problem.stops[stop_ix],
+                    msg='Unchanged stop did not keep its index.'
+                )
+
+    def test_update_compacts_stops(self):
+        """Asserts removing Stops keeps the indices contiguous"""
+
+        params = get_params()
+        estimator = LinearEstimator(condensed=True)
+        problem = ProblemBuilder(params=params, estimator=estimator).build(
+            self.riders, self.vehicles, self.depots
+        )
+        removed = list(problem.stops[len(self.depots)].riders)
+        updated = IncrementalProblemBuilder(
+            params=params,
+            estimator=estimator
+        ).update(problem, RiderDelta(removed=removed))
+        self.assertEqual(
+            len(updated.stops), len(problem.stops) - 1,
+            msg='Emptied stop was not removed.'
+        )
+        self.assertIs(
+            updated.stops[len(self.depots)], problem.stops[-1],
+            msg='Last stop was not moved into the emptied slot.'
+        )
+        self.assertTrue(
+            updated.estimations.condensed,
+            msg='Storage of the estimations changed.'
+        )
+        riders = {
+            rider_id: rider
+            for rider_id, rider in self.riders.items()
+            if rider_id not in removed
+        }
+        expected = ProblemBuilder(params=params, estimator=estimator).build(
+            riders, self.vehicles, self.depots
+        )
+        self._assert_same_problem(updated, expected)
+
+    def test_update_unknown_rider(self):
+        """Asserts a delta with unknown Riders is rejected"""
+
+        params = get_params()
+        estimator = LinearEstimator()
+        problem = ProblemBuilder(params=params, estimator=estimator).build(
+            self.riders, self.vehicles, self.depots
+        )
+        with self.assertRaises(ValueError):
+            IncrementalProblemBuilder(
+                params=params,
+                estimator=estimator
+            ).update(problem, RiderDelta(removed=['unknown']))
+
+    def test_update_clustered_problem(self):
+        """Asserts a Problem with clustered Stops is rejected"""
+
+        params = Params(STOP_GROUPING='CLUSTER')
+        estimator = LinearEstimator()
+        problem = ProblemBuilder(params=params, estimator=estimator).build(
+            self.riders, self.vehicles, self.depots
+        )
+        with self.assertRaises(ValueError):
+            IncrementalProblemBuilder(
+                params=params,
+                estimator=estimator
+            ).update(problem, RiderDelta(removed=['cedritos_1']))
+
+    def test_update_sparse_problem(self):
+        """Asserts a Problem with sparse estimations is rejected"""
+
+        params = Params(SPARSE_NEIGHBOURS=3)
+        estimator = LinearEstimator()
+        problem = ProblemBuilder(params=params, estimator=estimator).build(
+            self.riders, self.vehicles, self.depots
+        )
+        with self.assertRaises(ValueError):
+            IncrementalProblemBuilder(
+                params=params,
+                estimator=estimator
+            ).update(problem, RiderDelta(removed=['cedritos_1']))
@@ -55,3 +55,23 @@ class TestsLocation(unittest.TestCase):
             'd2g6g6yw',
             msg='Geohash of precision 8 is extracted incorrectly.'
         )
+
+    def test_lazy_geohash(self):
+        """Assert the geohash is only encoded when it is read"""
+
+        location = Location(
+            lat=4.718400,
+            lng=-74.027692
+        )
+        self.assertEqual(
+            location._geohash, '',
+            msg='The geohash is encoded before it is read.'
+        )
+        self.assertEqual(
+            location.extract_geohash(6), 'd2g6g6',
+            msg='The lazy geohash is encoded incorrectly.'
+        )
+        self.assertEqual(
+            location, Location(lat=4.718400, lng=-74.027692),
+            msg='The encoded geohash changes the Location equality.'
+        )
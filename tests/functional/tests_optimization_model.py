@@ -1,7 +1,10 @@
 import unittest
+from dataclasses import replace
 
+from optimization_model.optimization_model import NoSolutionError
 from optimization_model.optimization_model_builder import \
     OptimizationModelBuilder
+from optimization_model.plateau_stop import PlateauStop
 from problem.problem_builder import ProblemBuilder
 from constraints.capacity_constraint import CapacityConstraint
 from estimators.linear_estimator import LinearEstimator
@@ -44,3 +47,172 @@ class TestsOptimizationModel(unittest.TestCase):
                 stop_ix, stops_in_solution,
                 msg=f'Stop {stop_ix} not in solution.'
             )
+
+    def test_solve_no_solution(self):
+        """Asserts an infeasible Optimization Model raises an error"""
+
+        riders = parse_models(model_dicts=test_riders, cls=Rider)
+        vehicles = parse_models(
+            model_dicts=[
+                {**vehicle, 'capacity': 1} for vehicle in test_vehicles
+            ],
+            cls=Vehicle
+        )
+        depots = parse_models(model_dicts=test_depots, cls=Depot)
+        problem = ProblemBuilder(
+            params=get_params(),
+            estimator=LinearEstimator()
+        ).build(riders, vehicles, depots)
+        model = OptimizationModelBuilder(
+            constraints=[CapacityConstraint()]
+        ).build(problem)
+        with self.assertRaises(
+                NoSolutionError,
+                msg='Infeasible model returned a solution.'
+        ):
+            model.solve()
+
+    def test_solve_telemetry(self):
+        """Asserts the telemetry of the search of a Model is recorded"""
+
+        riders = parse_models(model_dicts=test_riders, cls=Rider)
+        vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+        depots = parse_models(model_dicts=test_depots, cls=Depot)
+        params = replace(get_params(), OBJECTIVE_FUNCTION='CALLBACK')
+        estimator = LinearEstimator()
+        problem_builder = ProblemBuilder(params=params, estimator=estimator)
+        model_builder = OptimizationModelBuilder(
+            constraints=[CapacityConstraint()],
+            telemetry=True
+        )
+        problem = problem_builder.build(riders, vehicles, depots)
+        model = model_builder.build(problem)
+        model.solve()
+        telemetry = model.telemetry
+
+        self.assertTrue(telemetry.solutions, msg='No solutions recorded.')
+        self.assertEqual(
+            [event.solution_count for event in telemetry.solutions],
+            list(range(1, len(telemetry.solutions) + 1)),
+            msg='Solution counts do not follow the solutions.'
+        )
+        self.assertEqual(
+            telemetry.solutions[-1].best_objective_value,
+            model.objective_value,
+            msg='Best objective differs from the objective of the model.'
+        )
+        self.assertLessEqual(
+            telemetry.time_to_best, telemetry.search_seconds,
+            msg='Best solution found after the search ended.'
+        )
+        self.assertGreater(
+            telemetry.callbacks['objective'].calls, 0,
+            msg='Calls to the objective callback not counted.'
+        )
+        self.assertEqual(
+            set(telemetry.to_dict().keys()),
+            {'status', 'search_seconds', 'stop_reason', 'time_saved',
+             'time_to_best', 'solutions', 'callbacks'},
+            msg='Telemetry dict has wrong keys.'
+        )
+
+    def test_solve_plateau_stop(self):
+        """Asserts the search of a Model stops when it plateaus"""
+
+        riders = parse_models(model_dicts=test_riders, cls=Rider)
+        vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+        depots = parse_models(model_dicts=test_depots, cls=Depot)
+        params = replace(
+            get_params(),
+            SEARCH_METAHEURISTIC='GUIDED_LOCAL_SEARCH',
+            SEARCH_TIME_LIMIT=5,
+            SEARCH_SOLUTIONS_LIMIT=10 ** 9,
+            EARLY_STOP_WINDOW=0.1
+        )
+        estimator = LinearEstimator()
+        problem_builder = ProblemBuilder(params=params, estimator=estimator)
+        model_builder = OptimizationModelBuilder(
+            constraints=[CapacityConstraint()],
+            telemetry=True
+        )
+        problem = problem_builder.build(riders, vehicles, depots)
+        model = model_builder.build(problem)
+        solution = model.solve()
+
+        self.assertEqual(
+            len(solution), len(vehicles),
+            msg='Number of routes do not match number of vehicles.'
+        )
+        self.assertEqual(
+            model.plateau_stop.reason, 'PLATEAU',
+            msg='Search did not stop at the plateau.'
+        )
+        self.assertGreater(
+            model.plateau_stop.time_saved, 0,
+            msg='No time saved from the time limit.'
+        )
+        self.assertEqual(
+            model.telemetry.stop_reason, 'PLATEAU',
+            msg='Stop reason not recorded in the telemetry.'
+        )
+
+    def test_plateau_stop_window(self):
+        """Asserts a plateau is the lack of improvement over a window"""
+
+        plateau_stop = PlateauStop(
+            window=1,
+            threshold=0.01,
+            min_time=2,
+            time_limit=10,
+            solutions_limit=1000
+        )
+        plateau_stop._improvements.extend([(0.5, 1000), (1.2, 900)])
+        self.assertFalse(
+            plateau_stop._has_plateaued(1.9),
+            msg='Search plateaued before the min time.'
+        )
+        self.assertFalse(
+            plateau_stop._has_plateaued(2.1),
+            msg='Search plateaued while improving over the window.'
+        )
+        plateau_stop._improvements.append((2.5, 895))
+        self.assertTrue(
+            plateau_stop._has_plateaued(3),
+            msg='Search did not plateau without improving over the window.'
+        )
+        self.assertEqual(
+            list(plateau_stop._improvements), [(1.2, 900), (2.5, 895)],
+            msg='Improvements before the window were not dropped.'
+        )
+
+    def test_solve_sparse(self):
+        """Asserts a sparse Model only uses the estimated arcs"""
+
+        riders = parse_models(model_dicts=test_riders, cls=Rider)
+        vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+        depots = parse_models(model_dicts=test_depots, cls=Depot)
+        params = replace(get_params(), SPARSE_NEIGHBOURS=3)
+        estimator = LinearEstimator()
+        problem_builder = ProblemBuilder(params=params, estimator=estimator)
+        model_builder = OptimizationModelBuilder(
+            constraints=[CapacityConstraint()]
+        )
+        problem = problem_builder.build(riders, vehicles, depots)
+        model = model_builder.build(problem)
+        solution = model.solve()
+
+        self.assertEqual(
+            sorted(stop for route in solution for stop in route[1:-1]),
+            [
+                stop_ix
+                for stop_ix, stop in enumerate(problem.stops)
+                if not stop.depot_id
+            ],
+            msg='Rider stops not visited once.'
+        )
+        for route in solution:
+            for origin, destination in zip(route[:-1], route[1:]):
+                self.assertIn(
+                    destination, problem.estimations.neighbours(origin),
+                    msg=f'Arc ({origin}, {destination}) was not estimated.'
+                )
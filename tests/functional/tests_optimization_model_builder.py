@@ -1,11 +1,15 @@
 import unittest
+from dataclasses import replace
 
+import numpy as np
 from google.protobuf.duration_pb2 import Duration
 from ortools.constraint_solver.pywrapcp import RoutingModel, \
     RoutingIndexManager
 
 from constraints.capacity_constraint import CapacityConstraint
 from models.depot import Depot
+from models.estimation_matrix import EstimationMatrix
+from models.params import Params
 from models.rider import Rider
 from models.stop import Stop
 from models.vehicle import Vehicle
@@ -33,12 +37,12 @@ class TestsOptimizationModelBuilder(unittest.TestCase):
         ),
         Stop(riders=riders)
     ]
-    estimations = {
-        (0, 0): 0.,
-        (0, 1): 85.,
-        (1, 0): 78.,
-        (1, 1): 0.
-    }
+    estimations = EstimationMatrix(
+        data=np.array([
+            [0., 85.],
+            [78., 0.]
+        ])
+    )
     params = get_params()
     problem = Problem(
         depots=depots,
@@ -106,6 +110,21 @@ class TestsOptimizationModelBuilder(unittest.TestCase):
             msg='Search metaheuristic is incorrect in the search params.'
         )
 
+    def test_build_search_parameters_fractional_time_limit(self):
+        """Asserts a fractional time limit is kept in the search params"""
+
+        search_parameters = OptimizationModelBuilder._build_search_parameters(
+            replace(
+                self.problem,
+                params=replace(self.params, SEARCH_TIME_LIMIT=1.5)
+            )
+        )
+        self.assertEqual(
+            search_parameters.time_limit,
+            Duration(seconds=1, nanos=500_000_000),
+            msg='Fractional time limit is incorrect in the search params.'
+        )
+
     def test_apply_constraints_capacity_constraint(self):
         """Asserts constraints are read correctly by the solver"""
 
@@ -144,6 +163,92 @@ class TestsOptimizationModelBuilder(unittest.TestCase):
         model_builder._set_objective_function(problem, manager, solver)
         self.assertTrue(solver, msg='Objective function set incorrectly.')
 
+    def test_set_objective_function_matrix(self):
+        """Asserts the cost matrix objective function is added to the solver"""
+
+        problem = Problem(
+            depots=self.depots,
+            estimations=self.estimations,
+            params=Params(OBJECTIVE_FUNCTION='MATRIX'),
+            riders=self.riders,
+            stops=self.stops,
+            vehicles=self.vehicles,
+            starts=[0, 1],
+            ends=[0, 1]
+        )
+        manager = RoutingIndexManager(
+            len(problem.stops),  # Number of locations
+            len(problem.vehicles),  # Number of vehicles
+            problem.starts,  # Start list of Vehicles
+            problem.ends  # End list of Vehicles
+        )
+        solver = RoutingModel(manager)
+        OptimizationModelBuilder._set_objective_function(
+            problem, manager, solver
+        )
+        solver.CloseModel()
+        self.assertEqual(
+            solver.GetArcCostForVehicle(
+                solver.Start(0), manager.NodeToIndex(1), 0
+            ), 85,
+            msg='Arc cost differs to the estimation matrix.'
+        )
+
+    def test_set_objective_function_rounding(self):
+        """Asserts the CALLBACK and MATRIX objectives round costs alike"""
+
+        costs = {}
+        for objective_function in ('CALLBACK', 'MATRIX'):
+            problem = replace(
+                self.problem,
+                estimations=EstimationMatrix(
+                    data=np.array([[0., 85.6], [78.4, 0.]])
+                ),
+                params=Params(OBJECTIVE_FUNCTION=objective_function)
+            )
+            manager = RoutingIndexManager(
+                len(problem.stops),  # Number of locations
+                len(problem.vehicles),  # Number of vehicles
+                problem.starts,  # Start list of Vehicles
+                problem.ends  # End list of Vehicles
+            )
+            solver = RoutingModel(manager)
+            OptimizationModelBuilder._set_objective_function(
+                problem, manager, solver
+            )
+            solver.CloseModel()
+            costs[objective_function] = [
+                solver.GetArcCostForVehicle(
+                    solver.Start(0), manager.NodeToIndex(1), 0
+                ),
+                solver.GetArcCostForVehicle(
+                    solver.Start(1), manager.NodeToIndex(0), 1
+                )
+            ]
+
+        self.assertEqual(
+            costs['CALLBACK'], costs['MATRIX'],
+            msg='Objective functions round the costs differently.'
+        )
+        self.assertEqual(
+            costs['MATRIX'], [86, 78],
+            msg='Costs are not rounded to the nearest integer.'
+        )
+
+    def test_build_time_matrix(self):
+        """Asserts the integer time matrix is scaled to the resolution"""
+
+        np.testing.assert_array_equal(
+            self.problem.build_time_matrix(),
+            np.array([[0, 85], [78, 0]]),
+            err_msg='Time matrix differs to the estimations.'
+        )
+        np.testing.assert_array_equal(
+            self.problem.build_time_matrix(resolution=5),
+            np.array([[0, 17], [16, 0]]),
+            err_msg='Time matrix is not scaled to the resolution.'
+        )
+
     def test_build(self):
         """Assert the Opt. model is built correctly"""
 
@@ -18,6 +18,18 @@ class TestsParams(unittest.TestCase):
             'SEARCH_METAHEURISTIC': 'AUTOMATIC',
             'SEARCH_TIME_LIMIT': 4,
             'SEARCH_SOLUTIONS_LIMIT': 3000,
+            'OBJECTIVE_FUNCTION': 'MATRIX',
+            'COST_RESOLUTION': 0.1,
+            'MAX_RIDE_DURATION': 3600,
+            'MAX_STOPS_PER_ROUTE': 15,
+            'PORTFOLIO_SIZE': 4,
+            'DECOMPOSITION_SECTOR_SIZE': 500,
+            'EARLY_STOP_WINDOW': 0.5,
+            'EARLY_STOP_THRESHOLD': 0.01,
+            'EARLY_STOP_MIN_TIME': 1,
+            'SPARSE_NEIGHBOURS': 20,
+            'STOP_GROUPING': 'CLUSTER',
+            'MAX_WALKING_DISTANCE': 0.5,
         }
         params = Params.from_dict(params_dict)
         self.assertTrue(
@@ -0,0 +1,164 @@
+import time
+import unittest
+from dataclasses import replace
+
+from constraints.capacity_constraint import CapacityConstraint
+from estimators.linear_estimator import LinearEstimator
+from models.depot import Depot
+from models.rider import Rider
+from models.vehicle import Vehicle
+from optimization_model.optimization_model import NoSolutionError
+from optimization_model.portfolio_optimization_model import \
+    PortfolioOptimizationModelBuilder, PortfolioConfiguration, \
+    _solve_configuration
+from problem.problem_builder import ProblemBuilder
+from tests.data.test_depots import test_depots
+from tests.data.test_riders import test_riders
+from tests.data.test_vehicles import test_vehicles
+from tests.test_utils import parse_models, get_params
+
+
+class TestsPortfolioOptimizationModel(unittest.TestCase):
+    """Tests for the Portfolio Optimization Model class"""
+
+    riders = parse_models(model_dicts=test_riders, cls=Rider)
+    vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+    depots = parse_models(model_dicts=test_depots, cls=Depot)
+    problem = ProblemBuilder(
+        params=get_params(),
+        estimator=LinearEstimator()
+    ).build(riders, vehicles, depots)
+
+    def test_build(self):
+        """Asserts the configurations start with those of the Params"""
+
+        model = PortfolioOptimizationModelBuilder(
+            constraints=[CapacityConstraint()],
+            portfolio_size=12
+        ).build(self.problem)
+        self.assertEqual(
+            len(model.configurations), 12,
+            msg='Number of configurations differs to the portfolio size.'
+        )
+        self.assertEqual(
+            model.configurations[0],
+            PortfolioConfiguration(
+                first_solution_strategy=(
+                    self.problem.params.FIRST_SOLUTION_STRATEGY
+                ),
+                search_metaheuristic=self.problem.params.SEARCH_METAHEURISTIC
+            ),
+            msg='First configuration differs to the Params.'
+        )
+        self.assertTrue(
+            any(configuration.seed for configuration in model.configurations),
+            msg='Repeated strategies are not seeded.'
+        )
+
+    def test_solve_configuration_seed(self):
+        """Asserts a seeded solution is mapped back to the Vehicles"""
+
+        objective_value, solution = _solve_configuration(
+            self.problem,
+            [CapacityConstraint()],
+            PortfolioConfiguration(
+                first_solution_strategy='PATH_CHEAPEST_ARC',
+                search_metaheuristic='GUIDED_LOCAL_SEARCH',
+                seed=3
+            )
+        )
+        self.assertIsNotNone(objective_value, msg='No solution was found.')
+        for vehicle_ix, route in enumerate(solution):
+            self.assertEqual(
+                route[0], self.problem.starts[vehicle_ix],
+                msg='Route does not start at its Vehicle start.'
+            )
+            self.assertEqual(
+                route[-1], self.problem.ends[vehicle_ix],
+                msg='Route does not end at its Vehicle end.'
+            )
+
+    def test_solve(self):
+        """Asserts the best configuration solves the Problem"""
+
+        model = PortfolioOptimizationModelBuilder(
+            constraints=[CapacityConstraint()],
+            portfolio_size=3,
+            max_workers=2
+        ).build(self.problem)
+        solution = model.solve()
+
+        self.assertEqual(
+            len(solution), len(self.vehicles),
+            msg='Number of routes do not match number of vehicles.'
+        )
+        stops_in_solution = [stop for route in solution for stop in route]
+        for stop_ix in range(len(self.problem.stops)):
+            self.assertIn(
+                stop_ix, stops_in_solution,
+                msg=f'Stop {stop_ix} not in solution.'
+            )
+        self.assertIn(
+            model.winner, model.configurations,
+            msg='Winner is not a configuration of the portfolio.'
+        )
+        self.assertEqual(
+            model.objective_value,
+            min(
+                objective_value
+                for _, objective_value in model.results
+                if objective_value is not None
+            ),
+            msg='Solution is not the best of the portfolio.'
+        )
+
+    def test_solve_time_limit(self):
+        """
+        Asserts the time limit is split between the waves of a portfolio
+        larger than its workers
+        """
+
+        model = PortfolioOptimizationModelBuilder(
+            constraints=[CapacityConstraint()],
+            portfolio_size=4,
+            max_workers=2
+        ).build(replace(
+            self.problem,
+            params=replace(
+                self.problem.params,
+                FIRST_SOLUTION_STRATEGY='PATH_CHEAPEST_ARC',
+                SEARCH_METAHEURISTIC='GUIDED_LOCAL_SEARCH',
+                SEARCH_TIME_LIMIT=2,
+                SEARCH_SOLUTIONS_LIMIT=10 ** 9
+            )
+        ))
+        start = time.perf_counter()
+        model.solve()
+        self.assertLess(
+            time.perf_counter() - start, 3.5,
+            msg='Waves of the portfolio exceed the time limit.'
+        )
+
+    def test_solve_no_solution(self):
+        """Asserts a portfolio without any solution raises an error"""
+
+        vehicles = parse_models(
+            model_dicts=[
+                {**vehicle, 'capacity': 1} for vehicle in test_vehicles
+            ],
+            cls=Vehicle
+        )
+        problem = ProblemBuilder(
+            params=get_params(),
+            estimator=LinearEstimator()
+        ).build(self.riders, vehicles, self.depots)
+        model = PortfolioOptimizationModelBuilder(
+            constraints=[CapacityConstraint()],
+            portfolio_size=2,
+            max_workers=2
+        ).build(problem)
+        with self.assertRaises(
+                NoSolutionError,
+                msg='Infeasible portfolio returned a solution.'
+        ):
+            model.solve()
@@ -1,9 +1,12 @@
 import unittest
 from statistics import mean
 
+import numpy as np
+
 from estimators.linear_estimator import LinearEstimator
 from models.depot import Depot
 from models.location import Location
+from models.params import Params
 from models.rider import Rider
 from models.vehicle import Vehicle
 from problem.problem_builder import ProblemBuilder
@@ -11,6 +14,7 @@ from tests.data.test_depots import test_depots
 from tests.data.test_riders import test_riders
 from tests.data.test_vehicles import test_vehicles
 from tests.test_utils import get_params, parse_models
+from utils.geo_utils import haversine_vector
 
 
 class TestsProblemBuilder(unittest.TestCase):
@@ -196,3 +200,110 @@ class TestsProblemBuilder(unittest.TestCase):
             len(stops), 3,
             msg='Wrong number of stops when some depots are used.'
         )
+
+    def test_build_stops_centroids(self):
+        """Asserts grouped Stops are located at the mean of their Riders"""
+
+        params = get_params()
+        builder = ProblemBuilder(params=params, estimator=LinearEstimator())
+        riders = {
+            f'rider_{ix}': Rider(
+                location=Location(lat=lat, lng=lng),
+                rider_id=f'rider_{ix}'
+            )
+            for ix, (lat, lng) in enumerate([
+                (4.718400, -74.027692),
+                (4.809486, -74.070967),
+                (4.718401, -74.027693),
+                (4.718402, -74.027691)
+            ])
+        }
+        depot = Depot(depot_id='depot_1', location=Location(lat=0, lng=0))
+        stops = builder._build_stops(
+            riders=riders,
+            depots={depot.depot_id: depot},
+            starts=[0],
+            ends=[0]
+        )
+        self.assertEqual(
+            [stop.demand for stop in stops], [0, 3, 1],
+            msg='Stops have demands that differ from their Riders.'
+        )
+        self.assertEqual(
+            list(stops[1].riders), ['rider_0', 'rider_2', 'rider_3'],
+            msg='Riders are grouped incorrectly into Stops.'
+        )
+        self.assertAlmostEqual(
+            stops[1].location.lat,
+            mean([rider.location.lat for rider in stops[1].riders.values()]),
+            places=12,
+            msg='Latitude incorrectly calculated for grouped Stop.'
+        )
+        self.assertAlmostEqual(
+            stops[1].location.lng,
+            mean([rider.location.lng for rider in stops[1].riders.values()]),
+            places=12,
+            msg='Longitude incorrectly calculated for grouped Stop.'
+        )
+
+    def test_build_stops_cluster(self):
+        """Asserts clustered Stops are within walking distance and capacity"""
+
+        params = Params(STOP_GROUPING='CLUSTER', MAX_WALKING_DISTANCE=0.3)
+        builder = ProblemBuilder(params=params, estimator=LinearEstimator())
+        riders = {
+            f'rider_{ix}': Rider(
+                location=Location(lat=lat, lng=lng),
+                rider_id=f'rider_{ix}'
+            )
+            for ix, (lat, lng) in enumerate([
+                (4.718400, -74.027692),
+                (4.809486, -74.070967),
+                (4.718401, -74.027693),
+                (4.718402, -74.027691),
+                (4.719500, -74.027000),
+                (4.719600, -74.026900)
+            ])
+        }
+        vehicles = {
+            vehicle_id: Vehicle(
+                capacity=capacity,
+                start='depot_1',
+                end='depot_1',
+                vehicle_id=vehicle_id
+            )
+            for vehicle_id, capacity in (('vehicle_1', 4), ('vehicle_2', 2))
+        }
+        depot = Depot(depot_id='depot_1', location=Location(lat=0, lng=0))
+        problem = builder.build(riders, vehicles, {depot.depot_id: depot})
+        rider_stops = problem.stops[1:]
+        self.assertEqual(
+            sorted(stop.demand for stop in rider_stops), [1, 1, 2, 2],
+            msg='Stops are not capped to the smallest vehicle capacity.'
+        )
+        self.assertCountEqual(
+            [rider_id for stop in rider_stops for rider_id in stop.riders],
+            list(riders),
+            msg='Riders are missing from the Stops.'
+        )
+        for stop in rider_stops:
+            distances = haversine_vector(
+                np.array([
+                    rider.location.lat for rider in stop.riders.values()
+                ]),
+                np.array([
+                    rider.location.lng for rider in stop.riders.values()
+                ]),
+                stop.location.lat,
+                stop.location.lng
+            )
+            self.assertLessEqual(
+                distances.max(), 0.3,
+                msg='Riders are beyond walking distance of their Stop.'
+            )
+
+        with self.assertRaises(ValueError):
+            ProblemBuilder(
+                params=Params(STOP_GROUPING='UNKNOWN'),
+                estimator=LinearEstimator()
+            ).build(riders, vehicles, {depot.depot_id: depot})
@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+
+from estimators.linear_estimator import LinearEstimator
+from models.depot import Depot
+from models.rider import Rider
+from models.vehicle import Vehicle
+from problem.problem_builder import ProblemBuilder
+from problem.problem_decomposer import ProblemDecomposer
+from tests.data.test_depots import test_depots
+from tests.data.test_riders import test_riders
+from tests.data.test_vehicles import test_vehicles
+from tests.test_utils import parse_models, get_params
+
+
+class TestsProblemDecomposer(unittest.TestCase):
+    """Tests for the Problem Decomposer class"""
+
+    riders = parse_models(model_dicts=test_riders, cls=Rider)
+    vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+    depots = parse_models(model_dicts=test_depots, cls=Depot)
+    problem = ProblemBuilder(
+        params=get_params(),
+        estimator=LinearEstimator()
+    ).build(riders, vehicles, depots)
+
+    def test_decompose(self):
+        """Asserts the sectors partition the Stops and Vehicles"""
+
+        sub_problems = ProblemDecomposer(sector_size=2).decompose(
+            self.problem
+        )
+        self.assertEqual(
+            len(sub_problems), 2,
+            msg='Number of sectors is not limited to the vehicles.'
+        )
+        rider_stops = [
+            stop_ix
+            for sub in sub_problems
+            for stop_ix in sub.stops.tolist()
+            if not self.problem.stops[stop_ix].depot_id
+        ]
+        self.assertCountEqual(
+            rider_stops,
+            [
+                stop_ix
+                for stop_ix, stop in enumerate(self.problem.stops)
+                if not stop.depot_id
+            ],
+            msg='Rider stops are missing or repeated in the sectors.'
+        )
+        self.assertCountEqual(
+            [
+                vehicle_ix
+                for sub in sub_problems
+                for vehicle_ix in sub.vehicles
+            ],
+            range(len(self.vehicles)),
+            msg='Vehicles are missing or repeated in the sectors.'
+        )
+
+        for sub in sub_problems:
+            self.assertLessEqual(
+                sum(stop.demand for stop in sub.problem.stops),
+                sum(
+                    vehicle.capacity
+                    for vehicle in sub.problem.vehicles.values()
+                ),
+                msg='Sector demand exceeds the capacity of its vehicles.'
+            )
+            for local_ix, vehicle_ix in enumerate(sub.vehicles):
+                self.assertEqual(
+                    sub.stops[sub.problem.starts[local_ix]],
+                    self.problem.starts[vehicle_ix],
+                    msg='Start of a vehicle is incorrect in the sector.'
+                )
+                self.assertEqual(
+                    sub.stops[sub.problem.ends[local_ix]],
+                    self.problem.ends[vehicle_ix],
+                    msg='End of a vehicle is incorrect in the sector.'
+                )
+            np.testing.assert_array_equal(
+                sub.problem.estimations.to_dense(),
+                self.problem.estimations.to_dense()[
+                    np.ix_(sub.stops, sub.stops)
+                ],
+                err_msg='Estimations of the sector are incorrect.'
+            )
+
+    def test_decompose_spare_capacity(self):
+        """
+        Asserts the spare capacity of the fleet is spread between the
+        sectors, so none is left with just its demand
+        """
+
+        riders = parse_models(
+            model_dicts=[
+                {
+                    'rider_id': f'rider_{ix}',
+                    'lat': 4.809486 + 0.01 * np.sin(angle),
+                    'lng': -74.070967 + 0.01 * np.cos(angle)
+                }
+                for ix, angle in enumerate(
+                    np.linspace(0, 2 * np.pi, 12, endpoint=False).tolist()
+                )
+            ],
+            cls=Rider
+        )
+        vehicles = parse_models(
+            model_dicts=[
+                {
+                    'capacity': 4,
+                    'start': 'depot_start',
+                    'end': 'depot_start',
+                    'vehicle_id': f'vehicle_{ix}'
+                }
+                for ix in range(4)
+            ],
+            cls=Vehicle
+        )
+        problem = ProblemBuilder(
+            params=get_params(),
+            estimator=LinearEstimator()
+        ).build(riders, vehicles, self.depots)
+        sub_problems = ProblemDecomposer(sector_size=4).decompose(problem)
+        self.assertEqual(
+            len(sub_problems), 3,
+            msg='Number of sectors is incorrect.'
+        )
+        for sub in sub_problems:
+            self.assertLess(
+                sum(stop.demand for stop in sub.problem.stops),
+                sum(
+                    vehicle.capacity
+                    for vehicle in sub.problem.vehicles.values()
+                ),
+                msg='Sector has no spare capacity.'
+            )
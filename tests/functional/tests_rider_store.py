@@ -0,0 +1,121 @@
+import pickle
+import unittest
+from dataclasses import replace
+
+import numpy as np
+
+from estimators.linear_estimator import LinearEstimator
+from models.depot import Depot
+from models.rider import Rider
+from models.rider_columns import RiderColumns
+from models.rider_store import RiderStore
+from models.vehicle import Vehicle
+from problem.problem_builder import ProblemBuilder
+from tests.data.test_depots import test_depots
+from tests.data.test_riders import test_riders
+from tests.data.test_vehicles import test_vehicles
+from tests.test_utils import parse_models, get_params
+
+
+class TestsRiderStore(unittest.TestCase):
+    """Tests for the RiderStore class"""
+
+    riders = parse_models(model_dicts=test_riders, cls=Rider)
+    store = RiderStore.from_columns(RiderColumns.from_records(test_riders))
+
+    def test_views(self):
+        """Asserts the store is read as the Dict of Riders"""
+
+        self.assertEqual(
+            list(self.store), list(self.riders),
+            msg='Rider ids of the store are incorrect.'
+        )
+        self.assertIn('cedritos_1', self.store, msg='Rider is missing.')
+        self.assertNotIn('unknown', self.store, msg='Unknown rider found.')
+        for rider_id, rider in self.store.items():
+            self.assertEqual(
+                rider, self.riders[rider_id],
+                msg='Rider view differs from the Rider.'
+            )
+            self.assertEqual(
+                rider.location.extract_geohash(precision=8),
+                self.riders[rider_id].location.extract_geohash(precision=8),
+                msg='Geohash of the Location view is incorrect.'
+            )
+        with self.assertRaises(AttributeError):
+            self.store['cedritos_1'].extra = 1
+
+    def test_rider_ids(self):
+        """
+        Asserts the ids of the Riders are strings whatever their type in
+        the input, and are unique
+        """
+
+        records = [
+            {'rider_id': ix, 'lat': rider['lat'], 'lng': rider['lng']}
+            for ix, rider in enumerate(test_riders)
+        ]
+        store = RiderStore.from_columns(RiderColumns.from_records(records))
+        self.assertEqual(
+            list(store), [str(ix) for ix in range(len(test_riders))],
+            msg='Rider ids are not strings.'
+        )
+        with self.assertRaises(
+                ValueError,
+                msg='Repeated rider ids were accepted.'
+        ):
+            RiderStore.from_columns(
+                RiderColumns.from_records(test_riders + test_riders[:1])
+            )
+
+    def test_build_stops(self):
+        """Asserts the Stops of a store equal those of the Riders"""
+
+        params = get_params()
+        vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+        depots = parse_models(model_dicts=test_depots, cls=Depot)
+        problem_builder = ProblemBuilder(
+            params=params,
+            estimator=LinearEstimator()
+        )
+        expected = problem_builder.build(self.riders, vehicles, depots)
+        problem = problem_builder.build(self.store, vehicles, depots)
+        cluster_builder = ProblemBuilder(
+            params=replace(params, STOP_GROUPING='CLUSTER'),
+            estimator=LinearEstimator()
+        )
+        cluster_expected = cluster_builder.build(self.riders, vehicles, depots)
+        cluster_problem = cluster_builder.build(self.store, vehicles, depots)
+        for stop, expected_stop in zip(
+                problem.stops + cluster_problem.stops,
+                expected.stops + cluster_expected.stops
+        ):
+            self.assertEqual(
+                stop.to_dict()['riders'], expected_stop.to_dict()['riders'],
+                msg='Riders of the Stop differ.'
+            )
+            self.assertEqual(
+                stop.demand, expected_stop.demand,
+                msg='Demand of the Stop differs.'
+            )
+            np.testing.assert_allclose(
+                stop.location.coordinates,
+                expected_stop.location.coordinates,
+                err_msg='Location of the Stop differs.'
+            )
+
+        rider_stop = problem.stops[-1]
+        rider_id = next(iter(rider_stop.riders))
+        self.assertEqual(
+            rider_stop.riders[rider_id], self.riders[rider_id],
+            msg='Rider of the Stop differs.'
+        )
+        with self.assertRaises(KeyError):
+            rider_stop.riders['unknown']
+
+        unpickled = pickle.loads(pickle.dumps(problem))
+        self.assertEqual(
+            [stop.to_dict() for stop in unpickled.stops],
+            [stop.to_dict() for stop in problem.stops],
+            msg='Stops differ after pickling.'
+        )
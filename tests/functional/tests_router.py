@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from constraints.capacity_constraint import CapacityConstraint
 from estimators.linear_estimator import LinearEstimator
 from models.depot import Depot
@@ -8,6 +10,7 @@ from models.vehicle import Vehicle
 from optimization_model.optimization_model_builder import \
     OptimizationModelBuilder
 from problem.problem_builder import ProblemBuilder
+from problem.problem_decomposer import ProblemDecomposer
 from router import Router
 from tests.data.test_depots import test_depots
 from tests.data.test_riders import test_riders
@@ -15,6 +18,19 @@ from tests.data.test_vehicles import test_vehicles
 from tests.test_utils import parse_models, get_params
 
 
+class SkewedProblemDecomposer(ProblemDecomposer):
+    """Problem Decomposer that cuts every rider Stop into the last sector"""
+
+    @staticmethod
+    def _cut_sectors(
+            demands: np.ndarray,
+            capacities: np.ndarray
+    ) -> np.ndarray:
+        """Every rider Stop goes to the last sector"""
+
+        return np.full(len(demands), len(capacities) - 1, dtype=np.int64)
+
+
 class TestsRouter(unittest.TestCase):
     """Tests for the Router class"""
 
@@ -68,3 +84,70 @@ class TestsRouter(unittest.TestCase):
                 len(route['stops']) > 1,
                 msg='Route with single stop.'
             )
+
+    def test_route_decomposed(self):
+        """Asserts the sectors of the Problem are routed and merged"""
+
+        params = get_params()
+        estimator = LinearEstimator()
+        problem_builder = ProblemBuilder(params=params, estimator=estimator)
+        model_builder = OptimizationModelBuilder(
+            constraints=[CapacityConstraint()]
+        )
+        router = Router(
+            problem_builder=problem_builder,
+            optimization_model_builder=model_builder,
+            problem_decomposer=ProblemDecomposer(sector_size=2),
+            max_workers=2
+        )
+        riders = parse_models(model_dicts=test_riders, cls=Rider)
+        vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+        depots = parse_models(model_dicts=test_depots, cls=Depot)
+        routes = router.route(riders, vehicles, depots)
+        self.assertTrue(routes, msg='Routes could not be built.')
+
+        routed_riders = [
+            rider_id
+            for route in routes
+            for stop in route['stops']
+            if stop['riders']
+            for rider_id in stop['riders']
+        ]
+        self.assertCountEqual(
+            routed_riders, riders.keys(),
+            msg='Riders are missing or repeated in the merged Routes.'
+        )
+
+    def test_route_decomposed_fallback(self):
+        """
+        Asserts the riders of a sector without a solution are routed with
+        the idle vehicles of the other sectors
+        """
+
+        params = get_params()
+        router = Router(
+            problem_builder=ProblemBuilder(
+                params=params,
+                estimator=LinearEstimator()
+            ),
+            optimization_model_builder=OptimizationModelBuilder(
+                constraints=[CapacityConstraint()]
+            ),
+            problem_decomposer=SkewedProblemDecomposer(sector_size=3),
+            max_workers=2
+        )
+        riders = parse_models(model_dicts=test_riders, cls=Rider)
+        vehicles = parse_models(model_dicts=test_vehicles, cls=Vehicle)
+        depots = parse_models(model_dicts=test_depots, cls=Depot)
+        routes = router.route(riders, vehicles, depots)
+
+        served_riders = sum(
+            len(stop['riders'])
+            for route in routes
+            for stop in route['stops']
+            if stop['riders']
+        )
+        self.assertEqual(
+            served_riders, len(riders),
+            msg='Riders of the infeasible sector were not served.'
+        )
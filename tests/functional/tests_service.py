@@ -0,0 +1,134 @@
+import asyncio
+import json
+import unittest
+
+from service.http_server import HttpServer
+from service.routing_service import RoutingService, QueueFullError
+from tests.data.test_depots import test_depots
+from tests.data.test_riders import test_riders
+from tests.data.test_vehicles import test_vehicles
+
+TEST_PAYLOAD = {
+    'riders': test_riders,
+    'vehicles': test_vehicles,
+    'depots': test_depots,
+    'params': {'SEARCH_TIME_LIMIT': 1}
+}
+
+
+async def _request(port, method, path, body=None):
+    """Method to send a request to the test server"""
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    writer.write(
+        f'{method} {path} HTTP/1.1\r\n'
+        f'Content-Length: {len(payload)}\r\n\r\n'.encode() + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, response_body = response.partition(b'\r\n\r\n')
+
+    return int(head.split(b' ')[1]), json.loads(response_body)
+
+
+class TestsService(unittest.IsolatedAsyncioTestCase):
+    """Tests for the routing service"""
+
+    async def test_priorities_and_backpressure(self):
+        """Asserts Jobs run by priority and a full queue rejects Jobs"""
+
+        service = RoutingService(max_workers=1, max_queue_size=2)
+        await service.start()
+        try:
+            low = service.submit(TEST_PAYLOAD, priority=0)
+            high = service.submit(TEST_PAYLOAD, priority=5)
+            with self.assertRaises(QueueFullError):
+                service.submit(TEST_PAYLOAD)
+            with self.assertRaises(ValueError):
+                service.submit({'riders': test_riders})
+
+            while not (low.done and high.done):
+                await asyncio.sleep(0.05)
+
+        finally:
+            await service.stop()
+
+        self.assertEqual(
+            (low.status, high.status), ('success', 'success'),
+            msg='Jobs were not routed.'
+        )
+        self.assertLess(
+            high.started_at, low.started_at,
+            msg='Job with a higher priority did not run first.'
+        )
+        self.assertEqual(
+            service.metrics['rejected'], 1,
+            msg='Rejected job was not counted.'
+        )
+
+    async def test_http_server(self):
+        """Asserts Jobs are submitted and fetched over HTTP"""
+
+        service = RoutingService(max_workers=1)
+        await service.start()
+        server = HttpServer(service, port=0)
+        await server.start()
+        try:
+            status, response = await _request(
+                server.port, 'POST', '/jobs', TEST_PAYLOAD
+            )
+            self.assertEqual(status, 202, msg='Job was not accepted.')
+
+            job_id = response['job_id']
+            while response.get('status') != 'success':
+                await asyncio.sleep(0.05)
+                status, response = await _request(
+                    server.port, 'GET', f'/jobs/{job_id}'
+                )
+            self.assertTrue(response['routes'], msg='Routes are missing.')
+
+            status, response = await _request(server.port, 'GET', '/health')
+            self.assertEqual(
+                (status, response['status']), (200, 'ok'),
+                msg='Service is not healthy.'
+            )
+            status, response = await _request(server.port, 'GET', '/metrics')
+            self.assertEqual(
+                response['succeeded'], 1,
+                msg='Metrics do not count the succeeded job.'
+            )
+            status, _ = await _request(server.port, 'GET', '/jobs/unknown')
+            self.assertEqual(status, 404, msg='Unknown job was found.')
+            status, _ = await _request(server.port, 'POST', '/jobs', [1])
+            self.assertEqual(status, 400, msg='Invalid body was accepted.')
+
+        finally:
+            await server.stop()
+            await service.stop()
+
+    async def test_http_server_bad_priority(self):
+        """Asserts a Job with a priority that is not an integer is rejected"""
+
+        service = RoutingService(max_workers=1)
+        await service.start()
+        server = HttpServer(service, port=0)
+        await server.start()
+        try:
+            for priority in ([1], {'level': 1}, None, 'high'):
+                status, response = await _request(
+                    server.port,
+                    'POST',
+                    '/jobs',
+                    {**TEST_PAYLOAD, 'priority': priority}
+                )
+                self.assertEqual(
+                    status, 400,
+                    msg=f'Priority {priority} was accepted.'
+                )
+                self.assertIn('priority', response['error'])
+
+        finally:
+            await server.stop()
+            await service.stop()
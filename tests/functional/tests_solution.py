@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from models.solution import Solution
+
+
+class TestsSolution(unittest.TestCase):
+    """Tests for the Solution class"""
+
+    routes = [[0, 3, 4, 0], [1, 1], [0, 2, 1]]
+
+    def test_from_routes(self):
+        """Asserts the routes are flattened into offsets and stops"""
+
+        solution = Solution.from_routes(self.routes)
+        np.testing.assert_array_equal(
+            solution.offsets, [0, 4, 6, 9],
+            err_msg='Offsets of the routes are incorrect.'
+        )
+        np.testing.assert_array_equal(
+            solution.stops, [0, 3, 4, 0, 1, 1, 0, 2, 1],
+            err_msg='Stops of the routes are incorrect.'
+        )
+        np.testing.assert_array_equal(
+            solution.lengths, [4, 2, 3],
+            err_msg='Lengths of the routes are incorrect.'
+        )
+
+    def test_sequence(self):
+        """Asserts the Solution is read as a list of routes"""
+
+        solution = Solution.from_routes(self.routes)
+        self.assertEqual(len(solution), 3, msg='Number of routes incorrect.')
+        self.assertEqual(
+            list(solution), self.routes,
+            msg='Routes are iterated incorrectly.'
+        )
+        self.assertEqual(
+            solution[2], [0, 2, 1],
+            msg='Route is indexed incorrectly.'
+        )
+        self.assertEqual(
+            solution[-1], [0, 2, 1],
+            msg='Route is indexed incorrectly from the end.'
+        )
+        self.assertTrue(
+            np.shares_memory(solution.route(0), solution.stops),
+            msg='Route of a Solution is not a view.'
+        )
+        with self.assertRaises(IndexError):
+            _ = solution[3]
+
+    def test_invalid_offsets(self):
+        """Asserts offsets that do not end at the stops are rejected"""
+
+        with self.assertRaises(ValueError):
+            Solution(
+                offsets=np.array([0, 2]),
+                stops=np.array([0, 1, 0])
+            )
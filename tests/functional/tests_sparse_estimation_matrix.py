@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from models.sparse_estimation_matrix import SparseEstimationMatrix
+
+
+class TestsSparseEstimationMatrix(unittest.TestCase):
+    """Tests for the SparseEstimationMatrix class"""
+
+    origins = np.array([0, 0, 1, 2, 1, 0])
+    destinations = np.array([2, 1, 0, 0, 2, 2])
+    times = np.array([30.6, 12.4, 12.4, 30.6, 7.5, 99.])
+
+    def test_from_paths(self):
+        """Asserts the paths are stored in sorted rows, without repeats"""
+
+        estimations = SparseEstimationMatrix.from_paths(
+            self.origins, self.destinations, self.times, 3
+        )
+        self.assertEqual(len(estimations), 5, msg='Number of paths incorrect.')
+        np.testing.assert_array_equal(
+            estimations.neighbours(0), [1, 2],
+            err_msg='Neighbours of a Stop are incorrect.'
+        )
+        np.testing.assert_array_equal(
+            estimations.row(2), [30.6],
+            err_msg='Row of a Stop is incorrect.'
+        )
+        self.assertEqual(
+            estimations[0, 2], 30.6,
+            msg='Repeated path does not keep its first time.'
+        )
+        self.assertEqual(
+            dict(estimations.items())[(1, 2)], 7.5,
+            msg='Item of a path is incorrect.'
+        )
+        with self.assertRaises(KeyError):
+            _ = estimations[2, 1]
+
+    def test_take(self):
+        """Asserts the paths between some Stops are gathered"""
+
+        estimations = SparseEstimationMatrix.from_paths(
+            self.origins, self.destinations, self.times, 3
+        ).take(np.array([2, 0]))
+        self.assertEqual(
+            dict(estimations.items()), {(0, 1): 30.6, (1, 0): 30.6},
+            msg='Gathered estimations are incorrect.'
+        )
+
+    def test_to_dense(self):
+        """Asserts the paths not estimated take the longest time"""
+
+        estimations = SparseEstimationMatrix.from_paths(
+            self.origins, self.destinations, self.times, 3
+        )
+        np.testing.assert_array_equal(
+            estimations.to_dense(),
+            [[30.6, 12.4, 30.6], [12.4, 30.6, 7.5], [30.6, 30.6, 30.6]],
+            err_msg='Sparse matrix is expanded incorrectly.'
+        )
+
+    def test_invalid_shape(self):
+        """Asserts inconsistent arrays are rejected"""
+
+        with self.assertRaises(ValueError):
+            SparseEstimationMatrix(
+                indptr=np.array([0, 1, 2]),
+                indices=np.array([1]),
+                data=np.array([1.]),
+                num_stops=2
+            )
@@ -1,5 +1,27 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 
+import numpy as np
+from geohash import encode
+from haversine import haversine
+
+from tests.data.test_riders import test_riders
+from utils.cluster_utils import cluster_coordinates
+from utils.file_utils import read_road_network
+from utils.geo_utils import haversine_vector, equirectangular_vector, \
+    nearest_neighbours, nearest_points
+from utils.geohash_utils import (
+    encode_geohash,
+    geohash_strings,
+    group_geohash
+)
+from utils.profile_utils import Profiler, profile_stage
+from utils.stream_utils import load_riders
 from utils.time_utils import hour_to_sec
 
 
@@ -12,3 +34,332 @@ class TestsUtils(unittest.TestCase):
         hours = 2
         sec = hour_to_sec(hours)
         self.assertEqual(sec, hours * 3600, msg='Hours parsed incorrectly.')
+
+    def test_haversine_vector(self):
+        """Asserts the vectorized haversine matches the haversine package"""
+
+        origin = (4.720634, -74.037228)
+        destination = (4.809486, -74.070967)
+        distance = haversine_vector(
+            np.array([origin[0]]),
+            np.array([origin[1]]),
+            np.array([destination[0]]),
+            np.array([destination[1]])
+        )
+        self.assertAlmostEqual(
+            distance[0], haversine(origin, destination),
+            places=9,
+            msg='Vectorized haversine distance calculated incorrectly.'
+        )
+
+    def test_equirectangular_vector(self):
+        """Asserts the equirectangular distance approximates the haversine"""
+
+        origin = (4.720634, -74.037228)
+        destination = (4.809486, -74.070967)
+        distance = equirectangular_vector(
+            np.array([origin[0]]),
+            np.array([origin[1]]),
+            np.array([destination[0]]),
+            np.array([destination[1]])
+        )
+        self.assertAlmostEqual(
+            distance[0] / haversine(origin, destination), 1.,
+            places=4,
+            msg='Equirectangular distance approximated incorrectly.'
+        )
+
+    def test_nearest_neighbours(self):
+        """Asserts the spatial index finds the k nearest neighbours"""
+
+        random = np.random.default_rng(0)
+        lats = np.concatenate((
+            random.uniform(4.5, 4.8, 300),
+            4.6 + random.normal(size=200) * 0.001
+        ))
+        lngs = np.concatenate((
+            random.uniform(-74.2, -74., 300),
+            -74.1 + random.normal(size=200) * 0.001
+        ))
+        neighbours = nearest_neighbours(lats, lngs, 8)
+        distances = equirectangular_vector(
+            lats[:, np.newaxis],
+            lngs[:, np.newaxis],
+            lats[np.newaxis, :],
+            lngs[np.newaxis, :]
+        )
+        np.fill_diagonal(distances, np.inf)
+        np.testing.assert_allclose(
+            np.take_along_axis(distances, neighbours, axis=1),
+            np.sort(distances, axis=1)[:, :8],
+            rtol=1e-3,
+            err_msg='Neighbours are not the nearest points.'
+        )
+        self.assertEqual(
+            nearest_neighbours(lats[:3], lngs[:3], 8).shape, (3, 2),
+            msg='Neighbours are not capped to the other points.'
+        )
+
+    def test_nearest_points(self):
+        """Asserts the spatial index finds the nearest point"""
+
+        random = np.random.default_rng(0)
+        point_lats = np.concatenate((
+            random.uniform(4.5, 4.8, 300),
+            4.6 + random.normal(size=200) * 0.001
+        ))
+        point_lngs = np.concatenate((
+            random.uniform(-74.2, -74., 300),
+            -74.1 + random.normal(size=200) * 0.001
+        ))
+        lats = random.uniform(4.4, 4.9, 100)
+        lngs = random.uniform(-74.3, -73.9, 100)
+        nearest = nearest_points(lats, lngs, point_lats, point_lngs)
+        distances = equirectangular_vector(
+            lats[:, np.newaxis],
+            lngs[:, np.newaxis],
+            point_lats[np.newaxis, :],
+            point_lngs[np.newaxis, :]
+        )
+        np.testing.assert_allclose(
+            distances[np.arange(100), nearest],
+            distances.min(axis=1),
+            rtol=1e-3,
+            err_msg='Points found are not the nearest ones.'
+        )
+
+    def test_read_road_network(self):
+        """Asserts the road graph is contracted once and then loaded"""
+
+        with tempfile.TemporaryDirectory() as input_dir:
+            self.assertIsNone(
+                read_road_network(input_dir),
+                msg='An input dir without road graph has a hierarchy.'
+            )
+            with open(os.path.join(input_dir, 'road_nodes.csv'), 'w') as f:
+                f.write('node_id,lat,lng\na,4.7,-74.1\nb,4.71,-74.1\n')
+            with open(os.path.join(input_dir, 'road_edges.csv'), 'w') as f:
+                f.write('source,target,seconds\na,b,60\nb,a,90\n')
+
+            hierarchy = read_road_network(input_dir)
+            self.assertTrue(
+                os.path.isfile(os.path.join(input_dir, 'road_hierarchy.npz')),
+                msg='The hierarchy is not saved next to the road graph.'
+            )
+            np.testing.assert_allclose(
+                hierarchy.many_to_many(np.array([0, 1]), np.array([0, 1])),
+                [[0, 60], [90, 0]],
+                err_msg='The road graph is read incorrectly.'
+            )
+            with mock.patch(
+                    'models.contraction_hierarchy.ContractionHierarchy.build'
+            ) as build:
+                loaded = read_road_network(input_dir)
+            build.assert_not_called()
+            self.assertEqual(
+                loaded.checksum, hierarchy.checksum,
+                msg='The saved hierarchy is not loaded.'
+            )
+
+            with open(os.path.join(input_dir, 'road_edges.csv'), 'a') as f:
+                f.write('a,b,30\n')
+            self.assertEqual(
+                read_road_network(input_dir).many_to_many(
+                    np.array([0]),
+                    np.array([1])
+                )[0, 0],
+                30,
+                msg='The hierarchy is not rebuilt for a changed road graph.'
+            )
+
+    def test_cluster_coordinates(self):
+        """Asserts clusters are within the radius and capped in size"""
+
+        random = np.random.default_rng(0)
+        lats = np.concatenate((
+            random.uniform(4.5, 4.8, 300),
+            4.6 + random.normal(size=200) * 0.0005
+        ))
+        lngs = np.concatenate((
+            random.uniform(-74.2, -74., 300),
+            -74.1 + random.normal(size=200) * 0.0005
+        ))
+        labels, center_lats, center_lngs = cluster_coordinates(
+            lats,
+            lngs,
+            radius=0.3,
+            max_size=20
+        )
+        self.assertEqual(
+            labels.min(), 0,
+            msg='Some points are not clustered.'
+        )
+        self.assertEqual(
+            labels.max(), len(center_lats) - 1,
+            msg='Labels do not match the clusters.'
+        )
+        self.assertLessEqual(
+            np.bincount(labels).max(), 20,
+            msg='Clusters exceed their maximum size.'
+        )
+        self.assertLessEqual(
+            haversine_vector(
+                lats,
+                lngs,
+                center_lats[labels],
+                center_lngs[labels]
+            ).max(),
+            0.3 * 1.001,
+            msg='Points are beyond the radius of their cluster.'
+        )
+        self.assertEqual(
+            np.unique(labels[300:]).size, 10,
+            msg='Dense points are not clustered in the fewest clusters.'
+        )
+        labels, center_lats, _ = cluster_coordinates(
+            lats[:0],
+            lngs[:0],
+            radius=0.3
+        )
+        self.assertEqual(
+            (labels.size, center_lats.size), (0, 0),
+            msg='No points should give no clusters.'
+        )
+        for radius in (0, -0.3, float('nan')):
+            with self.assertRaises(
+                    ValueError,
+                    msg=f'A radius of {radius} km was accepted.'
+            ):
+                cluster_coordinates(lats, lngs, radius=radius)
+
+    def test_encode_geohash(self):
+        """Asserts the uint64 geohashes match the geohash package"""
+
+        rng = np.random.default_rng(0)
+        lats = rng.uniform(-90, 90, 1000)
+        lngs = rng.uniform(-180, 180, 1000)
+        codes = encode_geohash(lats, lngs)
+        for precision in (12, 8, 6, 1):
+            expected = [
+                encode(lat, lng)[:precision]
+                for lat, lng in zip(lats.tolist(), lngs.tolist())
+            ]
+            self.assertEqual(
+                geohash_strings(
+                    encode_geohash(lats, lngs, precision),
+                    precision
+                ).astype(str).tolist(),
+                expected,
+                msg=f'Geohashes of precision {precision} encoded '
+                    f'incorrectly.'
+            )
+            np.testing.assert_array_equal(
+                codes >> np.uint64(5 * (12 - precision)),
+                encode_geohash(lats, lngs, precision),
+                err_msg='Geohashes truncated incorrectly by a shift.'
+            )
+
+    def test_group_geohash(self):
+        """Asserts the geohash groups are numbered by first appearance"""
+
+        lats = np.array([4.718400, 4.809486, 4.718401, 4.720634])
+        lngs = np.array([-74.027692, -74.070967, -74.027693, -74.037228])
+        labels, num_groups = group_geohash(lats, lngs, precision=7)
+        self.assertEqual(num_groups, 3, msg='Geohash groups are incorrect.')
+        self.assertEqual(
+            labels.tolist(), [0, 1, 0, 2],
+            msg='Geohash groups are not in order of first appearance.'
+        )
+
+    def test_load_riders(self):
+        """Asserts Riders are streamed from every supported format"""
+
+        with tempfile.TemporaryDirectory() as riders_dir:
+            files = {
+                'riders.json': lambda f: json.dump(test_riders, f, indent=4),
+                'riders.json.gz': lambda f: json.dump(test_riders, f),
+                'riders.ndjson': lambda f: f.writelines(
+                    json.dumps(rider) + '\n' for rider in test_riders
+                ),
+                'riders.csv.gz': lambda f: csv.writer(f).writerows(
+                    [['rider_id', 'lat', 'lng']] +
+                    [
+                        [rider['rider_id'], rider['lat'], rider['lng']]
+                        for rider in test_riders
+                    ]
+                )
+            }
+            for name, write in files.items():
+                riders_file = os.path.join(riders_dir, name)
+                opener = gzip.open if name.endswith('.gz') else open
+                with opener(riders_file, 'wt', newline='') as f:
+                    write(f)
+
+                # A small chunk makes records span several reads
+                with mock.patch('utils.stream_utils.CHUNK_SIZE', 16):
+                    columns = load_riders(riders_file)
+
+                self.assertEqual(
+                    columns.rider_ids.tolist(),
+                    [rider['rider_id'] for rider in test_riders],
+                    msg=f'Rider ids streamed incorrectly from {name}.'
+                )
+                np.testing.assert_array_equal(
+                    columns.lats, [rider['lat'] for rider in test_riders],
+                    err_msg=f'Latitudes streamed incorrectly from {name}.'
+                )
+                np.testing.assert_array_equal(
+                    columns.lngs, [rider['lng'] for rider in test_riders],
+                    err_msg=f'Longitudes streamed incorrectly from {name}.'
+                )
+
+            with open(os.path.join(riders_dir, 'riders.json'), 'w') as f:
+                f.write(json.dumps(test_riders)[:-1])
+            with self.assertRaises(ValueError):
+                load_riders(os.path.join(riders_dir, 'riders.json'))
+
+            open(os.path.join(riders_dir, 'riders.csv'), 'w').close()
+            with self.assertRaises(ValueError):
+                load_riders(os.path.join(riders_dir, 'riders.csv'))
+
+    def test_profiler(self):
+        """Asserts the stages are profiled only while a Profiler is active"""
+
+        with profile_stage('inactive'):
+            pass
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler = Profiler(cprofile=True, sample_interval=0.001)
+            with profiler:
+                with profile_stage('outer'):
+                    with profile_stage('inner'):
+                        buffer = np.ones(2 ** 20)
+                    del buffer
+
+            files = profiler.write(output_dir)
+            with open(files[0]) as f:
+                report = json.load(f)
+            self.assertEqual(
+                [os.path.basename(file) for file in files],
+                ['profile.json', 'profile.prof', 'profile.collapsed'],
+                msg='Profile files are incorrect.'
+            )
+
+        self.assertEqual(
+            [stage['stage'] for stage in report['stages']],
+            ['outer/inner', 'outer'],
+            msg='Nested stages are named incorrectly.'
+        )
+        inner, outer = report['stages']
+        self.assertGreaterEqual(
+            inner['peak_memory_mb'], 8,
+            msg='Peak memory of a stage is incorrect.'
+        )
+        self.assertGreaterEqual(
+            outer['peak_memory_mb'], inner['peak_memory_mb'],
+            msg='Peak memory of a stage misses the peak of its child.'
+        )
+        self.assertGreaterEqual(
+            outer['wall_seconds'], inner['wall_seconds'],
+            msg='Wall time of a stage misses the time of its child.'
+        )
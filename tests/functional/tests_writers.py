@@ -0,0 +1,90 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from constraints.capacity_constraint import CapacityConstraint
+from estimators.linear_estimator import LinearEstimator
+from models.depot import Depot
+from models.rider import Rider
+from models.vehicle import Vehicle
+from optimization_model.optimization_model_builder import \
+    OptimizationModelBuilder
+from problem.problem_builder import ProblemBuilder
+from router import Router
+from tests.data.test_depots import test_depots
+from tests.data.test_riders import test_riders
+from tests.data.test_vehicles import test_vehicles
+from tests.test_utils import parse_models, get_params
+from writers.json_routes_writer import JsonRoutesWriter
+from writers.ndjson_routes_writer import NdjsonRoutesWriter
+from writers.npz_routes_writer import NpzRoutesWriter
+
+
+class TestsWriters(unittest.TestCase):
+    """Tests for the writers of the Routes"""
+
+    def setUp(self):
+        """Solves the test Problem and parses its Routes as JSON"""
+
+        router = Router(
+            problem_builder=ProblemBuilder(
+                params=get_params(),
+                estimator=LinearEstimator()
+            ),
+            optimization_model_builder=OptimizationModelBuilder(
+                constraints=[CapacityConstraint()]
+            )
+        )
+        self.problem, self.solution = router.solve(
+            parse_models(model_dicts=test_riders, cls=Rider),
+            parse_models(model_dicts=test_vehicles, cls=Vehicle),
+            parse_models(model_dicts=test_depots, cls=Depot)
+        )
+        self.routes = json.loads(json.dumps(
+            Router._parse_routes(self.problem, self.solution)
+        ))
+
+    def test_json_routes_writer(self):
+        """Asserts the Routes are written as a JSON list"""
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            writer = JsonRoutesWriter()
+            num_routes = writer.write(output_dir, self.problem, self.solution)
+            with open(writer.routes_file(output_dir)) as f:
+                routes = json.load(f)
+
+        self.assertEqual(num_routes, len(self.routes), msg='Routes missing.')
+        self.assertEqual(routes, self.routes, msg='JSON Routes differ.')
+
+    def test_ndjson_routes_writer(self):
+        """Asserts the Routes are written one per line, optionally gzipped"""
+
+        for compress in (False, True):
+            with tempfile.TemporaryDirectory() as output_dir:
+                writer = NdjsonRoutesWriter(compress=compress)
+                writer.write(output_dir, self.problem, self.solution)
+                routes_file = writer.routes_file(output_dir)
+                opener = gzip.open if compress else open
+                with opener(routes_file, 'rt') as f:
+                    routes = [json.loads(line) for line in f]
+
+            self.assertEqual(
+                routes_file.endswith('.gz'), compress,
+                msg='NDJSON file has an incorrect extension.'
+            )
+            self.assertEqual(routes, self.routes, msg='NDJSON Routes differ.')
+
+    def test_npz_routes_writer(self):
+        """Asserts the columns of the Routes are read back as Routes"""
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            writer = NpzRoutesWriter()
+            num_routes = writer.write(output_dir, self.problem, self.solution)
+            routes_file = writer.routes_file(output_dir)
+            self.assertTrue(os.path.isfile(routes_file), msg='No npz file.')
+            routes = NpzRoutesWriter.read(routes_file)
+
+        self.assertEqual(num_routes, len(self.routes), msg='Routes missing.')
+        self.assertEqual(routes, self.routes, msg='Columnar Routes differ.')
@@ -0,0 +1,122 @@
+from typing import Tuple, Optional, Dict
+
+import numpy as np
+
+from utils.geo_utils import project_plane
+
+# Rows of the distance blocks computed at once when counting neighbours
+ROWS_PER_BLOCK = 1024
+
+
+def cluster_coordinates(
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        radius: float,
+        max_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Method to cluster coordinates (degrees) so that every point is within
+    the radius (km) of its cluster's center, with at most `max_size` points
+    per cluster. Points are bucketed in a grid of cells as wide as the
+    radius, so the neighbours of a point lie in the 3x3 cells around it.
+    Seeds are taken greedily from the densest points, each one claiming its
+    nearest unclaimed neighbours within the radius, which brings the number
+    of clusters close to the least needed. A cluster is centered at its
+    mean, unless a point is beyond the radius of it, then at its seed.
+    Returns the label of every point and the latitude and longitude of
+    every cluster center.
+    """
+
+    if not radius > 0:
+        raise ValueError(
+            f'The radius of the clusters must be positive, got {radius} km.'
+        )
+
+    num_points = len(lats)
+    if num_points == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+
+    max_size = max_size or num_points
+    x, y = project_plane(lats, lngs)
+    cells_x = ((x - x.min()) // radius).astype(np.int64)
+    cells_y = ((y - y.min()) // radius).astype(np.int64)
+    order, cell_slices = _build_grid(cells_x, cells_y)
+
+    def _candidates(point: int) -> np.ndarray:
+        """Method to gather the points of the 3x3 cells around a point"""
+
+        return np.concatenate([
+            order[slice(*cell_slices[(cell_x, cell_y)])]
+            for cell_x in range(cells_x[point] - 1, cells_x[point] + 2)
+            for cell_y in range(cells_y[point] - 1, cells_y[point] + 2)
+            if (cell_x, cell_y) in cell_slices
+        ])
+
+    densities = np.zeros(num_points, dtype=np.int64)
+    for start, end in cell_slices.values():
+        points = order[start:end]
+        candidates = _candidates(points[0])
+        for block in range(0, len(points), ROWS_PER_BLOCK):
+            rows = points[block:block + ROWS_PER_BLOCK]
+            densities[rows] = (np.hypot(
+                x[rows, np.newaxis] - x[np.newaxis, candidates],
+                y[rows, np.newaxis] - y[np.newaxis, candidates]
+            ) <= radius).sum(axis=1)
+
+    labels = np.full(num_points, -1, dtype=np.int64)
+    seeds = []
+    for seed in np.argsort(-densities, kind='stable').tolist():
+        if labels[seed] >= 0:
+            continue
+
+        candidates = _candidates(seed)
+        candidates = candidates[labels[candidates] < 0]
+        distances = np.hypot(x[candidates] - x[seed], y[candidates] - y[seed])
+        within = distances <= radius
+        candidates, distances = candidates[within], distances[within]
+        if len(candidates) > max_size:
+            nearest = np.argpartition(distances, max_size - 1)[:max_size]
+            candidates = candidates[nearest]
+
+        labels[candidates] = len(seeds)
+        seeds.append(seed)
+
+    seeds = np.array(seeds, dtype=np.int64)
+    counts = np.bincount(labels, minlength=len(seeds))
+    center_x = np.bincount(labels, weights=x, minlength=len(seeds)) / counts
+    center_y = np.bincount(labels, weights=y, minlength=len(seeds)) / counts
+    mean_distances = np.hypot(x - center_x[labels], y - center_y[labels])
+    off_center = np.zeros(len(seeds), dtype=bool)
+    off_center[labels[mean_distances > radius]] = True
+
+    center_lats = np.bincount(labels, weights=lats) / counts
+    center_lngs = np.bincount(labels, weights=lngs) / counts
+    center_lats[off_center] = lats[seeds[off_center]]
+    center_lngs[off_center] = lngs[seeds[off_center]]
+
+    return labels, center_lats, center_lngs
+
+
+def _build_grid(
+        cells_x: np.ndarray,
+        cells_y: np.ndarray
+) -> Tuple[np.ndarray, Dict[Tuple[int, int], Tuple[int, int]]]:
+    """
+    Method to sort the points by grid cell, returning the order and the
+    slice of the order of every (x, y) cell
+    """
+
+    num_rows = int(cells_y.max()) + 1
+    cells = cells_x * num_rows + cells_y
+    order = np.argsort(cells, kind='stable')
+    unique_cells, starts = np.unique(cells[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+
+    return order, {
+        (cell // num_rows, cell % num_rows): (start, end)
+        for cell, start, end in zip(
+            unique_cells.tolist(),
+            starts.tolist(),
+            ends.tolist()
+        )
+    }
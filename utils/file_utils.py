@@ -1,71 +1,229 @@
+import csv
+import hashlib
 import json
 import logging
 import os
-from typing import Tuple, Dict, List, Any
+from typing import Tuple, Dict, List, Any, Optional
 
+import numpy as np
+
+from models.contraction_hierarchy import ContractionHierarchy
 from models.depot import Depot
 from models.params import Params
-from models.rider import Rider
+from models.rider_columns import RiderColumns
+from models.rider_store import RiderStore
+from models.stop import Stop
 from models.vehicle import Vehicle
 from settings import RIDERS_FILE, VEHICLES_FILE, DEPOTS_FILE, PARAMS_FILE, \
-    ROUTES_FILE
+    ESTIMATIONS_FILE, STOPS_FILE, RIDERS_FILES, ROAD_NODES_FILE, \
+    ROAD_EDGES_FILE, ROAD_HIERARCHY_FILE
+from utils.stream_utils import load_riders
 
 
 def read_entities(input_dir: str) -> Tuple[
-    Dict[str, Rider],
+    RiderStore,
     Dict[str, Vehicle],
     Dict[str, Depot],
     Params
 ]:
     """Method to parse the Riders, Vehicles and Depots from JSON to Dict"""
 
-    riders_file = RIDERS_FILE.format(input_dir=input_dir)
-    with open(riders_file) as f:
-        logging.info(f'Read riders from {riders_file}.')
-        riders_dicts = json.load(f)
-    riders = {
-        r_dict['rider_id']: Rider.from_dict(r_dict)
-        for r_dict in riders_dicts
-    }
+    riders_file = find_riders_file(input_dir)
+    riders = RiderStore.from_columns(load_riders(riders_file))
     logging.info(f'Successfully parsed {len(riders)} riders.')
 
     vehicles_file = VEHICLES_FILE.format(input_dir=input_dir)
     with open(vehicles_file) as f:
         vehicles_dicts = json.load(f)
         logging.info(f'Read vehicles from {vehicles_file}.')
+
+    depots_file = DEPOTS_FILE.format(input_dir=input_dir)
+    with open(depots_file) as f:
+        depots_dicts = json.load(f)
+        logging.info(f'Read depots from {depots_file}.')
+
+    params_file = PARAMS_FILE.format(input_dir=input_dir)
+    with open(params_file) as f:
+        logging.info(f'Read params from {params_file}.')
+        params_dict = json.load(f)
+
+    return (riders, *_parse_fleet(vehicles_dicts, depots_dicts, params_dict))
+
+
+def find_riders_file(input_dir: str) -> str:
+    """Method to find the Riders file of the input dir in any format"""
+
+    for riders_file in RIDERS_FILES:
+        if os.path.isfile(riders_file.format(input_dir=input_dir)):
+            return riders_file.format(input_dir=input_dir)
+
+    raise FileNotFoundError(
+        f'No riders file in {input_dir}, e.g. '
+        f'{RIDERS_FILE.format(input_dir=input_dir)}.'
+    )
+
+
+def parse_entities(
+        riders_dicts: List[Dict[str, Any]],
+        vehicles_dicts: List[Dict[str, Any]],
+        depots_dicts: List[Dict[str, Any]],
+        params_dict: Dict[str, Any]
+) -> Tuple[
+    RiderStore,
+    Dict[str, Vehicle],
+    Dict[str, Depot],
+    Params
+]:
+    """Method to parse the Riders, Vehicles, Depots and Params from Dicts"""
+
+    riders = RiderStore.from_columns(RiderColumns.from_records(riders_dicts))
+    logging.info(f'Successfully parsed {len(riders)} riders.')
+
+    return (riders, *_parse_fleet(vehicles_dicts, depots_dicts, params_dict))
+
+
+def _parse_fleet(
+        vehicles_dicts: List[Dict[str, Any]],
+        depots_dicts: List[Dict[str, Any]],
+        params_dict: Dict[str, Any]
+) -> Tuple[Dict[str, Vehicle], Dict[str, Depot], Params]:
+    """Method to parse the Vehicles, Depots and Params from Dicts"""
+
     vehicles = {
         v_dict['vehicle_id']: Vehicle.from_dict(v_dict)
         for v_dict in vehicles_dicts
     }
     logging.info(f'Successfully parsed {len(vehicles)} vehicles.')
 
-    depots_file = DEPOTS_FILE.format(input_dir=input_dir)
-    with open(depots_file) as f:
-        depots_dicts = json.load(f)
-        logging.info(f'Read depots from {depots_file}.')
     depots = {
         d_dict['depot_id']: Depot.from_dict(d_dict)
         for d_dict in depots_dicts
     }
     logging.info(f'Successfully parsed {len(depots)} depots.')
 
-    params_file = PARAMS_FILE.format(input_dir=input_dir)
-    with open(params_file) as f:
-        logging.info(f'Read params from {params_file}.')
-        params_dict = json.load(f)
     params = Params.from_dict(params_dict)
     logging.info(f'Successfully parsed {len(params_dict)} params.')
 
-    return riders, vehicles, depots, params
+    return vehicles, depots, params
 
 
-def write_routes(output_dir: str, routes: List[Dict[str, Any]]):
-    """Method to write the Routes (result) to the output file"""
+def read_estimations(
+        input_dir: str
+) -> Optional[Tuple[np.ndarray, List[Dict[str, Any]]]]:
+    """
+    Method to memory-map the optional precomputed estimations and read the
+    manifest with the Stop of each of its rows
+    """
+
+    estimations_file = ESTIMATIONS_FILE.format(input_dir=input_dir)
+    if not os.path.isfile(estimations_file):
+        return None
+
+    matrix = np.load(estimations_file, mmap_mode='r')
+    logging.info(
+        f'Memory-mapped {matrix.shape} estimations from {estimations_file}.'
+    )
+
+    stops_file = STOPS_FILE.format(input_dir=input_dir)
+    with open(stops_file) as f:
+        logging.info(f'Read stops from {stops_file}.')
+        stops_dicts = json.load(f)
+    logging.info(f'Successfully parsed {len(stops_dicts)} stops.')
+
+    return matrix, stops_dicts
+
+
+def write_estimations(
+        output_dir: str,
+        stops: List[Stop],
+        matrix: np.ndarray
+):
+    """Method to write estimations and their Stops for a later run"""
 
-    routes_file = ROUTES_FILE.format(output_dir=output_dir)
     if not os.path.isdir(output_dir):
-        os.mkdir(output_dir)
+        os.makedirs(output_dir)
+
+    estimations_file = ESTIMATIONS_FILE.format(input_dir=output_dir)
+    np.save(estimations_file, matrix)
+    logging.info(
+        f'Wrote {matrix.shape} estimations to {estimations_file}.'
+    )
+
+    stops_file = STOPS_FILE.format(input_dir=output_dir)
+    with open(stops_file, 'w') as f:
+        logging.info(f'Wrote {len(stops)} stops to {stops_file}.')
+        json.dump([stop.to_dict() for stop in stops], f)
+
+
+def read_road_network(input_dir: str) -> Optional[ContractionHierarchy]:
+    """
+    Method to read the optional road graph of the input dir as a
+    ContractionHierarchy. The hierarchy is saved next to the graph the
+    first time, and loaded in later runs while the graph is unchanged.
+    """
+
+    nodes_file = ROAD_NODES_FILE.format(input_dir=input_dir)
+    edges_file = ROAD_EDGES_FILE.format(input_dir=input_dir)
+    if not os.path.isfile(edges_file):
+        return None
+
+    checksum = _checksum_files([nodes_file, edges_file])
+    hierarchy_file = ROAD_HIERARCHY_FILE.format(input_dir=input_dir)
+    if os.path.isfile(hierarchy_file):
+        hierarchy = ContractionHierarchy.load(hierarchy_file)
+        if hierarchy.checksum == checksum:
+            logging.info(
+                f'Read a hierarchy of {hierarchy.num_nodes} nodes from '
+                f'{hierarchy_file}.'
+            )
+            return hierarchy
+
+        logging.info(f'The road graph changed since {hierarchy_file}.')
+
+    with open(nodes_file, newline='') as f:
+        node_rows = list(csv.DictReader(f))
+    node_indices = {
+        row['node_id']: node_ix
+        for node_ix, row in enumerate(node_rows)
+    }
+    with open(edges_file, newline='') as f:
+        edge_rows = list(csv.DictReader(f))
+    logging.info(
+        f'Read {len(node_rows)} nodes and {len(edge_rows)} edges from '
+        f'{nodes_file} and {edges_file}.'
+    )
+
+    hierarchy = ContractionHierarchy.build(
+        lats=np.array([float(row['lat']) for row in node_rows]),
+        lngs=np.array([float(row['lng']) for row in node_rows]),
+        sources=np.array(
+            [node_indices[row['source']] for row in edge_rows],
+            dtype=np.int64
+        ),
+        targets=np.array(
+            [node_indices[row['target']] for row in edge_rows],
+            dtype=np.int64
+        ),
+        weights=np.array([float(row['seconds']) for row in edge_rows]),
+        checksum=checksum
+    )
+    try:
+        hierarchy.save(hierarchy_file)
+        logging.info(f'Wrote the hierarchy to {hierarchy_file}.')
+
+    except OSError as error:
+        logging.warning(f'The hierarchy could not be saved: {error}.')
+
+    return hierarchy
+
+
+def _checksum_files(files: List[str]) -> str:
+    """Method to obtain a checksum of the contents of some files"""
+
+    digest = hashlib.sha1()
+    for file in files:
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(2 ** 20), b''):
+                digest.update(chunk)
 
-    with open(routes_file, 'w') as f:
-        logging.info(f'Wrote {len(routes)} routes to {routes_file}.')
-        json.dump(routes, f, indent=4)
+    return digest.hexdigest()
@@ -0,0 +1,296 @@
+from typing import Tuple
+
+import numpy as np
+
+# Same mean Earth radius (km) used by the haversine package
+EARTH_RADIUS = 6371.0088
+
+
+def haversine_vector(
+        origins_lat: np.ndarray,
+        origins_lng: np.ndarray,
+        destinations_lat: np.ndarray,
+        destinations_lng: np.ndarray
+) -> np.ndarray:
+    """
+    Method to calculate the haversine distance (km) between broadcastable
+    arrays of origin and destination coordinates (degrees). Passing column
+    origins and row destinations yields the full distance matrix in a single
+    vectorized pass. The half-angle sines are expanded into products, so the
+    trigonometry runs on the inputs and not on every pair.
+    """
+
+    sin_lat_o, cos_lat_o = _half_angle(origins_lat)
+    sin_lng_o, cos_lng_o = _half_angle(origins_lng)
+    sin_lat_d, cos_lat_d = _half_angle(destinations_lat)
+    sin_lng_d, cos_lng_d = _half_angle(destinations_lng)
+    sin_delta_lat = sin_lat_d * cos_lat_o - cos_lat_d * sin_lat_o
+    sin_delta_lng = sin_lng_d * cos_lng_o - cos_lng_d * sin_lng_o
+    half_chord = (
+        sin_delta_lat ** 2 +
+        np.cos(np.radians(origins_lat)) *
+        np.cos(np.radians(destinations_lat)) *
+        sin_delta_lng ** 2
+    )
+
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(half_chord))
+
+
+def equirectangular_vector(
+        origins_lat: np.ndarray,
+        origins_lng: np.ndarray,
+        destinations_lat: np.ndarray,
+        destinations_lng: np.ndarray
+) -> np.ndarray:
+    """
+    Method to approximate the distance (km) between broadcastable arrays of
+    coordinates (degrees) with the equirectangular projection at the mean
+    latitude of each pair. It avoids the inverse trigonometry of the
+    haversine. For points less than 1 degree (~110 km) apart, with
+    |lat| <= 70, the relative error against the haversine distance is below
+    1e-4. Pairs that cross the antimeridian are not supported.
+    """
+
+    sin_lat_o, cos_lat_o = _half_angle(origins_lat)
+    sin_lat_d, cos_lat_d = _half_angle(destinations_lat)
+    cos_mean_lat = cos_lat_o * cos_lat_d - sin_lat_o * sin_lat_d
+    x = np.radians(destinations_lng - origins_lng) * cos_mean_lat
+    y = np.radians(destinations_lat - origins_lat)
+
+    return EARTH_RADIUS * np.sqrt(x ** 2 + y ** 2)
+
+
+def project_plane(
+        lats: np.ndarray,
+        lngs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Method to project coordinates (degrees) to the plane (km) tangent at
+    their mean latitude, where nearby distances are euclidean
+    """
+
+    x = np.radians(lngs) * np.cos(np.radians(lats.mean())) * EARTH_RADIUS
+    y = np.radians(lats) * EARTH_RADIUS
+
+    return x, y
+
+
+def nearest_neighbours(
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        k: int
+) -> np.ndarray:
+    """
+    Method to find the k nearest neighbours of every point (degrees) with a
+    spatial index: the points are projected to the plane at their mean
+    latitude and bucketed in a grid of about k points per cell. The
+    neighbours of the points in a cell are searched in the rings of cells
+    around it, widening the rings until no closer point may lie outside.
+    Returns a (num_points, k) array of neighbour indices, nearest first,
+    with k capped to the number of other points.
+    """
+
+    num_points = len(lats)
+    k = min(k, num_points - 1)
+    if k <= 0:
+        return np.zeros((num_points, 0), dtype=np.int64)
+
+    x, y = project_plane(lats, lngs)
+    width, height = np.ptp(x), np.ptp(y)
+    cell_size = max(
+        np.sqrt(width * height * k / num_points),
+        max(width, height) * k / num_points,
+        1e-9
+    )
+    cells_x = ((x - x.min()) // cell_size).astype(np.int64)
+    cells_y = ((y - y.min()) // cell_size).astype(np.int64)
+    max_ring = max(cells_x.max(), cells_y.max()) + 1
+
+    # The points are sorted by cell, so every cell is a slice of the order
+    cells = cells_x * (cells_y.max() + 1) + cells_y
+    order = np.argsort(cells, kind='stable')
+    sorted_cells = cells[order]
+    unique_cells, cell_starts = np.unique(sorted_cells, return_index=True)
+    cell_ends = np.append(cell_starts[1:], num_points)
+    cell_slices = {
+        (cell // (cells_y.max() + 1), cell % (cells_y.max() + 1)): (start, end)
+        for cell, start, end in zip(
+            unique_cells.tolist(),
+            cell_starts.tolist(),
+            cell_ends.tolist()
+        )
+    }
+
+    neighbours = np.empty((num_points, k), dtype=np.int64)
+    for (cell_x, cell_y), (start, end) in cell_slices.items():
+        points = order[start:end]
+        ring = 1
+        while True:
+            candidates = np.concatenate([
+                order[slice(*cell_slices[(ring_x, ring_y)])]
+                for ring_x in range(cell_x - ring, cell_x + ring + 1)
+                for ring_y in range(cell_y - ring, cell_y + ring + 1)
+                if (ring_x, ring_y) in cell_slices
+            ])
+            distances = np.hypot(
+                x[points, np.newaxis] - x[np.newaxis, candidates],
+                y[points, np.newaxis] - y[np.newaxis, candidates]
+            )
+            distances[points[:, np.newaxis] == candidates[np.newaxis, :]] = (
+                np.inf
+            )
+            if len(candidates) > k:
+                nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+                nearest_distances = np.take_along_axis(
+                    distances, nearest, axis=1
+                )
+
+                # Points outside the rings are at least `ring` cells away
+                if (
+                        ring >= max_ring or
+                        nearest_distances.max() <= ring * cell_size
+                ):
+                    break
+
+            ring += 1
+
+        ranks = np.argsort(nearest_distances, axis=1, kind='stable')
+        neighbours[points] = candidates[
+            np.take_along_axis(nearest, ranks, axis=1)
+        ]
+
+    return neighbours
+
+
+def nearest_points(
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        point_lats: np.ndarray,
+        point_lngs: np.ndarray
+) -> np.ndarray:
+    """
+    Method to find the nearest of some points (degrees) to every coordinate
+    (degrees), with a grid spatial index of about one point per cell. The
+    coordinates of a cell are searched in the rings of cells around it,
+    widening the rings until no closer point may lie outside, which takes
+    a single step once some points are found. Returns the
+    index of the nearest point of every coordinate.
+    """
+
+    num_points = len(point_lats)
+    x, y = project_plane(
+        np.concatenate((point_lats, lats)),
+        np.concatenate((point_lngs, lngs))
+    )
+    point_x, point_y, x, y = x[:num_points], y[:num_points], \
+        x[num_points:], y[num_points:]
+    min_x, min_y = point_x.min(), point_y.min()
+    width, height = np.ptp(point_x), np.ptp(point_y)
+    cell_size = max(
+        np.sqrt(width * height / num_points),
+        max(width, height) / num_points,
+        1e-9
+    )
+    num_columns = int(width // cell_size) + 1
+    num_rows = int(height // cell_size) + 1
+    point_cells = (
+        ((point_x - min_x) // cell_size).astype(np.int64) * num_rows +
+        ((point_y - min_y) // cell_size).astype(np.int64)
+    )
+    order = np.argsort(point_cells, kind='stable')
+    unique_cells, cell_starts = np.unique(
+        point_cells[order],
+        return_index=True
+    )
+    cell_ends = np.append(cell_starts[1:], num_points)
+    cell_slices = {
+        (cell // num_rows, cell % num_rows): (start, end)
+        for cell, start, end in zip(
+            unique_cells.tolist(),
+            cell_starts.tolist(),
+            cell_ends.tolist()
+        )
+    }
+    max_ring = max(num_columns, num_rows)
+
+    # Coordinates outside the grid are searched from its nearest cell
+    cells_x = np.clip(
+        (x - min_x) // cell_size,
+        0,
+        num_columns - 1
+    ).astype(np.int64)
+    cells_y = np.clip(
+        (y - min_y) // cell_size,
+        0,
+        num_rows - 1
+    ).astype(np.int64)
+    cells = cells_x * num_rows + cells_y
+    coordinates_order = np.argsort(cells, kind='stable')
+    query_cells, query_starts = np.unique(
+        cells[coordinates_order],
+        return_index=True
+    )
+    query_ends = np.append(query_starts[1:], len(cells))
+
+    nearest = np.empty(len(lats), dtype=np.int64)
+    for cell, start, end in zip(
+            query_cells.tolist(),
+            query_starts.tolist(),
+            query_ends.tolist()
+    ):
+        cell_x, cell_y = cell // num_rows, cell % num_rows
+        queries = coordinates_order[start:end]
+        ring = 0
+        while True:
+            ring_slices = [
+                slice(*cell_slices[(ring_x, ring_y)])
+                for ring_x in range(
+                    max(cell_x - ring, 0),
+                    min(cell_x + ring + 1, num_columns)
+                )
+                for ring_y in range(
+                    max(cell_y - ring, 0),
+                    min(cell_y + ring + 1, num_rows)
+                )
+                if (ring_x, ring_y) in cell_slices
+            ]
+            if ring_slices:
+                candidates = np.concatenate(
+                    [order[ring_slice] for ring_slice in ring_slices]
+                )
+                distances = np.hypot(
+                    x[queries, np.newaxis] - point_x[np.newaxis, candidates],
+                    y[queries, np.newaxis] - point_y[np.newaxis, candidates]
+                )
+                nearest_distances = distances.min(axis=1)
+
+                # Points outside the rings are at least `ring` cells away,
+                # so the ring that bounds the nearest candidates is the last
+                if (
+                        ring >= max_ring or
+                        (nearest_distances <= ring * cell_size).all()
+                ):
+                    break
+
+                ring = min(
+                    max(
+                        ring + 1,
+                        int(np.ceil(nearest_distances.max() / cell_size))
+                    ),
+                    max_ring
+                )
+
+            else:
+                ring = 2 * ring + 1
+
+        nearest[queries] = candidates[distances.argmin(axis=1)]
+
+    return nearest
+
+
+def _half_angle(degrees: np.ndarray):
+    """Method to obtain the sine and cosine of half the angle in degrees"""
+
+    radians = np.radians(degrees) / 2
+
+    return np.sin(radians), np.cos(radians)
@@ -0,0 +1,99 @@
+from typing import Tuple
+
+import numpy as np
+
+# Characters of the geohash base 32, indexed by their 5-bit value
+GEOHASH_ALPHABET = np.frombuffer(
+    b'0123456789bcdefghjkmnpqrstuvwxyz',
+    dtype=np.uint8
+)
+
+# Maximum precision of a code: 12 characters of 5 bits fit in 60 bits
+MAX_PRECISION = 12
+
+# Bits of each coordinate in a code of maximum precision
+COORDINATE_BITS = 5 * MAX_PRECISION // 2
+
+
+def encode_geohash(
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        precision: int = MAX_PRECISION
+) -> np.ndarray:
+    """
+    Method to encode coordinates (degrees) as bit-packed uint64 geohashes:
+    the 5 * precision geohash bits, longitude first, in the lowest bits.
+    A code is truncated to a lower precision by shifting it 5 bits to the
+    right per character.
+    """
+
+    lat_bits = _quantize(lats, -90, 180)
+    lng_bits = _quantize(lngs, -180, 360)
+    codes = (_spread(lng_bits) << np.uint64(1)) | _spread(lat_bits)
+
+    return codes >> np.uint64(5 * (MAX_PRECISION - precision))
+
+
+def geohash_strings(codes: np.ndarray, precision: int) -> np.ndarray:
+    """Method to decode uint64 geohashes of a precision to bytes strings"""
+
+    shifts = np.arange(
+        5 * (precision - 1), -1, -5,
+        dtype=np.uint64
+    )
+    characters = GEOHASH_ALPHABET[
+        (codes[:, np.newaxis] >> shifts) & np.uint64(31)
+    ]
+
+    return np.ascontiguousarray(characters).view(f'S{precision}').ravel()
+
+
+def group_geohash(
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        precision: int
+) -> Tuple[np.ndarray, int]:
+    """
+    Method to label coordinates by their geohash at a precision, numbering
+    the geohashes in order of first appearance
+    """
+
+    codes = encode_geohash(lats, lngs, precision)
+    _, first_indices, inverse = np.unique(
+        codes,
+        return_index=True,
+        return_inverse=True
+    )
+    ranks = np.empty(len(first_indices), dtype=np.int64)
+    ranks[np.argsort(first_indices, kind='stable')] = np.arange(
+        len(first_indices)
+    )
+
+    return ranks[inverse.ravel()], len(first_indices)
+
+
+def _quantize(degrees: np.ndarray, lower: float, span: float) -> np.ndarray:
+    """Method to obtain the interval of a coordinate among 2^bits"""
+
+    cells = np.floor(
+        (np.asarray(degrees, dtype=np.float64) - lower) / span *
+        (1 << COORDINATE_BITS)
+    )
+
+    return np.clip(cells, 0, (1 << COORDINATE_BITS) - 1).astype(np.uint64)
+
+
+def _spread(bits: np.ndarray) -> np.ndarray:
+    """Method to interleave the bits of a value with zeros"""
+
+    bits = bits & np.uint64(0x3FFFFFFF)
+    for shift, mask in (
+            (16, 0x0000FFFF0000FFFF),
+            (8, 0x00FF00FF00FF00FF),
+            (4, 0x0F0F0F0F0F0F0F0F),
+            (2, 0x3333333333333333),
+            (1, 0x5555555555555555)
+    ):
+        bits = (bits | (bits << np.uint64(shift))) & np.uint64(mask)
+
+    return bits
@@ -0,0 +1,138 @@
+import asyncio
+import ssl
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class HttpResponse:
+    """Class that represents the response of an HTTP request"""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    bytes_sent: int
+    bytes_received: int
+    seconds: float
+
+
+class HttpConnectionPool:
+    """
+    Class that sends HTTP/1.1 requests to a host over at most
+    `max_connections` keep-alive connections. A connection is reused by
+    the next request once its response is read, unless the server closes
+    it, and is dropped on any error or timeout. The seconds of a response
+    exclude the wait for a free connection. It must be created and used
+    inside a running event loop.
+    """
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            max_connections: int = 8,
+            timeout: float = 30,
+            use_ssl: bool = False
+    ):
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._ssl = ssl.create_default_context() if use_ssl else None
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle = []
+        self.connections = 0
+
+    async def request(
+            self,
+            method: str,
+            path: str,
+            body: Optional[bytes] = None
+    ) -> HttpResponse:
+        """Method to send a request on an idle or a new connection"""
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            if self._idle:
+                reader, writer = self._idle.pop()
+
+            else:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        self._host,
+                        self._port,
+                        ssl=self._ssl
+                    ),
+                    self._timeout
+                )
+                self.connections += 1
+
+            try:
+                response = await asyncio.wait_for(
+                    self._exchange(reader, writer, method, path, body),
+                    self._timeout
+                )
+
+            except BaseException:
+                writer.close()
+                raise
+
+            response.seconds = time.perf_counter() - start
+            if response.headers.get('connection', '').lower() == 'close':
+                writer.close()
+
+            else:
+                self._idle.append((reader, writer))
+
+            return response
+
+    async def close(self):
+        """Method to close the idle connections"""
+
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _exchange(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+            method: str,
+            path: str,
+            body: Optional[bytes]
+    ) -> HttpResponse:
+        """Method to write a request and read its response"""
+
+        body = body or b''
+        request = (
+            f'{method} {path} HTTP/1.1\r\n'
+            f'Host: {self._host}:{self._port}\r\n'
+            f'Connection: keep-alive\r\n'
+            f'Content-Length: {len(body)}\r\n\r\n'
+        ).encode() + body
+        writer.write(request)
+        await writer.drain()
+
+        head = await reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (
+                line.partition(':') for line in header_lines if line
+            )
+        }
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            raise ValueError('Chunked responses are not supported.')
+
+        response_body = await reader.readexactly(
+            int(headers.get('content-length', 0))
+        )
+
+        return HttpResponse(
+            status=int(status_line.split(' ')[1]),
+            headers=headers,
+            body=response_body,
+            bytes_sent=len(request),
+            bytes_received=len(head) + len(response_body),
+            seconds=0
+        )
@@ -0,0 +1,248 @@
+import cProfile
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Dict, Any, Iterator
+
+from settings import PROFILE_FILE, PROFILE_STATS_FILE, PROFILE_STACKS_FILE
+
+# Seconds between the samples of the stacks for flamegraphs
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Profilers that record the stages, the innermost one last
+_ACTIVE_PROFILERS: List['Profiler'] = []
+
+
+@dataclass
+class StageProfile:
+    """
+    Class that holds the measures of a stage: its wall and CPU time, the
+    peak memory traced during the stage over the memory traced when it
+    started, and the maximum resident set size of the process at its end
+    """
+
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_memory_mb: Optional[float]
+    max_rss_mb: float
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    """
+    Method to profile a stage of the pipeline with the active Profiler. It
+    does nothing when no Profiler is active.
+    """
+
+    if not _ACTIVE_PROFILERS:
+        yield
+        return
+
+    with _ACTIVE_PROFILERS[-1].stage(name):
+        yield
+
+
+class Profiler:
+    """
+    Class that profiles the stages of the pipeline while it is active, as a
+    context manager. Stages are nested: a stage opened inside another one is
+    named by the path of both. Optionally, it also runs cProfile and samples
+    the stacks of the main thread, for flamegraphs of collapsed stacks.
+    """
+
+    def __init__(
+            self,
+            trace_memory: bool = True,
+            cprofile: bool = False,
+            sample_interval: Optional[float] = None
+    ):
+        self._trace_memory = trace_memory
+        self._cprofile = cprofile
+        self._sample_interval = sample_interval
+        self._stages: List[StageProfile] = []
+        self._path: List[str] = []
+        self._child_peaks: List[int] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+
+    def __enter__(self) -> 'Profiler':
+        """Method to activate the Profiler"""
+
+        if self._trace_memory:
+            tracemalloc.start()
+        if self._sample_interval is not None:
+            self._sampler = StackSampler(
+                thread_id=threading.get_ident(),
+                interval=self._sample_interval
+            )
+            self._sampler.start()
+        if self._cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        _ACTIVE_PROFILERS.append(self)
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """Method to deactivate the Profiler"""
+
+        _ACTIVE_PROFILERS.remove(self)
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._trace_memory:
+            tracemalloc.stop()
+
+    @property
+    def stages(self) -> List[StageProfile]:
+        """Method that returns the profiled stages, in order of completion"""
+
+        return self._stages
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Method to profile a stage. The peak of the traced memory is reset
+        for the stage, so the peaks of its parents are kept aside and
+        combined with it when it ends.
+        """
+
+        self._path.append(name)
+        tracing = self._trace_memory and tracemalloc.is_tracing()
+        start_memory = 0
+        if tracing:
+            start_memory, parent_peak = tracemalloc.get_traced_memory()
+            if self._child_peaks:
+                self._child_peaks[-1] = max(self._child_peaks[-1], parent_peak)
+            _reset_peak()
+        self._child_peaks.append(0)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+
+        finally:
+            wall_seconds = time.perf_counter() - start_wall
+            cpu_seconds = time.process_time() - start_cpu
+            child_peak = self._child_peaks.pop()
+            peak_memory_mb = None
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], child_peak)
+                peak_memory_mb = (peak - start_memory) / 2 ** 20
+                if self._child_peaks:
+                    self._child_peaks[-1] = max(self._child_peaks[-1], peak)
+
+            profile = StageProfile(
+                stage='/'.join(self._path),
+                wall_seconds=wall_seconds,
+                cpu_seconds=cpu_seconds,
+                peak_memory_mb=peak_memory_mb,
+                max_rss_mb=_max_rss_mb()
+            )
+            self._path.pop()
+            self._stages.append(profile)
+            logging.info(
+                f'Profiled the stage {profile.stage}: '
+                f'{profile.wall_seconds:.3f} s wall, '
+                f'{profile.cpu_seconds:.3f} s CPU, '
+                f'{profile.peak_memory_mb or 0:.1f} MB peak.'
+            )
+
+    def report(self) -> Dict[str, Any]:
+        """Method to build the report of the stages as a Dict (JSON)"""
+
+        return {
+            'stages': [asdict(stage) for stage in self._stages],
+            'max_rss_mb': _max_rss_mb(),
+            'trace_memory': self._trace_memory
+        }
+
+    def write(self, output_dir: str) -> List[str]:
+        """
+        Method to write the report and, if they were recorded, the cProfile
+        stats and the collapsed stacks to the output dir
+        """
+
+        os.makedirs(output_dir, exist_ok=True)
+        files = [PROFILE_FILE.format(output_dir=output_dir)]
+        with open(files[0], 'w') as f:
+            json.dump(self.report(), f, indent=4)
+
+        if self._profile is not None:
+            files.append(PROFILE_STATS_FILE.format(output_dir=output_dir))
+            self._profile.dump_stats(files[-1])
+
+        if self._sampler is not None:
+            files.append(PROFILE_STACKS_FILE.format(output_dir=output_dir))
+            with open(files[-1], 'w') as f:
+                f.writelines(
+                    f'{stack} {count}\n'
+                    for stack, count in self._sampler.stacks.most_common()
+                )
+
+        logging.info(f'Wrote the profile to {files}.')
+
+        return files
+
+
+class StackSampler(threading.Thread):
+    """
+    Class that samples the stack of a thread at an interval, counting the
+    collapsed stacks (root first, frames joined by ';') of a flamegraph
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stopped = threading.Event()
+        self.stacks: Counter = Counter()
+
+    def run(self):
+        """Method to sample the stack until the sampler is stopped"""
+
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            frames = []
+            while frame is not None:
+                frames.append(
+                    f'{os.path.basename(frame.f_code.co_filename)}:'
+                    f'{frame.f_code.co_name}'
+                )
+                frame = frame.f_back
+            if frames:
+                self.stacks[';'.join(reversed(frames))] += 1
+
+    def stop(self):
+        """Method to stop sampling"""
+
+        self._stopped.set()
+        self.join()
+
+
+def _reset_peak():
+    """
+    Method to reset the peak of the traced memory. Before Python 3.9 it
+    cannot be reset, so the peaks of the stages are the peaks so far.
+    """
+
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+def _max_rss_mb() -> float:
+    """Method that returns the maximum resident set size of the process"""
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The size is in bytes on macOS and in kilobytes elsewhere
+    return max_rss / 2 ** 20 if sys.platform == 'darwin' else max_rss / 2 ** 10
@@ -0,0 +1,141 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import re
+import time
+from array import array
+from typing import Iterator, Dict, Any, TextIO
+
+import numpy as np
+
+from models.rider_columns import RiderColumns
+
+# Characters read from the file at once when streaming JSON records
+CHUNK_SIZE = 1 << 20
+
+# Whitespace, and separators, skipped around the records of a JSON array
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_SEPARATORS = re.compile(r'[ \t\n\r,]*')
+
+
+def load_riders(riders_file: str) -> RiderColumns:
+    """
+    Method to stream the Riders of a file into columns, without holding its
+    records in memory. The format follows the extension: a JSON array
+    (.json), one JSON object per line (.ndjson, .jsonl) or a CSV with a
+    header (.csv), any of them optionally gzip-compressed (.gz).
+    """
+
+    start = time.perf_counter()
+    name = riders_file[:-len('.gz')] if riders_file.endswith('.gz') else (
+        riders_file
+    )
+    if name.endswith('.csv'):
+        iterate = iterate_csv
+    elif name.endswith(('.ndjson', '.jsonl')):
+        iterate = iterate_ndjson
+    elif name.endswith('.json'):
+        iterate = iterate_json_array
+    else:
+        raise ValueError(f'The format of {riders_file} is not supported.')
+
+    rider_ids, lats, lngs = [], array('d'), array('d')
+    with _open_text(riders_file) as f:
+        for record in iterate(f):
+            rider_ids.append(str(record['rider_id']))
+            lats.append(float(record['lat']))
+            lngs.append(float(record['lng']))
+
+    columns = RiderColumns(
+        rider_ids=np.array(rider_ids, dtype=object),
+        lats=np.frombuffer(lats, dtype=np.float64),
+        lngs=np.frombuffer(lngs, dtype=np.float64)
+    )
+    elapsed = time.perf_counter() - start
+    logging.info(
+        f'Streamed {len(columns)} riders from {riders_file} in '
+        f'{elapsed:.2f} s ({len(columns) / max(elapsed, 1e-9):.0f} '
+        f'records/s).'
+    )
+
+    return columns
+
+
+def iterate_json_array(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Method to decode the records of a JSON array one at a time"""
+
+    decoder = json.JSONDecoder()
+    buffer, position = f.read(CHUNK_SIZE), 0
+    buffer, position = _skip(f, buffer, position, JSON_WHITESPACE)
+    if buffer[position:position + 1] != '[':
+        raise ValueError('The JSON records are not in an array.')
+
+    position += 1
+    while True:
+        buffer, position = _skip(f, buffer, position, JSON_SEPARATORS)
+        if position == len(buffer):
+            raise ValueError('The JSON array is not closed.')
+
+        if buffer[position] == ']':
+            return
+
+        try:
+            record, position = decoder.raw_decode(buffer, position)
+
+        except json.JSONDecodeError:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                raise
+
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        yield record
+
+
+def iterate_ndjson(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Method to decode the records of a file with one JSON per line"""
+
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iterate_csv(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Method to read the records of a CSV file with a header"""
+
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError('The CSV file has no header.')
+
+    for row in reader:
+        if row:
+            yield dict(zip(header, row))
+
+
+def _open_text(file: str) -> TextIO:
+    """Method to open a file as text, decompressing it if needed"""
+
+    if file.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(file, 'rb'), encoding='utf-8')
+
+    return open(file, encoding='utf-8', newline='')
+
+
+def _skip(f: TextIO, buffer: str, position: int, pattern: re.Pattern):
+    """Method to skip a pattern, reading chunks until something else appears"""
+
+    while True:
+        position = pattern.match(buffer, position).end()
+
+        if position < len(buffer):
+            return buffer, position
+
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return '', 0
+
+        buffer, position = chunk, 0
@@ -0,0 +1,33 @@
+import json
+import logging
+
+from models.solution import Solution
+from problem.problem import Problem
+from router import Router
+from settings import ROUTES_FILE
+from writers.routes_writer import RoutesWriter
+
+
+class JsonRoutesWriter(RoutesWriter):
+    """Class that writes the Routes as a pretty-printed JSON list"""
+
+    def write(
+            self,
+            output_dir: str,
+            problem: Problem,
+            solution: Solution
+    ) -> int:
+        """Method to write the Routes as a JSON list"""
+
+        routes_file = self._prepare(output_dir)
+        routes = list(Router.iter_routes(problem, solution))
+        with open(routes_file, 'w') as f:
+            json.dump(routes, f, indent=4)
+        logging.info(f'Wrote {len(routes)} routes to {routes_file}.')
+
+        return len(routes)
+
+    def routes_file(self, output_dir: str) -> str:
+        """Method that returns the JSON file of the Routes"""
+
+        return ROUTES_FILE.format(output_dir=output_dir)
@@ -0,0 +1,46 @@
+import gzip
+import json
+import logging
+
+from models.solution import Solution
+from problem.problem import Problem
+from router import Router
+from settings import ROUTES_NDJSON_FILE
+from writers.routes_writer import RoutesWriter
+
+
+class NdjsonRoutesWriter(RoutesWriter):
+    """
+    Class that streams the Routes as newline-delimited JSON, one compact
+    Route per line written as soon as it is parsed, optionally gzipped
+    """
+
+    def __init__(self, compress: bool = False):
+        self._compress = compress
+
+    def write(
+            self,
+            output_dir: str,
+            problem: Problem,
+            solution: Solution
+    ) -> int:
+        """Method to write the Routes as they are parsed, one per line"""
+
+        routes_file = self._prepare(output_dir)
+        opener = gzip.open if self._compress else open
+        num_routes = 0
+        with opener(routes_file, 'wt') as f:
+            for route in Router.iter_routes(problem, solution):
+                f.write(json.dumps(route, separators=(',', ':')))
+                f.write('\n')
+                num_routes += 1
+        logging.info(f'Wrote {num_routes} routes to {routes_file}.')
+
+        return num_routes
+
+    def routes_file(self, output_dir: str) -> str:
+        """Method that returns the NDJSON file of the Routes"""
+
+        routes_file = ROUTES_NDJSON_FILE.format(output_dir=output_dir)
+
+        return f'{routes_file}.gz' if self._compress else routes_file
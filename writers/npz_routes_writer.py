@@ -0,0 +1,122 @@
+import logging
+from typing import List, Dict, Any
+
+import numpy as np
+
+from models.solution import Solution
+from problem.problem import Problem
+from settings import ROUTES_NPZ_FILE
+from writers.routes_writer import RoutesWriter
+
+
+class NpzRoutesWriter(RoutesWriter):
+    """
+    Class that writes the Routes as columns of a NumPy .npz file, with a row
+    per visited Stop: the index of its route, its sequence in the route, the
+    Stop index, location and depot id, and the offsets of its Riders into a
+    flat column of rider ids. The vehicle id of each route is in its own
+    column. The columns are zip-compressed unless disabled.
+    """
+
+    def __init__(self, compress: bool = True):
+        self._compress = compress
+
+    def write(
+            self,
+            output_dir: str,
+            problem: Problem,
+            solution: Solution
+    ) -> int:
+        """Method to write the columns of the Routes that visit a Stop"""
+
+        routes_file = self._prepare(output_dir)
+        lengths = solution.lengths
+        vehicles = np.flatnonzero(lengths > 1)
+        row_vehicles = np.repeat(np.arange(len(lengths)), lengths)
+        rows = (lengths > 1)[row_vehicles]
+        stops = solution.stops[rows]
+        routes = np.repeat(
+            np.arange(len(vehicles), dtype=np.int32),
+            lengths[vehicles]
+        )
+        sequence = (
+            np.arange(len(solution.stops)) -
+            solution.offsets[row_vehicles]
+        )[rows].astype(np.int32)
+
+        stop_lats = np.fromiter(
+            (stop.location.lat for stop in problem.stops),
+            dtype=np.float64,
+            count=len(problem.stops)
+        )
+        stop_lngs = np.fromiter(
+            (stop.location.lng for stop in problem.stops),
+            dtype=np.float64,
+            count=len(problem.stops)
+        )
+        rider_ids, rider_counts, depot_ids = [], [], []
+        for stop_ix in stops.tolist():
+            stop = problem.stops[stop_ix]
+            stop_riders = list(stop.riders) if stop.riders is not None else []
+            rider_ids += stop_riders
+            rider_counts.append(len(stop_riders))
+            depot_ids.append(stop.depot_id or '')
+
+        rider_offsets = np.zeros(len(stops) + 1, dtype=np.int64)
+        np.cumsum(rider_counts, out=rider_offsets[1:])
+        vehicle_ids = list(problem.vehicles.keys())
+        save = np.savez_compressed if self._compress else np.savez
+        save(
+            routes_file,
+            vehicle_ids=np.array(
+                [vehicle_ids[ix] for ix in vehicles.tolist()],
+                dtype=str
+            ),
+            route=routes,
+            sequence=sequence,
+            stop=stops,
+            lat=stop_lats[stops],
+            lng=stop_lngs[stops],
+            depot_id=np.array(depot_ids, dtype=str),
+            rider_offsets=rider_offsets,
+            rider_ids=np.array(rider_ids, dtype=str)
+        )
+        logging.info(f'Wrote {len(vehicles)} routes to {routes_file}.')
+
+        return len(vehicles)
+
+    def routes_file(self, output_dir: str) -> str:
+        """Method that returns the .npz file of the Routes"""
+
+        return ROUTES_NPZ_FILE.format(output_dir=output_dir)
+
+    @staticmethod
+    def read(routes_file: str) -> List[Dict[str, Any]]:
+        """Method to read the columns back into Route Dicts (JSON)"""
+
+        with np.load(routes_file) as columns:
+            columns = dict(columns)
+
+        routes = [
+            {'vehicle_id': vehicle_id, 'stops': []}
+            for vehicle_id in columns['vehicle_ids'].tolist()
+        ]
+        rider_ids = columns['rider_ids'].tolist()
+        rider_offsets = columns['rider_offsets'].tolist()
+        for row_ix, (route_ix, lat, lng, depot_id) in enumerate(zip(
+                columns['route'].tolist(),
+                columns['lat'].tolist(),
+                columns['lng'].tolist(),
+                columns['depot_id'].tolist()
+        )):
+            routes[route_ix]['stops'].append({
+                'location': [lat, lng],
+                'riders': (
+                    rider_ids[rider_offsets[row_ix]:rider_offsets[row_ix + 1]]
+                    if not depot_id
+                    else None
+                ),
+                'depot_id': depot_id or None
+            })
+
+        return routes
@@ -0,0 +1,30 @@
+import os
+
+from models.solution import Solution
+from problem.problem import Problem
+
+
+class RoutesWriter:
+    """Class that writes the Routes of a solution to an output dir"""
+
+    def write(
+            self,
+            output_dir: str,
+            problem: Problem,
+            solution: Solution
+    ) -> int:
+        """Method to write the Routes, returning how many were written"""
+
+        pass
+
+    def routes_file(self, output_dir: str) -> str:
+        """Method that returns the file the Routes are written to"""
+
+        pass
+
+    def _prepare(self, output_dir: str) -> str:
+        """Method to create the output dir and return the Routes file"""
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        return self.routes_file(output_dir)